@@ -1,87 +1,160 @@
 """Extended analyzer API router.
 
 Provides section + part metrics, reference search, and change listing.
-Relies on environment variable ECFR_ANALYZER_DB to locate analyzer.sqlite.
+The DB is the mounting app's ``app.state.analyzer_db`` (set by
+ecfr_scraper.api.create_app); the ECFR_ANALYZER_DB environment variable is
+the fallback when the router is mounted on its own.
+
+Query results are memoized in-process (LRU) keyed by the endpoint args plus
+a stat signature of the DB, so a fresh ingest invalidates them without an
+explicit flush. A single connection per DB file is reused across requests.
 """
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query
-import os, sqlite3
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from functools import lru_cache
+import os, sqlite3, threading
+
+from . import schema
 
 router = APIRouter(prefix="/analyzer", tags=["analyzer"])
 
 DB_ENV = "ECFR_ANALYZER_DB"
+CACHE_SIZE = 4096
+
+_lock = threading.Lock()
+_conns: dict = {}  # db path -> (inode, connection)
 
-def _connect():
-    db = os.getenv(DB_ENV)
+
+def _db_signature(request: Request) -> tuple:
+    """Return (db_path, signature) where signature changes whenever the DB is written or replaced."""
+    db = getattr(request.app.state, "analyzer_db", None) or os.getenv(DB_ENV)
     if not db or not os.path.exists(db):
         raise HTTPException(500, detail="Analyzer DB not configured")
-    return sqlite3.connect(db)
-
-@router.get("/section/{uid}")
-def section(uid: str):  # type: ignore
-    conn = _connect()
+    st = os.stat(db)
     try:
-        c = conn.cursor()
+        wal = os.stat(db + "-wal")
+        # readers create an empty -wal on open; only a non-empty one means new writes
+        wal_sig = (wal.st_mtime_ns, wal.st_size) if wal.st_size else None
+    except FileNotFoundError:
+        wal_sig = None
+    return db, (st.st_ino, st.st_mtime_ns, st.st_size, wal_sig)
+
+
+def _conn(db: str, sig: tuple) -> sqlite3.Connection:
+    """Shared connection for ``db``; reopened if the file was replaced. Call with _lock held."""
+    ino = sig[0]
+    hit = _conns.get(db)
+    if hit is None or hit[0] != ino:
+        if hit is not None:
+            hit[1].close()
+        hit = (ino, sqlite3.connect(db, check_same_thread=False))
+        _conns[db] = hit
+    return hit[1]
+
+
+def clear_cache() -> None:
+    """Drop memoized results and close shared connections (e.g. after an ingest in-process)."""
+    for fn in (_fetch_section, _fetch_parts, _fetch_part_metrics, _fetch_refs, _fetch_changes):
+        fn.cache_clear()
+    with _lock:
+        for _, conn in _conns.values():
+            conn.close()
+        _conns.clear()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _fetch_section(db: str, sig: tuple, uid: str):
+    with _lock:
+        c = _conn(db, sig).cursor()
         row = c.execute("SELECT uid,title,part,section,heading,word_count,paragraph_count FROM sections WHERE uid=?", (uid,)).fetchone()
         if not row:
-            raise HTTPException(404, detail="Not found")
+            return None
         m = c.execute("SELECT wc,paragraphs,sentences,eri,dor,amr,fli,hvi,drs,soi,fk_grade FROM metrics_section WHERE section_uid=?", (uid,)).fetchone()
-        metrics = None
-        if m:
-            metrics = {'wc': m[0],'paragraphs': m[1],'sentences': m[2],'eri': m[3],'dor': m[4],'amr': m[5],'fli': m[6],'hvi': m[7],'drs': m[8],'soi': m[9],'fk_grade': m[10]}
-        return {'uid': row[0], 'title': row[1], 'part': row[2], 'section': row[3], 'heading': row[4], 'word_count': row[5], 'paragraph_count': row[6], 'metrics': metrics}
-    finally:
-        conn.close()
+    metrics = None
+    if m:
+        metrics = {'wc': m[0],'paragraphs': m[1],'sentences': m[2],'eri': m[3],'dor': m[4],'amr': m[5],'fli': m[6],'hvi': m[7],'drs': m[8],'soi': m[9],'fk_grade': m[10]}
+    return {'uid': row[0], 'title': row[1], 'part': row[2], 'section': row[3], 'heading': row[4], 'word_count': row[5], 'paragraph_count': row[6], 'metrics': metrics}
 
-@router.get("/parts")
-def parts(title: int | None = None):  # type: ignore
-    conn = _connect()
-    try:
-        c = conn.cursor()
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _fetch_parts(db: str, sig: tuple, title: int | None):
+    with _lock:
+        c = _conn(db, sig).cursor()
         if title is not None:
             rows = c.execute("SELECT DISTINCT title,part FROM sections WHERE title=? AND part IS NOT NULL ORDER BY part", (title,)).fetchall()
         else:
             rows = c.execute("SELECT DISTINCT title,part FROM sections WHERE part IS NOT NULL ORDER BY title, part").fetchall()
-        return [{'title': r[0], 'part': r[1]} for r in rows]
-    finally:
-        conn.close()
+    return tuple({'title': r[0], 'part': r[1]} for r in rows)
 
-@router.get("/parts/{title}/{part}")
-def part_metrics(title: int, part: str):  # type: ignore
-    conn = _connect()
-    try:
-        c = conn.cursor()
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _fetch_part_metrics(db: str, sig: tuple, title: int, part: str):
+    with _lock:
+        c = _conn(db, sig).cursor()
         row = c.execute("SELECT title,part,wc,paragraphs,sentences,eri,dor,amr,fli,hvi,drs,soi,fk_grade FROM metrics_part WHERE title=? AND part=?", (title,part)).fetchone()
-        if not row:
-            raise HTTPException(404, detail="Part metrics not found")
-        return {'title': row[0], 'part': row[1], 'wc': row[2], 'paragraphs': row[3], 'sentences': row[4], 'eri': row[5], 'dor': row[6], 'amr': row[7], 'fli': row[8], 'hvi': row[9], 'drs': row[10], 'soi': row[11], 'fk_grade': row[12]}
-    finally:
-        conn.close()
+    if not row:
+        return None
+    return {'title': row[0], 'part': row[1], 'wc': row[2], 'paragraphs': row[3], 'sentences': row[4], 'eri': row[5], 'dor': row[6], 'amr': row[7], 'fli': row[8], 'hvi': row[9], 'drs': row[10], 'soi': row[11], 'fk_grade': row[12]}
 
-@router.get("/search/refs")
-def search_refs(q: str = Query(..., description="Reference substring"), limit: int = 25):  # type: ignore
-    conn = _connect()
-    try:
-        c = conn.cursor()
-        like = f"%{q}%"
-        rows = c.execute("""SELECT ref_type, raw, norm_target, COUNT(*) as freq FROM references
-                           WHERE raw LIKE ? OR norm_target LIKE ?
-                           GROUP BY ref_type, raw, norm_target
-                           ORDER BY freq DESC
-                           LIMIT ?""", (like, like, limit)).fetchall()
-        return [{'type': r[0], 'raw': r[1], 'target': r[2], 'count': r[3]} for r in rows]
-    finally:
-        conn.close()
 
-@router.get("/changes")
-def changes(limit: int = 50):  # type: ignore
-    conn = _connect()
-    try:
+@lru_cache(maxsize=CACHE_SIZE)
+def _fetch_refs(db: str, sig: tuple, q: str, limit: int):
+    with _lock:
+        conn = _conn(db, sig)
         c = conn.cursor()
+        if len(q) >= 3 and schema.has_refs_fts(conn):
+            # trigram index answers substring queries of 3+ chars without a table scan
+            phrase = '"' + q.replace('"', '""') + '"'
+            rows = c.execute("""SELECT r.ref_type, r.raw, r.norm_target, COUNT(*) as freq
+                               FROM refs_fts f JOIN xrefs r ON r.id = f.rowid
+                               WHERE refs_fts MATCH ?
+                               GROUP BY r.ref_type, r.raw, r.norm_target
+                               ORDER BY freq DESC
+                               LIMIT ?""", ("{raw norm_target}: " + phrase, limit)).fetchall()
+        else:
+            like = f"%{q}%"
+            rows = c.execute("""SELECT ref_type, raw, norm_target, COUNT(*) as freq FROM xrefs
+                               WHERE raw LIKE ? OR norm_target LIKE ?
+                               GROUP BY ref_type, raw, norm_target
+                               ORDER BY freq DESC
+                               LIMIT ?""", (like, like, limit)).fetchall()
+    return tuple({'type': r[0], 'raw': r[1], 'target': r[2], 'count': r[3]} for r in rows)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _fetch_changes(db: str, sig: tuple, limit: int):
+    with _lock:
+        c = _conn(db, sig).cursor()
         rows = c.execute("SELECT uid,title,part,section,heading,updated_at FROM sections ORDER BY updated_at DESC LIMIT ?", (limit,)).fetchall()
-        return [{'uid': r[0],'title': r[1],'part': r[2],'section': r[3],'heading': r[4],'updated_at': r[5]} for r in rows]
-    finally:
-        conn.close()
+    return tuple({'uid': r[0],'title': r[1],'part': r[2],'section': r[3],'heading': r[4],'updated_at': r[5]} for r in rows)
+
+
+@router.get("/section/{uid}")
+def section(uid: str, db: tuple = Depends(_db_signature)):  # type: ignore
+    out = _fetch_section(*db, uid)
+    if out is None:
+        raise HTTPException(404, detail="Not found")
+    return out
+
+@router.get("/parts")
+def parts(title: int | None = None, db: tuple = Depends(_db_signature)):  # type: ignore
+    return list(_fetch_parts(*db, title))
+
+@router.get("/parts/{title}/{part}")
+def part_metrics(title: int, part: str, db: tuple = Depends(_db_signature)):  # type: ignore
+    out = _fetch_part_metrics(*db, title, part)
+    if out is None:
+        raise HTTPException(404, detail="Part metrics not found")
+    return out
+
+@router.get("/search/refs")
+def search_refs(q: str = Query(..., description="Reference substring"), limit: int = 25,
+                db: tuple = Depends(_db_signature)):  # type: ignore
+    return list(_fetch_refs(*db, q, limit))
+
+@router.get("/changes")
+def changes(limit: int = 50, db: tuple = Depends(_db_signature)):  # type: ignore
+    return list(_fetch_changes(*db, limit))
 
-__all__ = ["router"]
+__all__ = ["router", "clear_cache"]
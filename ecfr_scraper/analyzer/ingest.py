@@ -1,26 +1,33 @@
 """Ingest normalized per-section JSON artifacts into extended analyzer DB.
 
 Reads files under output_dir/sections/titleX/*.json produced by normalization.
-Populates sections, paragraphs, references (CFR/USC/FR/EO/PubL).
+Populates sections, paragraphs, xrefs (CFR/USC/FR/EO/PubL references).
 """
 from __future__ import annotations
 
 from pathlib import Path
-import json
 import sqlite3
 from typing import Iterable, Tuple
 from . import schema
+from ..utils import json_loads
 import re, time, hashlib
 
 
 def iter_section_files(sections_root: Path) -> Iterable[Path]:
     return sections_root.rglob("*.json")
 
-CFR_REF_RE = re.compile(r"\b(\d+)\s*CFR\s*§?\s*([\d\.]+[a-z\-]*)|\b§\s*([\d\.]+[a-z\-]*)", re.I)
-USC_REF_RE = re.compile(r"\b(\d+)\s*U\.S\.C\.\s*§?\s*([\w\.\-\(\)]+)", re.I)
-FR_REF_RE  = re.compile(r"\b\d+\s+FR\s+\d+\b")
-EO_REF_RE  = re.compile(r"\bE\.?.?O\.?.?\s*\d{4,}\b", re.I)
-PUBL_RE    = re.compile(r"\bPub\.\s*L\.\s*\d+\-\d+\b", re.I)
+# All reference kinds in one alternation so each section is scanned once.
+# The leading lookahead lets the engine skip positions that cannot start
+# any alternative; FR stays case-sensitive while the others use (?i:...).
+REF_RE = re.compile(
+    r"(?=[\d§EePp])(?:"
+    r"(?P<CFR>(?i:\b\d+\s*CFR\s*§?\s*(?P<cfr_sec>[\d\.]+[a-z\-]*)|\b§\s*(?P<cfr_bare>[\d\.]+[a-z\-]*)))"
+    r"|(?P<USC>(?i:\b(?P<usc_title>\d+)\s*U\.S\.C\.\s*§?\s*(?P<usc_sec>[\w\.\-\(\)]+)))"
+    r"|(?P<FR>\b\d+\s+FR\s+\d+\b)"
+    r"|(?P<EO>(?i:\bE\.?.?O\.?.?\s*\d{4,}\b))"
+    r"|(?P<PubL>(?i:\bPub\.\s*L\.\s*\d+\-\d+\b))"
+    r")"
+)
 RESERVED_RE = re.compile(r"\[RESERVED\]", re.I)
 DEFS_RE = re.compile(r"\bDefinitions\b", re.I)
 
@@ -29,34 +36,69 @@ def _now():
 
 def extract_refs(text: str):
     out: list[Tuple[str,str,str]] = []
-    for m in CFR_REF_RE.finditer(text):
+    for m in REF_RE.finditer(text):
+        kind = m.lastgroup
         raw = m.group(0)
-        sec = m.group(2) or m.group(3)
-        if sec:
-            out.append(("CFR", raw, sec))
-    for m in USC_REF_RE.finditer(text):
-        out.append(("USC", m.group(0), f"{m.group(1)} USC {m.group(2)}"))
-    for m in FR_REF_RE.finditer(text):
-        out.append(("FR", m.group(0), m.group(0)))
-    for m in EO_REF_RE.finditer(text):
-        out.append(("EO", m.group(0), m.group(0).upper().replace(' ', '').replace('.', '')))
-    for m in PUBL_RE.finditer(text):
-        out.append(("PubL", m.group(0), m.group(0)))
+        if kind == "CFR":
+            sec = m.group("cfr_sec") or m.group("cfr_bare")
+            if sec:
+                out.append(("CFR", raw, sec))
+        elif kind == "USC":
+            out.append(("USC", raw, f"{m.group('usc_title')} USC {m.group('usc_sec')}"))
+        elif kind == "EO":
+            out.append(("EO", raw, raw.upper().replace(' ', '').replace('.', '')))
+        else:  # FR, PubL
+            out.append((kind, raw, raw))
     return out
 
 
+INGEST_BATCH_SIZE = 500
+
+_SECTION_UPSERT = """INSERT OR REPLACE INTO sections(uid,title,part,section,heading,text_norm,word_count,paragraph_count,amend_date,is_reserved,is_definition,chash,created_at,updated_at)
+                     VALUES(?,?,?,?,?,?,?,?,?,?,?,?,COALESCE((SELECT created_at FROM sections WHERE uid=?),?),?)"""
+
+
+def _flush(c: sqlite3.Cursor, batch: dict) -> None:
+    """Write a batch of {uid: (section_row, para_rows, ref_rows)} with executemany.
+
+    ``para_rows``/``ref_rows`` of None mean the section text is unchanged, so
+    only the section row is rewritten and its child rows are left in place.
+    """
+    if not batch:
+        return
+    changed = {uid: rows for uid, rows in batch.items() if rows[1] is not None}
+    uids = [(uid,) for uid in changed]
+    c.executemany(_SECTION_UPSERT, [rows[0] for rows in batch.values()])
+    c.executemany("DELETE FROM paragraphs WHERE section_uid=?", uids)
+    c.executemany("INSERT INTO paragraphs(section_uid, idx, text_norm, word_count, chash) VALUES (?,?,?,?,?)",
+                  [r for rows in changed.values() for r in rows[1]])
+    c.executemany("DELETE FROM xrefs WHERE from_section_uid=?", uids)
+    c.executemany("INSERT INTO xrefs(from_section_uid, ref_type, raw, norm_target) VALUES (?,?,?,?)",
+                  [r for rows in changed.values() for r in rows[2]])
+    batch.clear()
+
+
 def ingest_sections(sections_root: Path, db_path: Path, replace: bool = False, changed_only: bool=False) -> int:
     db_path.parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(db_path)
     try:
         schema.ensure_schema(conn)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
         if replace:
             schema.clear_tables(conn)
         c = conn.cursor()
         count = 0
+        # Rows are buffered per uid (last file wins, as with row-at-a-time
+        # writes) and flushed every INGEST_BATCH_SIZE sections; everything
+        # is committed once at the end.
+        batch: dict = {}
+        # Stored section hashes, kept current as sections are accepted, so
+        # unchanged sections skip the per-row lookup and paragraph rewrite.
+        prev_hashes = dict(c.execute("SELECT uid, chash FROM sections"))
         for sf in iter_section_files(sections_root):
             try:
-                data = json.loads(sf.read_text(encoding='utf-8'))
+                data = json_loads(sf.read_bytes())
             except Exception:
                 continue
             uid = data.get('anchor_id') or sf.stem
@@ -70,29 +112,31 @@ def ingest_sections(sections_root: Path, db_path: Path, replace: bool = False, c
             section = data.get('section_number') or data.get('section')
             is_reserved = 1 if RESERVED_RE.search(heading) else 0
             is_definition = 1 if DEFS_RE.search(heading) else 0
-            if changed_only:
-                prev = c.execute("SELECT chash FROM sections WHERE uid=?", (uid,)).fetchone()
-                if prev and prev[0] == chash:
-                    continue
+            unchanged = prev_hashes.get(uid) == chash
+            if changed_only and unchanged:
+                continue
+            prev_hashes[uid] = chash
             paragraph_count = len(paras)
             wc = len(text_norm.split())
             now = _now()
-            c.execute("""INSERT OR REPLACE INTO sections(uid,title,part,section,heading,text_norm,word_count,paragraph_count,amend_date,is_reserved,is_definition,chash,created_at,updated_at)
-                        VALUES(?,?,?,?,?,?,?,?,?,?,?,?,COALESCE((SELECT created_at FROM sections WHERE uid=?),?),?)""",
-                      (uid,title,part,section,heading,text_norm,wc,paragraph_count,None,is_reserved,is_definition,chash,now,now,uid,now,now))
-            # paragraphs
-            c.execute("DELETE FROM paragraphs WHERE section_uid=?", (uid,))
-            for idx, p in enumerate(paras):
-                p_txt = (p.get('text') or '').strip()
-                p_hash = hashlib.sha256(p_txt.encode('utf-8')).hexdigest()
-                c.execute("INSERT INTO paragraphs(section_uid, idx, text_norm, word_count, chash) VALUES (?,?,?,?,?)",
-                          (uid, idx, p_txt, len(p_txt.split()), p_hash))
-            # references
-            c.execute("DELETE FROM references WHERE from_section_uid=?", (uid,))
-            for r_type, raw, target in extract_refs(text_norm):
-                c.execute("INSERT INTO references(from_section_uid, ref_type, raw, norm_target) VALUES (?,?,?,?)",
-                          (uid, r_type, raw, target))
+            section_row = (uid,title,part,section,heading,text_norm,wc,paragraph_count,None,is_reserved,is_definition,chash,uid,now,now)
+            if unchanged:
+                # same text => same paragraphs and references; keep stored rows
+                # (or the ones still pending in this batch for a repeated uid)
+                _, para_rows, ref_rows = batch.get(uid, (None, None, None))
+            else:
+                para_rows = []
+                for idx, p in enumerate(paras):
+                    p_txt = (p.get('text') or '').strip()
+                    p_hash = hashlib.blake2b(p_txt.encode('utf-8'), digest_size=16).hexdigest()
+                    para_rows.append((uid, idx, p_txt, len(p_txt.split()), p_hash))
+                ref_rows = [(uid, r_type, raw, target) for r_type, raw, target in extract_refs(text_norm)]
+            batch.pop(uid, None)
+            batch[uid] = (section_row, para_rows, ref_rows)
             count += 1
+            if len(batch) >= INGEST_BATCH_SIZE:
+                _flush(c, batch)
+        _flush(c, batch)
         conn.commit()
         return count
     finally:
@@ -5,34 +5,57 @@ more sophisticated algorithms later.
 """
 from __future__ import annotations
 
+import heapq
+import math
 import sqlite3
+from collections import Counter
 from datetime import datetime
 import re
 
 # Simple regex for CFR citations inside section text (placeholder)
 CFR_CITATION = re.compile(r"\b\d+\s+CFR\s+\d+(?:\.\d+)?")
 EXTERNAL_REF = re.compile(r"\b(U\.S\.C\.|Stat\.|Pub\. L\.)")
+WORD_RE = re.compile(r"[A-Za-z]+")
+BATCH_SIZE = 1000
 
 
 def compute_metrics(conn: sqlite3.Connection) -> int:
     c = conn.cursor()
-    c.execute("SELECT rowid, text, paragraph_count, word_count FROM sections")
-    rows = c.fetchall()
+    # ingest upserts sections with INSERT OR REPLACE, which gives a re-ingested
+    # section a new rowid; drop metrics rows whose section_rowid is gone
+    c.execute("DELETE FROM metrics WHERE section_rowid NOT IN (SELECT rowid FROM sections)")
+    # ingest always stores word_count; backfill any NULLs once up front so the
+    # loop below never splits section text just to count it
+    missing = c.execute("SELECT rowid, text_norm FROM sections WHERE word_count IS NULL").fetchall()
+    if missing:
+        c.executemany("UPDATE sections SET word_count=? WHERE rowid=?",
+                      [(len((text or "").split()), rowid) for rowid, text in missing])
+    c.execute("SELECT rowid, text_norm, paragraph_count, word_count FROM sections")
     now = datetime.utcnow().isoformat() + "Z"
-    updated = 0
+    written = 0
+    # stream rows a batch at a time rather than holding every section's text
+    while True:
+        rows = c.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        written += _write_batch(conn, rows, now)
+    conn.commit()
+    return written
+
+
+def _write_batch(conn: sqlite3.Connection, rows, now: str) -> int:
+    params = []
     for rowid, text, pcount, wcount in rows:
         if not text:
             text = ""
-        words = wcount or len(text.split()) or 1
+        words = wcount or 1
         # RRD: fraction of repeated words among top 20% tokens (very naive)
-        tokens = [t.lower() for t in re.findall(r"[A-Za-z]+", text)]
+        tokens = [t.lower() for t in WORD_RE.findall(text)]
         if tokens:
-            freq = {}
-            for t in tokens:
-                freq[t] = freq.get(t, 0) + 1
-            sorted_counts = sorted(freq.values(), reverse=True)
-            top_k = max(1, len(sorted_counts) // 5)
-            repeat_total = sum(c for c in sorted_counts[:top_k])
+            freq = Counter(tokens)
+            top_k = max(1, len(freq) // 5)
+            # only the top-k counts are summed, so select them instead of sorting all
+            repeat_total = sum(heapq.nlargest(top_k, freq.values()))
             rrd = repeat_total / words
         else:
             rrd = 0.0
@@ -45,17 +68,16 @@ def compute_metrics(conn: sqlite3.Connection) -> int:
         # AMR: placeholder always 0 until amendment metadata integrated
         amr = 0.0
         # FLI: fragmentation index = paragraphs / max(1, log2(words)) simplified
-        import math
         fli = pcount / max(1.0, math.log2(words))
         # RSR: revision stability ratio placeholder 1 (no history yet)
         rsr = 1.0
-        c.execute(
-            "INSERT OR REPLACE INTO metrics(section_rowid, rrd, cci, eri, pbi, amr, fli, rsr, updated_at) VALUES (?,?,?,?,?,?,?,?,?)",
-            (rowid, rrd, cci, eri, pbi, amr, fli, rsr, now),
-        )
-        updated += 1
-    conn.commit()
-    return updated
+        params.append((rowid, rrd, cci, eri, pbi, amr, fli, rsr, now))
+    # separate cursor: the caller's cursor is still stepping through sections
+    conn.executemany(
+        "INSERT OR REPLACE INTO metrics(section_rowid, rrd, cci, eri, pbi, amr, fli, rsr, updated_at) VALUES (?,?,?,?,?,?,?,?,?)",
+        params,
+    )
+    return len(params)
 
 
 __all__ = ["compute_metrics"]
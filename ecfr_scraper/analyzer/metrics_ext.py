@@ -5,97 +5,233 @@ require longitudinal or graph context not yet available; these are stored as NUL
 """
 from __future__ import annotations
 import sqlite3, math, statistics, re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, Iterable
 
-OBLIGATION_PAT = re.compile(r"\b(shall|must|may not|prohibited|required|shall not)\b", re.I)
-PROHIBITIVE_PAT = re.compile(r"\b(may not|shall not|prohibited|ban|forbidden)\b", re.I)
-AMBIGUOUS_PAT = re.compile(r"\b(reasonable|adequate|appropriate|sufficient|timely)\b", re.I)
-FEASIBILITY_PAT = re.compile(r"\b(feasible|practicable|possible)\b", re.I)
-RISK_PAT = re.compile(r"\b(risk|hazard|exposure|threat)\b", re.I)
-SMALL_ENTITY_PAT = re.compile(r"\b(small entity|small business|micro entity)\b", re.I)
+def _terms_pat(terms: tuple) -> re.Pattern:
+    return re.compile(r"\b(" + "|".join(terms) + r")\b", re.I)
 
-def flesch_kincaid_grade(text: str) -> float | None:
-    words = re.findall(r"[A-Za-z]+", text)
-    if not words:
-        return None
-    sentences = re.split(r"[.!?]+", text)
-    sentences = [s for s in sentences if s.strip()]
-    if not sentences:
+OBLIGATION_TERMS = ("shall", "must", "may not", "prohibited", "required", "shall not")
+PROHIBITIVE_TERMS = ("may not", "shall not", "prohibited", "ban", "forbidden")
+AMBIGUOUS_TERMS = ("reasonable", "adequate", "appropriate", "sufficient", "timely")
+FEASIBILITY_TERMS = ("feasible", "practicable", "possible")
+RISK_TERMS = ("risk", "hazard", "exposure", "threat")
+SMALL_ENTITY_TERMS = ("small entity", "small business", "micro entity")
+
+OBLIGATION_PAT = _terms_pat(OBLIGATION_TERMS)
+PROHIBITIVE_PAT = _terms_pat(PROHIBITIVE_TERMS)
+AMBIGUOUS_PAT = _terms_pat(AMBIGUOUS_TERMS)
+FEASIBILITY_PAT = _terms_pat(FEASIBILITY_TERMS)
+RISK_PAT = _terms_pat(RISK_TERMS)
+SMALL_ENTITY_PAT = _terms_pat(SMALL_ENTITY_TERMS)
+
+# Index order of the counts returned by term_counts().
+COUNT_PATS = (OBLIGATION_PAT, PROHIBITIVE_PAT, AMBIGUOUS_PAT, FEASIBILITY_PAT, RISK_PAT, SMALL_ENTITY_PAT)
+OBLIGATION, PROHIBITIVE, AMBIGUOUS, FEASIBILITY, RISK, SMALL_ENTITY = range(len(COUNT_PATS))
+
+# Every term from every pattern in one alternation, longest first, so a
+# section is scanned once instead of once per pattern. No term starts inside
+# another term, so each hit maps back to the per-pattern findall counts.
+_ALL_TERMS = sorted({t for terms in (OBLIGATION_TERMS, PROHIBITIVE_TERMS, AMBIGUOUS_TERMS,
+                                     FEASIBILITY_TERMS, RISK_TERMS, SMALL_ENTITY_TERMS) for t in terms},
+                    key=len, reverse=True)
+# The lookahead lets the engine reject most positions on one character
+# before trying the alternation (re.I applies to it as well).
+TERMS_PAT = re.compile(r"\b(?=[" + "".join(sorted({t[0] for t in _ALL_TERMS})) + r"])(" + "|".join(_ALL_TERMS) + r")\b", re.I)
+_term_hits: Dict[str, tuple] = {}
+
+
+def _hits_for(term: str) -> tuple:
+    """Pattern indexes credited for one matched term (e.g. "shall not" -> obligation + prohibitive)."""
+    hit = _term_hits.get(term)
+    if hit is None:
+        hit = tuple(i for i, pat in enumerate(COUNT_PATS) for _ in pat.findall(term))
+        _term_hits[term] = hit
+    return hit
+
+
+def term_counts(text: str) -> list:
+    """Per-pattern hit counts (indexed like COUNT_PATS), equal to len(PAT.findall(text)) each."""
+    counts = [0] * len(COUNT_PATS)
+    for term in TERMS_PAT.findall(text):
+        for i in _hits_for(term.lower()):
+            counts[i] += 1
+    return counts
+
+# Non-blank runs between [.!?]+ delimiters; counting matches equals counting
+# the non-blank pieces of re.split(r"[.!?]+", text) without building them.
+SENTENCE_PAT = re.compile(r"[^.!?\s][^.!?]*")
+# Byte classes for readability counts: ASCII consonant -> "c", vowel (incl. y)
+# -> "v", anything else -> " ". UTF-8 multi-byte sequences contain no ASCII
+# bytes, so runs of c/v are exactly the [A-Za-z]+ words of the text.
+_LETTER_CLASS = bytearray(b" " * 256)
+for _ch in b"bcdfghjklmnpqrstvwxzBCDFGHJKLMNPQRSTVWXZ":
+    _LETTER_CLASS[_ch] = ord("c")
+for _ch in b"aeiouyAEIOUY":
+    _LETTER_CLASS[_ch] = ord("v")
+_LETTER_CLASS = bytes(_LETTER_CLASS)
+_NO_VOWEL_WORD = re.compile(rb" c+(?= )")
+
+def _count(pat: re.Pattern, text) -> int:
+    return sum(1 for _ in pat.finditer(text))
+
+def _words_and_syllables(text: str) -> tuple:
+    """([A-Za-z]+ word count, naive syllable count) in a few C-level passes.
+
+    Syllables are vowel groups per word with a minimum of one; vowel groups
+    never span words, so the total is all group starts plus vowel-less words.
+    """
+    x = b" " + text.encode("utf-8").translate(_LETTER_CLASS) + b" "
+    vowel_word_starts = x.count(b" v")
+    words = x.count(b" c") + vowel_word_starts
+    syllables = vowel_word_starts + x.count(b"cv") + _count(_NO_VOWEL_WORD, x)
+    return words, syllables
+
+def _fk_grade(text: str, sentences: int) -> float | None:
+    W, syllables = _words_and_syllables(text)
+    if not W or not sentences:
         return None
-    # naive syllable count
-    def syl(w: str) -> int:
-        w = w.lower()
-        # very naive: groups of vowels
-        parts = re.findall(r"[aeiouy]+", w)
-        return max(1, len(parts))
-    syllables = sum(syl(w) for w in words)
-    W = len(words)
-    S = len(sentences)
-    return 0.39 * (W / S) + 11.8 * (syllables / W) - 15.59
-
-def compute_section_metrics(conn: sqlite3.Connection, limit: int | None = None):
+    return 0.39 * (W / sentences) + 11.8 * (syllables / W) - 15.59
+
+def flesch_kincaid_grade(text: str) -> float | None:
+    return _fk_grade(text, _count(SENTENCE_PAT, text))
+
+def scan_section_text(text: str | None) -> tuple:
+    """Text-bound tallies for one section: (sentences, fk_grade, term hits).
+
+    This is the expensive part of section metrics; the ratios derived from it
+    in section_metric_values() are plain arithmetic.
+    """
+    if not text:
+        return 0, None, [0] * len(COUNT_PATS)
+    # sentences are counted once and shared with the readability grade
+    sentences = _count(SENTENCE_PAT, text)
+    return sentences, _fk_grade(text, sentences), term_counts(text)
+
+def section_metric_values(words: int, paragraphs: int, sentences: int, hits: list) -> tuple:
+    """(rrd,cci,eri,dor,pbi,amr,fli,rap,hvi,rsr,crnc,drs,soi) from section tallies."""
+    rrd = sentences / paragraphs if paragraphs else None  # regulation readability density (proxy)
+    cci = paragraphs / words if words else None  # complexity compression index (proxy)
+    eri = hits[OBLIGATION] / sentences if sentences else None
+    dor = hits[PROHIBITIVE] / sentences if sentences else None
+    pbi = hits[PROHIBITIVE] / (hits[OBLIGATION] + 1)
+    amr = hits[AMBIGUOUS] / words if words else None
+    fli = hits[FEASIBILITY] / sentences if sentences else None
+    rap = None  # requires amendment history
+    hvi = hits[RISK] / sentences if sentences else None
+    rsr = None  # regulatory scope reach requires cross title graph
+    crnc = None # cross reference network centrality requires graph build
+    drs = hits[SMALL_ENTITY] / words if words else None
+    soi = hits[OBLIGATION] / words if words else None
+    return rrd, cci, eri, dor, pbi, amr, fli, rap, hvi, rsr, crnc, drs, soi
+
+# Below this many sections, process start-up and pickling outweigh the gain.
+PARALLEL_MIN_SECTIONS = 2000
+# Sections whose text is loaded, scanned and written per round trip (also
+# kept under SQLite's historical 999 bound-parameter limit).
+METRICS_BATCH_SIZE = 500
+
+def _upsert_sql(table: str, cols: str, key: str, source: str | None = None) -> str:
+    """INSERT ... ON CONFLICT DO UPDATE for ``cols``; updates rows in place
+    rather than delete+insert as INSERT OR REPLACE does."""
+    names = [c.strip() for c in cols.split(",")]
+    keys = {k.strip() for k in key.split(",")}
+    source = source or "VALUES (" + ",".join("?" * len(names)) + ")"
+    sets = ",".join(f"{n}=excluded.{n}" for n in names if n not in keys)
+    return f"INSERT INTO {table}({','.join(names)}) {source} ON CONFLICT({key}) DO UPDATE SET {sets}"
+
+_TEXT_STATS_UPSERT = _upsert_sql(
+    "text_stats", "chash,version,sentences,fk_grade,obligation,prohibitive,ambiguous,feasibility,risk,small_entity", "chash")
+_SECTION_UPSERT = _upsert_sql(
+    "metrics_section", "section_uid,chash,wc,paragraphs,sentences,rrd,cci,eri,dor,pbi,amr,fli,rap,hvi,rsr,crnc,drs,soi,fk_grade",
+    "section_uid")
+_PART_UPSERT = _upsert_sql(
+    "metrics_part", "title,part,wc,paragraphs,sentences,eri,dor,amr,fli,hvi,drs,soi,fk_grade", "title,part",
+    """SELECT s.title, s.part,
+              COALESCE(SUM(m.wc),0), COALESCE(SUM(m.paragraphs),0), COALESCE(SUM(m.sentences),0),
+              AVG(m.eri), AVG(m.dor), AVG(m.amr), AVG(m.fli), AVG(m.hvi), AVG(m.drs), AVG(m.soi), AVG(m.fk_grade)
+       FROM metrics_section m JOIN sections s ON s.uid=m.section_uid
+       WHERE s.part IS NOT NULL
+       GROUP BY s.title, s.part""")
+
+# Bump when scan_section_text output changes so cached text_stats are rescanned.
+SCAN_VERSION = 1
+
+def _cached_scans(c: sqlite3.Cursor, chashes: list) -> Dict[str, tuple]:
+    """scan_section_text results from text_stats for the given content hashes."""
+    if not chashes:
+        return {}
+    rows = c.execute(f"""SELECT chash,sentences,fk_grade,obligation,prohibitive,ambiguous,feasibility,risk,small_entity
+                         FROM text_stats WHERE version=? AND chash IN ({",".join("?" * len(chashes))})""",
+                     (SCAN_VERSION, *chashes)).fetchall()
+    return {r[0]: (r[1], r[2], list(r[3:])) for r in rows}
+
+def _scan_rows(c: sqlite3.Cursor, rows: list, pool) -> list:
+    """scan_section_text per row, scanning each distinct chash once and caching it."""
+    cached = _cached_scans(c, list({r[4] for r in rows if r[4] is not None}))
+    todo: Dict[Any, str] = {}
+    for uid, text, _, _, chash in rows:
+        key = chash if chash is not None else ("uid", uid)  # unhashed legacy rows are not shared
+        if key not in cached:
+            todo.setdefault(key, text)
+    if todo:
+        texts = list(todo.values())
+        scans = pool.map(scan_section_text, texts, chunksize=32) if pool else map(scan_section_text, texts)
+        fresh = dict(zip(todo, scans))
+        cached.update(fresh)
+        c.executemany(_TEXT_STATS_UPSERT,
+                      [(k, SCAN_VERSION, sc[0], sc[1], *sc[2]) for k, sc in fresh.items() if isinstance(k, str)])
+    return [cached[r[4] if r[4] is not None else ("uid", r[0])] for r in rows]
+
+def compute_section_metrics(conn: sqlite3.Connection, limit: int | None = None, workers: int | None = None):
+    """Compute metrics_section rows for new or changed sections; returns rows written.
+
+    Text scans are cached in text_stats by content hash, so identical text
+    (boilerplate, re-ingested sections) is scanned once. With ``workers`` > 1
+    and enough sections, scans (pure CPU, GIL bound) run in a process pool;
+    rows are still written from this process.
+    """
     c = conn.cursor()
-    # fetch sections needing metrics (no row in metrics_section or chash changed)
-    rows = c.execute("""
-        SELECT s.uid,s.text_norm,s.word_count,s.paragraph_count,s.chash
+    # sections needing metrics (no row in metrics_section or chash changed);
+    # only keys are collected up front so section text is held a batch at a time
+    pending = [r[0] for r in c.execute("""
+        SELECT s.uid
         FROM sections s
         LEFT JOIN metrics_section m ON m.section_uid = s.uid AND m.chash = s.chash
         WHERE m.section_uid IS NULL
         ORDER BY s.uid
         LIMIT ?
-    """, (limit if limit else -1,)).fetchall()
-    for uid, text, wc, pc, chash in rows:
-        words = wc or 0
-        paragraphs = pc or 0
-        sentences = len([s for s in re.split(r"[.!?]+", text) if s.strip()]) if text else 0
-        # basic metrics
-        rrd = sentences / paragraphs if paragraphs else None  # regulation readability density (proxy)
-        cci = paragraphs / words if words else None  # complexity compression index (proxy)
-        eri = len(OBLIGATION_PAT.findall(text)) / sentences if sentences else None
-        dor = len(PROHIBITIVE_PAT.findall(text)) / sentences if sentences else None
-        pbi = len(PROHIBITIVE_PAT.findall(text)) / (len(OBLIGATION_PAT.findall(text)) + 1)
-        amr = len(AMBIGUOUS_PAT.findall(text)) / words if words else None
-        fli = len(FEASIBILITY_PAT.findall(text)) / sentences if sentences else None
-        rap = None  # requires amendment history
-        hvi = len(RISK_PAT.findall(text)) / sentences if sentences else None
-        rsr = None  # regulatory scope reach requires cross title graph
-        crnc = None # cross reference network centrality requires graph build
-        drs = len(SMALL_ENTITY_PAT.findall(text)) / words if words else None
-        soi = len(OBLIGATION_PAT.findall(text)) / words if words else None
-        fk_grade = flesch_kincaid_grade(text)
-        c.execute("""INSERT OR REPLACE INTO metrics_section(
-                    section_uid,chash,wc,paragraphs,sentences,rrd,cci,eri,dor,pbi,amr,fli,rap,hvi,rsr,crnc,drs,soi,fk_grade
-                  ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-                  (uid,chash,words,paragraphs,sentences,rrd,cci,eri,dor,pbi,amr,fli,rap,hvi,rsr,crnc,drs,soi,fk_grade))
+    """, (limit if limit else -1,))]
+    pool = None
+    if workers and workers > 1 and len(pending) >= PARALLEL_MIN_SECTIONS:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    written = 0
+    try:
+        for i in range(0, len(pending), METRICS_BATCH_SIZE):
+            keys = pending[i:i + METRICS_BATCH_SIZE]
+            rows = c.execute(f"""SELECT uid,text_norm,word_count,paragraph_count,chash FROM sections
+                                 WHERE uid IN ({",".join("?" * len(keys))})""", keys).fetchall()
+            scans = _scan_rows(c, rows, pool)
+            params = []
+            for (uid, text, wc, pc, chash), (sentences, fk_grade, hits) in zip(rows, scans):
+                words = wc or 0
+                paragraphs = pc or 0
+                values = section_metric_values(words, paragraphs, sentences, hits)
+                params.append((uid, chash, words, paragraphs, sentences, *values, fk_grade))
+            c.executemany(_SECTION_UPSERT, params)
+            written += len(params)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    # drop cached scans for text no section has any more
+    c.execute("DELETE FROM text_stats WHERE chash NOT IN (SELECT chash FROM sections WHERE chash IS NOT NULL)")
     conn.commit()
+    return written
 
 def compute_part_metrics(conn: sqlite3.Connection):
-    c = conn.cursor()
-    # aggregate per part
-    parts = c.execute("""SELECT title,part FROM sections WHERE part IS NOT NULL GROUP BY title,part""").fetchall()
-    for title, part in parts:
-        sec_rows = c.execute("""SELECT m.wc,m.paragraphs,m.sentences,m.eri,m.dor,m.amr,m.fli,m.hvi,m.drs,m.soi,m.fk_grade
-                                FROM metrics_section m JOIN sections s ON s.uid=m.section_uid
-                                WHERE s.title=? AND s.part=?""", (title,part)).fetchall()
-        if not sec_rows:
-            continue
-        def avg(idx):
-            vals = [r[idx] for r in sec_rows if r[idx] is not None]
-            return sum(vals)/len(vals) if vals else None
-        wc_total = sum(r[0] or 0 for r in sec_rows)
-        paragraphs_total = sum(r[1] or 0 for r in sec_rows)
-        sentences_total = sum(r[2] or 0 for r in sec_rows)
-        eri_avg = avg(3)
-        dor_avg = avg(4)
-        amr_avg = avg(5)
-        fli_avg = avg(6)
-        hvi_avg = avg(7)
-        drs_avg = avg(8)
-        soi_avg = avg(9)
-        fk_avg = avg(10)
-        c.execute("""INSERT OR REPLACE INTO metrics_part(title,part,wc,paragraphs,sentences,eri,dor,amr,fli,hvi,drs,soi,fk_grade)
-                    VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-                  (title,part,wc_total,paragraphs_total,sentences_total,eri_avg,dor_avg,amr_avg,fli_avg,hvi_avg,drs_avg,soi_avg,fk_avg))
+    # aggregate per part in one statement; AVG skips NULLs like the per-metric
+    # averages did, and parts without any section metrics produce no row
+    conn.execute(_PART_UPSERT)
     conn.commit()
 
 __all__ = ["compute_section_metrics","compute_part_metrics"]
@@ -1,7 +1,8 @@
 """Extended analyzer schema.
 
-Adds richer tables for sections, paragraphs, references, per-section metrics,
-per-part rollups, and part hashes for change detection.
+Adds richer tables for sections, paragraphs, cross references (xrefs),
+primitive and per-section metrics, per-part rollups, cached text scans, and part hashes
+for change detection.
 """
 from __future__ import annotations
 
@@ -36,7 +37,7 @@ CREATE TABLE IF NOT EXISTS paragraphs(
     PRIMARY KEY(section_uid, idx)
 );
 
-CREATE TABLE IF NOT EXISTS references(
+CREATE TABLE IF NOT EXISTS xrefs(
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     from_section_uid TEXT,
     ref_type TEXT,
@@ -44,19 +45,38 @@ CREATE TABLE IF NOT EXISTS references(
     norm_target TEXT
 );
 
+-- primitive metrics (analyzer.metrics), keyed by sections.rowid
+CREATE TABLE IF NOT EXISTS metrics(
+    section_rowid INTEGER PRIMARY KEY,
+    rrd REAL, cci REAL, eri REAL, pbi REAL, amr REAL, fli REAL, rsr REAL,
+    updated_at TEXT
+);
+
 CREATE TABLE IF NOT EXISTS metrics_section(
     section_uid TEXT PRIMARY KEY,
+    chash TEXT,
     rrd REAL, cci REAL, eri REAL, dor REAL, pbi REAL, amr REAL, fli REAL,
     rap REAL, hvi REAL, rsr REAL, crnc REAL, drs REAL, soi REAL, fk_grade REAL,
-    wc INTEGER, updated_at TEXT
+    wc INTEGER, paragraphs INTEGER, sentences INTEGER, updated_at TEXT
 );
 
 CREATE TABLE IF NOT EXISTS metrics_part(
     title INTEGER,
     part TEXT,
-    key TEXT,
-    value REAL,
-    PRIMARY KEY(title, part, key)
+    wc INTEGER, paragraphs INTEGER, sentences INTEGER,
+    eri REAL, dor REAL, amr REAL, fli REAL, hvi REAL, drs REAL, soi REAL, fk_grade REAL,
+    PRIMARY KEY(title, part)
+);
+
+-- Content-addressed cache of metrics_ext.scan_section_text keyed by
+-- sections.chash; kept across clear_tables so re-ingests skip rescanning.
+CREATE TABLE IF NOT EXISTS text_stats(
+    chash TEXT PRIMARY KEY,
+    version INTEGER,
+    sentences INTEGER,
+    fk_grade REAL,
+    obligation INTEGER, prohibitive INTEGER, ambiguous INTEGER,
+    feasibility INTEGER, risk INTEGER, small_entity INTEGER
 );
 
 CREATE TABLE IF NOT EXISTS part_hash(
@@ -66,21 +86,102 @@ CREATE TABLE IF NOT EXISTS part_hash(
     PRIMARY KEY(title, part)
 );
 
-CREATE INDEX IF NOT EXISTS idx_sections_part ON sections(title, part);
-CREATE INDEX IF NOT EXISTS idx_refs_target ON references(norm_target);
+-- covers part rollups / listings (uid included so the join never touches
+-- the wide sections rows); supersedes the old idx_sections_part(title, part)
+CREATE INDEX IF NOT EXISTS idx_sections_title_part_uid ON sections(title, part, uid);
+DROP INDEX IF EXISTS idx_sections_part;
+CREATE INDEX IF NOT EXISTS idx_xrefs_target ON xrefs(norm_target);
+-- ingest replaces a changed section's refs by from_section_uid
+CREATE INDEX IF NOT EXISTS idx_xrefs_from ON xrefs(from_section_uid);
+"""
+
+# Trigram FTS over reference text so substring search (/analyzer/search/refs)
+# is index-backed. External-content table kept in sync by triggers; needs
+# SQLite >= 3.34 for the trigram tokenizer, so it is created separately.
+REFS_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS refs_fts USING fts5(
+    raw, norm_target, content='xrefs', content_rowid='id', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS refs_fts_ai AFTER INSERT ON xrefs BEGIN
+    INSERT INTO refs_fts(rowid, raw, norm_target) VALUES (new.id, new.raw, new.norm_target);
+END;
+
+CREATE TRIGGER IF NOT EXISTS refs_fts_ad AFTER DELETE ON xrefs BEGIN
+    INSERT INTO refs_fts(refs_fts, rowid, raw, norm_target) VALUES ('delete', old.id, old.raw, old.norm_target);
+END;
 """
 
 
+def has_refs_fts(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='refs_fts'").fetchone() is not None
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set:
+    return {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _migrate_metrics(conn: sqlite3.Connection) -> None:
+    """Bring metrics tables from older DBs in line with the columns metrics_ext writes."""
+    have = _columns(conn, "metrics_section")
+    for col, decl in (("chash", "TEXT"), ("paragraphs", "INTEGER"), ("sentences", "INTEGER")):
+        if have and col not in have:
+            conn.execute(f"ALTER TABLE metrics_section ADD COLUMN {col} {decl}")
+    if "key" in _columns(conn, "metrics_part"):
+        # old key/value layout; rollups are derived data, so rebuild empty
+        conn.execute("DROP TABLE metrics_part")
+
+
+def _migrate_refs(conn: sqlite3.Connection) -> None:
+    """Rename the pre-xrefs ``references`` table (a reserved word) on older DBs."""
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    if "references" not in names or "xrefs" in names:
+        return
+    conn.execute('ALTER TABLE "references" RENAME TO xrefs')
+    # refs_fts still names the old content table; recreated and rebuilt by ensure_schema
+    conn.executescript("""
+        DROP TRIGGER IF EXISTS refs_fts_ai;
+        DROP TRIGGER IF EXISTS refs_fts_ad;
+        DROP TABLE IF EXISTS refs_fts;
+        DROP INDEX IF EXISTS idx_refs_target;
+    """)
+
+
 def ensure_schema(conn: sqlite3.Connection) -> None:
+    _migrate_refs(conn)
+    _migrate_metrics(conn)
     conn.executescript(SCHEMA)
+    existed = has_refs_fts(conn)
+    try:
+        conn.executescript(REFS_FTS_SCHEMA)
+        if not existed:
+            # backfill xrefs ingested before the FTS table existed
+            conn.execute("INSERT INTO refs_fts(refs_fts) VALUES ('rebuild')")
+    except sqlite3.OperationalError:  # pragma: no cover - SQLite without trigram
+        pass
     conn.commit()
 
 
+# Emptied by clear_tables; text_stats is content-addressed and survives.
+CLEARED_TABLES = ("sections", "paragraphs", "xrefs", "metrics", "metrics_section", "metrics_part", "part_hash")
+
+
 def clear_tables(conn: sqlite3.Connection) -> None:
-    c = conn.cursor()
-    for tbl in ["sections","paragraphs","references","metrics_section","metrics_part","part_hash"]:
-        c.execute(f"DELETE FROM {tbl}")
+    """Empty the ingest tables by dropping and recreating them.
+
+    DROP releases whole pages, where DELETE FROM removes (and WAL-logs) row by
+    row; the refs_fts delete trigger on xrefs also rules out SQLite's
+    truncate optimisation and would replay every delete into the FTS index.
+    Dropping xrefs drops its triggers, so refs_fts goes with it and
+    ensure_schema recreates all of them empty.
+    """
     conn.commit()
+    conn.executescript(
+        "BEGIN;"
+        + "".join(f"DROP TABLE IF EXISTS {tbl};" for tbl in ("refs_fts",) + CLEARED_TABLES)
+        + "COMMIT;"
+    )
+    ensure_schema(conn)
 
 
-__all__ = ["ensure_schema", "clear_tables", "SCHEMA"]
+__all__ = ["ensure_schema", "clear_tables", "has_refs_fts", "SCHEMA", "REFS_FTS_SCHEMA"]
@@ -6,9 +6,13 @@ DB is present (data/analyzer.sqlite by default) or if provided explicitly.
 """
 from __future__ import annotations
 
+import os
+import queue
 import sqlite3
+import threading
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 try:  # Optional import; the project declares fastapi in extras
     from fastapi import FastAPI, HTTPException
@@ -16,6 +20,214 @@ except Exception:  # pragma: no cover
     FastAPI = None  # type: ignore
     HTTPException = Exception  # type: ignore
 
+try:  # Optional approximate nearest-neighbour index; install with .[ann]
+    import hnswlib as _hnswlib  # type: ignore
+except ImportError:  # pragma: no cover
+    _hnswlib = None
+
+EMBED_INDEX_FILE = "embeddings.hnsw"  # written next to the FTS DB by the embed step
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+
+POOL_SIZE = 8  # idle connections kept per app; more are opened under bursts and closed on release
+STATEMENT_CACHE_SIZE = 64  # prepared statements kept per pooled connection
+READ_PRAGMAS = (
+    "PRAGMA query_only=1",
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA cache_size=-200000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+# Endpoint SQL. sqlite3 caches prepared statements per connection keyed by SQL
+# text, so with pooled connections each of these is parsed and planned once
+# per connection rather than once per request.
+SEARCH_SQL = "SELECT rowid, title, part, section, heading, snippet(sections, 4, '[', ']', '...', 10) FROM sections WHERE sections MATCH ? LIMIT ?"
+TITLES_SQL = "SELECT DISTINCT title FROM sections ORDER BY 1"
+SECTION_SQL = "SELECT rowid, title, part, section, heading, content, word_count FROM sections WHERE rowid=?"
+SUGGEST_SQL = "SELECT heading FROM headings WHERE heading LIKE ? ESCAPE '\\' ORDER BY heading COLLATE NOCASE LIMIT ?"
+SUGGEST_FALLBACK_SQL = "SELECT DISTINCT heading FROM sections WHERE heading LIKE ? ESCAPE '\\' ORDER BY heading LIMIT ?"
+EMBEDDINGS_TABLE_SQL = "SELECT name FROM sqlite_master WHERE type='table' AND name='embeddings'"
+
+
+class ConnectionPool:
+    """Reusable read-only connections to one SQLite file.
+
+    Opening a connection per request re-reads the schema and starts with a
+    cold page cache; pooled connections keep both warm. Connections run in
+    autocommit mode so every statement sees the latest committed data.
+    """
+
+    def __init__(self, db_path: str, size: int = POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        for pragma in READ_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            if self._idle.qsize() < self.size:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def build_heading_index(conn: sqlite3.Connection) -> None:
+    """(Re)build the ``headings`` lookup table behind /suggest from the FTS ``sections`` table.
+
+    FTS5 tables cannot carry ordinary indexes, so distinct headings are copied into a
+    plain table with a NOCASE index; ``heading LIKE 'prefix%'`` is then an index range
+    scan rather than a scan of every section.
+    """
+    conn.execute("CREATE TABLE IF NOT EXISTS headings(heading TEXT PRIMARY KEY) WITHOUT ROWID")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_headings_nocase ON headings(heading COLLATE NOCASE)")
+    conn.execute("DELETE FROM headings")
+    conn.execute("INSERT INTO headings SELECT DISTINCT heading FROM sections WHERE heading IS NOT NULL AND heading <> ''")
+
+
+def _like_prefix(prefix: str) -> str:
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def load_embeddings(conn: sqlite3.Connection):
+    """Read the embeddings table into ``(ids, matrix)``: an int64 rowid array and a
+    contiguous ``(N, dim)`` float32 matrix. Returns None if no embeddings are stored.
+
+    Vectors are stored by the embed step as native float32 (``ndarray.tobytes()``),
+    so the joined blobs can be viewed directly without per-value unpacking.
+    """
+    import numpy as np  # sentence-transformers depends on numpy
+    rows = conn.execute("SELECT section_rowid, vector FROM embeddings ORDER BY section_rowid").fetchall()
+    if not rows:
+        return None
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    mat = np.frombuffer(b"".join(r[1] for r in rows), dtype=np.float32).reshape(len(rows), -1)
+    return ids, mat
+
+
+def top_embeddings(ids, mat, qv, limit: int) -> list:
+    """Return ``[(score, rowid), ...]`` for the ``limit`` best cosine matches (vectors are normalized)."""
+    import numpy as np
+    k = min(limit, len(ids))
+    if k <= 0:
+        return []
+    scores = mat @ np.asarray(qv, dtype=np.float32).ravel()
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return [(float(scores[i]), int(ids[i])) for i in top]
+
+
+def embedding_index_path(db_path: str) -> Path:
+    return Path(db_path).parent / EMBED_INDEX_FILE
+
+
+def build_embedding_index(conn: sqlite3.Connection, path: Path) -> int:
+    """Build an HNSW inner-product index over the stored embeddings and save it to ``path``.
+
+    Labels are the section rowids. Returns the number of vectors indexed, or 0 when
+    hnswlib is not installed or no embeddings are stored.
+    """
+    if _hnswlib is None:
+        return 0
+    data = load_embeddings(conn)
+    if data is None:
+        return 0
+    ids, mat = data
+    index = _hnswlib.Index(space="ip", dim=mat.shape[1])
+    index.init_index(max_elements=len(ids), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+    index.add_items(mat, ids)
+    index.save_index(str(path))
+    return len(ids)
+
+
+def _load_embedding_index(conn: sqlite3.Connection, path: Path):
+    """Saved HNSW index for ``conn``'s embeddings, or None if missing, unreadable or stale."""
+    if _hnswlib is None or not path.exists():
+        return None
+    count, width = conn.execute("SELECT COUNT(*), MAX(length(vector)) FROM embeddings").fetchone()
+    if not count:
+        return None
+    index = _hnswlib.Index(space="ip", dim=width // 4)
+    try:
+        index.load_index(str(path))
+    except Exception:  # unreadable or built for another dimension
+        return None
+    if index.get_current_count() != count:
+        return None
+    index.set_ef(HNSW_EF_SEARCH)  # hnswlib searches with max(ef, k)
+    return index
+
+
+def load_embedding_search(conn: sqlite3.Connection, db_path: str):
+    """Search state for /embed-search: ``("hnsw", index)`` when a current index file
+    exists, else ``("exact", (ids, matrix))``; None if no embeddings are stored."""
+    index = _load_embedding_index(conn, embedding_index_path(db_path))
+    if index is not None:
+        return "hnsw", index
+    data = load_embeddings(conn)
+    return ("exact", data) if data is not None else None
+
+
+def embedding_scores(state, qv, limit: int) -> list:
+    """``[(score, rowid), ...]`` best first, for a state from load_embedding_search."""
+    kind, obj = state
+    if kind == "exact":
+        return top_embeddings(*obj, qv, limit)
+    import numpy as np
+    k = min(limit, obj.get_current_count())
+    if k <= 0:
+        return []
+    labels, dists = obj.knn_query(np.asarray(qv, dtype=np.float32).reshape(1, -1), k=k)
+    # "ip" distance is 1 - dot product
+    return [(1.0 - float(d), int(rid)) for rid, d in zip(labels[0], dists[0])]
+
+
+def embedding_hits(cur: sqlite3.Cursor, scores: list) -> list:
+    """Section rows for ``scores`` in score order, fetched with a single IN query."""
+    if not scores:
+        return []
+    rids = [rid for _, rid in scores]
+    cur.execute(f"SELECT rowid, title, part, section, heading FROM sections WHERE rowid IN ({','.join('?' * len(rids))})", rids)
+    rows = {r[0]: r for r in cur.fetchall()}
+    return [
+        {'score': sim, 'rowid': r[0], 'title': r[1], 'part': r[2], 'section': r[3], 'heading': r[4]}
+        for sim, r in ((sim, rows.get(rid)) for sim, rid in scores) if r
+    ]
+
+
+def _db_stamp(db_path: str) -> tuple:
+    """Stat signature of the DB that changes on any write, including the WAL (ftsindex enables WAL)."""
+    st = Path(db_path).stat()
+    try:
+        wal = Path(db_path + "-wal").stat()
+        wal_sig = (wal.st_mtime_ns, wal.st_size) if wal.st_size else None
+    except FileNotFoundError:
+        wal_sig = None
+    return st.st_ino, st.st_mtime_ns, st.st_size, wal_sig
+
 
 def create_app(db_path: str, analyzer_db: Optional[str] = None) -> "FastAPI":  # type: ignore
     if FastAPI is None:  # pragma: no cover
@@ -23,10 +235,35 @@ def create_app(db_path: str, analyzer_db: Optional[str] = None) -> "FastAPI":  #
     if not Path(db_path).exists():
         raise FileNotFoundError(f"SQLite FTS index not found: {db_path}")
 
-    app = FastAPI(title="eCFR Search API")
+    pool = ConnectionPool(db_path)
+
+    @asynccontextmanager
+    async def lifespan(_app):
+        if os.getenv('ECFR_EMBED_PRELOAD'):
+            # pay the model load (seconds) at startup instead of on the first query
+            try:
+                embed_model()
+            except ImportError:  # pragma: no cover - embeddings not installed
+                pass
+        yield
+        pool.close()
 
-    def _connect():
-        return sqlite3.connect(db_path)
+    app = FastAPI(title="eCFR Search API", lifespan=lifespan)
+    app.state.pool = pool
+    # (db stamp, load_embedding_search state); rebuilt when the DB file changes (e.g. embed re-run)
+    app.state.embeddings = None
+    # SentenceTransformer loaded on the first /embed-search (or at startup with
+    # ECFR_EMBED_PRELOAD set) and reused afterwards
+    app.state.embed_model = None
+    model_lock = threading.Lock()
+
+    def embed_model():
+        from sentence_transformers import SentenceTransformer  # type: ignore
+        with model_lock:
+            if app.state.embed_model is None:
+                # must match the model the embed step stored vectors with
+                app.state.embed_model = SentenceTransformer(os.getenv('ECFR_EMBED_MODEL', 'all-MiniLM-L6-v2'))
+        return app.state.embed_model
 
     @app.get('/health')  # type: ignore
     def health():  # pragma: no cover - trivial
@@ -34,33 +271,26 @@ def create_app(db_path: str, analyzer_db: Optional[str] = None) -> "FastAPI":  #
 
     @app.get('/search')  # type: ignore
     def search(q: str, limit: int = 10):
-        conn = _connect()
-        try:
+        with pool.connection() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT rowid, title, part, section, heading, snippet(sections, 4, '[', ']', '...', 10) FROM sections WHERE sections MATCH ? LIMIT ?", (q, limit))
+            cur.execute(SEARCH_SQL, (q, limit))
             rows = cur.fetchall()
             return [
                 {'rowid': r[0], 'title': r[1], 'part': r[2], 'section': r[3], 'heading': r[4], 'snippet': r[5]} for r in rows
             ]
-        finally:
-            conn.close()
 
     @app.get('/titles')  # type: ignore
     def list_titles():
-        conn = _connect()
-        try:
+        with pool.connection() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT DISTINCT title FROM sections ORDER BY 1")
+            cur.execute(TITLES_SQL)
             return [r[0] for r in cur.fetchall()]
-        finally:
-            conn.close()
 
     @app.get('/section/{rowid}')  # type: ignore
     def get_section(rowid: int):  # pragma: no cover (logic simple)
-        conn = _connect()
-        try:
+        with pool.connection() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT rowid, title, part, section, heading, content, word_count FROM sections WHERE rowid=?", (rowid,))
+            cur.execute(SECTION_SQL, (rowid,))
             row = cur.fetchone()
             if not row:
                 if HTTPException is not Exception:
@@ -69,64 +299,46 @@ def create_app(db_path: str, analyzer_db: Optional[str] = None) -> "FastAPI":  #
             return {
                 'rowid': row[0], 'title': row[1], 'part': row[2], 'section': row[3], 'heading': row[4], 'content': row[5], 'word_count': row[6]
             }
-        finally:
-            conn.close()
 
     @app.get('/suggest')  # type: ignore
     def suggest(prefix: str, limit: int = 10):
-        conn = _connect()
-        try:
+        with pool.connection() as conn:
             cur = conn.cursor()
-            like = f"{prefix}%"
-            cur.execute("SELECT DISTINCT heading FROM sections WHERE heading LIKE ? ORDER BY heading LIMIT ?", (like, limit))
+            like = _like_prefix(prefix)
+            try:
+                cur.execute(SUGGEST_SQL, (like, limit))
+            except sqlite3.OperationalError:  # index built before ftsindex created the headings table
+                cur.execute(SUGGEST_FALLBACK_SQL, (like, limit))
             return [r[0] for r in cur.fetchall() if r[0]]
-        finally:
-            conn.close()
 
     @app.get('/embed-search')  # type: ignore
     def embed_search(q: str, limit: int = 5):  # pragma: no cover heavy
         # Optional semantic similarity if embeddings table present
         try:
-            from sentence_transformers import SentenceTransformer  # type: ignore
+            from sentence_transformers import SentenceTransformer  # type: ignore  # noqa: F401
         except Exception:
             if HTTPException is not Exception:
                 raise HTTPException(status_code=400, detail="Embeddings not enabled (install .[embed])")  # type: ignore
             raise RuntimeError("Embeddings not enabled")
-        conn = _connect()
-        try:
+        with pool.connection() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='embeddings'")
-            if not cur.fetchone():
-                if HTTPException is not Exception:
-                    raise HTTPException(status_code=400, detail="Embeddings table missing; run embed step")  # type: ignore
-                raise RuntimeError("Embeddings table missing")
-            cur.execute("SELECT section_rowid, vector FROM embeddings")
-            rows = cur.fetchall()
-            if not rows:
+            stamp = _db_stamp(db_path)
+            cached = app.state.embeddings
+            # the schema can only change along with the stamp, so the table
+            # check runs once per DB version rather than on every query
+            if cached is None or cached[0] != stamp:
+                cur.execute(EMBEDDINGS_TABLE_SQL)
+                if not cur.fetchone():
+                    if HTTPException is not Exception:
+                        raise HTTPException(status_code=400, detail="Embeddings table missing; run embed step")  # type: ignore
+                    raise RuntimeError("Embeddings table missing")
+                cached = app.state.embeddings = (stamp, load_embedding_search(conn, db_path))
+            if cached[1] is None:
                 if HTTPException is not Exception:
                     raise HTTPException(status_code=400, detail="No embeddings present")  # type: ignore
                 raise RuntimeError("No embeddings present")
-            first = rows[0][1]
-            length = int(len(first)/4)
-            import struct
-            unpack_fmt = f'{length}f'
-            stored = [(rid, struct.unpack(unpack_fmt, blob)) for rid, blob in rows]
-            model = SentenceTransformer('all-MiniLM-L6-v2')
-            qv = model.encode([q], normalize_embeddings=True)[0]
-            scores = []
-            for rid, vec in stored:
-                sim = sum(a*b for a,b in zip(qv, vec))
-                scores.append((sim, rid))
-            scores.sort(reverse=True)
-            out = []
-            for sim, rid in scores[:limit]:
-                cur.execute("SELECT rowid, title, part, section, heading FROM sections WHERE rowid=?", (rid,))
-                srow = cur.fetchone()
-                if srow:
-                    out.append({'score': sim, 'rowid': srow[0], 'title': srow[1], 'part': srow[2], 'section': srow[3], 'heading': srow[4]})
-            return out
-        finally:
-            conn.close()
+            qv = embed_model().encode([q], convert_to_numpy=True, normalize_embeddings=True)[0]
+            return embedding_hits(cur, embedding_scores(cached[1], qv, limit))
 
     # Attempt analyzer router mount
     if analyzer_db is None:
@@ -136,10 +348,15 @@ def create_app(db_path: str, analyzer_db: Optional[str] = None) -> "FastAPI":  #
     if analyzer_db:
         try:  # pragma: no cover
             from .analyzer.api import router as analyzer_router
+            # per app, so each create_app serves its own analyzer DB
+            app.state.analyzer_db = analyzer_db
             app.include_router(analyzer_router)
         except Exception:
             pass
 
     return app
 
-__all__ = ["create_app"]
+__all__ = [
+    "create_app", "ConnectionPool", "build_heading_index", "load_embeddings", "top_embeddings", "build_embedding_index",
+    "embedding_index_path", "load_embedding_search", "embedding_scores", "embedding_hits",
+]
@@ -1,10 +1,9 @@
 import argparse
-import json
 import os
 import logging
 
-from .scraper import ECFRScraper
-from .utils import save_checksum_db, setup_logging
+from .scraper import ECFRScraper, DEFAULT_DOWNLOAD_WORKERS
+from .utils import json_dumps, save_checksum_db, setup_logging
 from .pipeline import run_pipeline, STEP_REGISTRY
 
 
@@ -13,7 +12,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--title", type=int, help="Title number to download and parse")
     parser.add_argument("--all", action="store_true", help="Download and parse all titles")
     parser.add_argument("--output", type=str, default="./data", help="Output directory for files")
-    parser.add_argument("--workers", type=int, default=5, help="Number of worker threads for parallel downloads")
+    parser.add_argument("--workers", type=int, default=DEFAULT_DOWNLOAD_WORKERS, help="Number of worker threads for parallel downloads")
     parser.add_argument("--metadata-only", action="store_true", help="Only generate metadata without parsing XML")
     parser.add_argument(
         "--download-only",
@@ -44,7 +43,7 @@ def main(argv: list[str] | None = None) -> int:
     setup_logging(verbose=args.verbose)
     logger = logging.getLogger(__name__)
 
-    scraper = ECFRScraper(output_dir=args.output)
+    scraper = ECFRScraper(output_dir=args.output, max_workers=args.workers)
 
     if args.list_steps:
         print("Available steps:")
@@ -101,8 +100,8 @@ def main(argv: list[str] | None = None) -> int:
         if not args.metadata_only:
             results = scraper.process_downloaded_files(files)
             summary_path = os.path.join(args.output, "processing_summary.json")
-            with open(summary_path, "w", encoding="utf-8") as f:
-                json.dump(results, f, indent=2)
+            with open(summary_path, "wb") as f:
+                f.write(json_dumps(results))
             logger.info(f"Processing summary saved to {summary_path}")
         save_checksum_db(scraper.checksum_db)
     elif args.title:
@@ -112,6 +111,7 @@ def main(argv: list[str] | None = None) -> int:
             if data:
                 json_path = xml_path.replace(".xml", ".json")
                 scraper.export_to_json(data, json_path)
+                scraper.save_lexical_cache()
         save_checksum_db(scraper.checksum_db)
     else:
         parser.print_help()
@@ -4,11 +4,42 @@ import json
 import zipfile
 import mimetypes
 import logging
+import posixpath
 from collections import Counter
+from functools import lru_cache
 import xml.etree.ElementTree as ET
 
+try:  # optional C-backed parser (also exposes real namespace maps); stdlib is the fallback
+    from lxml import etree as _lxml_etree  # type: ignore
+except ImportError:  # pragma: no cover
+    _lxml_etree = None
+
 logger = logging.getLogger(__name__)
 
+_WORD_RE = re.compile(r"\b\w+\b")
+
+
+def _file_ext(file_path: str) -> str:
+    """Lower-cased extension without the dot; same result as os.path.splitext."""
+    stem, _, ext = os.path.basename(file_path).rpartition(".")
+    # splitext ignores leading dots, so ".xml" or "..xml" has no extension
+    return ext.lower() if stem.strip(".") else ""
+
+
+def _type_suffix(name: str) -> str:
+    """The last two extensions of ``name`` (e.g. ``.svg.gz``): all guess_type reads."""
+    base, ext = posixpath.splitext(name)
+    return posixpath.splitext(base)[1] + ext
+
+
+@lru_cache(maxsize=1024)
+def _is_image_suffix(suffix: str) -> bool:
+    # guess_type strips at most one encoding suffix (.gz, .bz2, ...) and then
+    # maps one extension, using the system mime.types as well as its own
+    # table; caching per suffix skips that lookup per archive member
+    mime_type, _ = mimetypes.guess_type("x" + suffix)
+    return bool(mime_type and mime_type.startswith("image"))
+
 
 class MetadataExtractor:
     """Class to extract and parse metadata from various file types"""
@@ -24,21 +55,60 @@ class MetadataExtractor:
 
     def extract(self, file_path: str):
         """Extract metadata based on file type"""
-        ext = os.path.splitext(file_path)[1].lower().lstrip(".")
-        transformer = self.transformers.get(ext, self.transformers["default"])
+        transformer = self.transformers.get(_file_ext(file_path)) or self.transformers["default"]
         return transformer(file_path)
 
     def extract_xml_metadata(self, file_path: str):
-        """Extract metadata from XML files"""
+        """Extract metadata from XML files
+
+        Streams the document with iterparse (lxml when installed, else the
+        stdlib parser) and clears elements once their text has been
+        collected, so the full tree is never held in memory.
+        """
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
+            root = None
+            child_elements = []
+            element_count = 0
+            depth = 0
+            pieces = []
+            # Element text/tail is only final once the parser emits the next
+            # event, so each event's text is collected one step later.
+            pending = None
+            if _lxml_etree is not None:
+                # lxml keeps comments/PIs as nodes; their tails hold text the
+                # stdlib parser would have merged into the surrounding text
+                events = _lxml_etree.iterparse(
+                    file_path, events=("start", "end", "comment", "pi"), huge_tree=True
+                )
+            else:
+                events = ET.iterparse(file_path, events=("start", "end"))
+            for event, elem in events:
+                if pending is not None:
+                    el, attr = pending
+                    txt = getattr(el, attr)
+                    if txt:
+                        pieces.append(txt)
+                    if attr == "tail":
+                        el.clear()
+                if event in ("comment", "pi"):
+                    pending = (elem, "tail")
+                elif event == "start":
+                    if root is None:
+                        root = elem
+                    elif depth == 1:
+                        child_elements.append(elem.tag)
+                    depth += 1
+                    pending = (elem, "text")
+                else:
+                    depth -= 1
+                    element_count += 1
+                    pending = (elem, "tail") if depth else None
             metadata = {
                 "root_tag": root.tag,
                 "namespaces": getattr(root, "nsmap", {}) if hasattr(root, "nsmap") else {},
-                "child_elements": [child.tag for child in root],
-                "element_count": self._count_elements(root),
-                "word_stats": self._analyze_text_content(root),
+                "child_elements": child_elements,
+                "element_count": element_count,
+                "word_stats": self._analyze_text("".join(pieces)),
             }
             return metadata
         except Exception as e:
@@ -54,13 +124,18 @@ class MetadataExtractor:
         try:
             with zipfile.ZipFile(file_path, "r") as zip_ref:
                 files = zip_ref.namelist()
-                image_files = [f for f in files if self._is_image_file(f)]
+                image_files = []
+                other_files = []
+                # one classification pass; directory entries have no extension
+                # and so always land in other_files
+                for f in files:
+                    (image_files if self._is_image_file(f) else other_files).append(f)
                 return {
                     "file_type": "zip",
                     "file_count": len(files),
                     "contains_images": len(image_files) > 0,
                     "image_files": image_files,
-                    "other_files": [f for f in files if f not in image_files],
+                    "other_files": other_files,
                 }
         except Exception as e:
             logger.error(f"Error extracting ZIP metadata from {file_path}: {e}")
@@ -85,27 +160,16 @@ class MetadataExtractor:
             "size": os.path.getsize(file_path) if os.path.exists(file_path) else 0,
         }
 
-    def _count_elements(self, element) -> int:
-        count = 1
-        for child in element:
-            count += self._count_elements(child)
-        return count
-
-    def _analyze_text_content(self, element):
-        text = "".join(element.itertext()) if hasattr(element, "itertext") else ""
-        return self._analyze_text(text)
-
-    def _analyze_text(self, text: str):
-        words = re.findall(r"\b\w+\b", text.lower())
-        word_count = len(words)
-        word_freq = Counter(words).most_common(20)
+    def _analyze_text(self, text: str, top_k: int = 20):
+        """Word statistics for ``text``; ``top_k=0`` skips ranking the top words."""
+        counts = Counter(_WORD_RE.findall(text.lower()))
+        word_count = sum(counts.values())
         return {
             "word_count": word_count,
-            "unique_word_count": len(set(words)),
-            "top_words": word_freq,
-            "avg_word_length": sum(len(word) for word in words) / word_count if word_count > 0 else 0,
+            "unique_word_count": len(counts),
+            "top_words": counts.most_common(top_k) if top_k else [],
+            "avg_word_length": sum(len(word) * n for word, n in counts.items()) / word_count if word_count > 0 else 0,
         }
 
     def _is_image_file(self, filename: str) -> bool:
-        mime_type, _ = mimetypes.guess_type(filename)
-        return bool(mime_type and mime_type.startswith("image"))
+        return _is_image_suffix(_type_suffix(filename))
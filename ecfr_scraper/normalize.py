@@ -8,8 +8,9 @@ Functions here operate on exported title JSON (post `export` step) to:
   * Produce per-section JSON artifacts (idempotent + cached)
   * Support HTML / Markdown rendering of sections
 
-Caching: normalization_cache.json keyed by anchor_id -> sha256(content) so
-repeated runs skip unchanged sections.
+Caching: normalization_cache.json keyed by anchor_id -> blake2b(content|name)
+so repeated runs skip unchanged sections. (Caches written with the earlier
+sha256 digests simply miss once and are rewritten.)
 """
 from __future__ import annotations
 
@@ -18,35 +19,74 @@ from typing import Any, Dict, List, Optional
 import re
 import json
 import hashlib
-from datetime import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+
+from .utils import json_dumps, json_loads
 
 HEAD_RE = re.compile(r"^(§\s*(?P<num>[0-9][0-9A-Za-z.\-]*))\s+(?P<title>.+?)\s*$")
 FR_BLOCK_RE = re.compile(r"\[(?P<block>[^\]]+?)\]\s*$")
 FR_CIT_RE = re.compile(r"(?P<cite>\d+\s+FR\s+\d+)")
-DATE_FULL_RE = re.compile(r"(Jan\.|Feb\.|Mar\.|Apr\.|May|Jun\.|Jul\.|Aug\.|Sep\.|Oct\.|Nov\.|Dec\.)\s+\d{1,2},\s+\d{4}")
+DATE_FULL_RE = re.compile(r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\.?\s+(\d{1,2}),\s+(\d{4})")
+_MONTHS = {"Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+           "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12}
 CFR_CIT_RE = re.compile(r"\b(\d+)\s+CFR\s+(\d+(?:\.\d+)*)")
 
 PARA_SPLIT_RE = re.compile(r"\n\s*\n+", re.MULTILINE)
+PARA_LABEL_RE = re.compile(r"^\(([a-z0-9ivxlcdmIVXLCDM]+)\)")
+TOP_LABEL_RE = re.compile(r"^\([a-z]\)$")
+NUM_LABEL_RE = re.compile(r"^\(\d+\)$")
+# runs of 2+ blanks or a lone tab; a lone space is already normalized, so
+# it is left alone instead of being rewritten by every _clean_ws call
+WS_RE = re.compile(r"[ \t]{2,}|\t")
+PART_NUM_RE = re.compile(r"PART\s+([0-9A-Za-z]+)")
+SECT_NUM_RE = re.compile(r"§\s*([0-9][0-9A-Za-z.\-]*)")
 
 CACHE_FILENAME = "normalization_cache.json"
 
-def _sha256(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+def _payload_digest(content: str, name: str) -> str:
+    # 128-bit blake2b is plenty for change detection; feeding the parts via
+    # update() avoids building a content + '|' + name copy
+    h = hashlib.blake2b(digest_size=16)
+    h.update(content.encode("utf-8"))
+    h.update(b"|")
+    h.update(name.encode("utf-8"))
+    return h.hexdigest()
+
+# cache path -> digest of the bytes last read or written there, so
+# save_cache can skip rewriting an unchanged cache
+_cache_digests: Dict[str, str] = {}
+
+def _bytes_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 def load_cache(base: Path) -> Dict[str, str]:
     p = base / CACHE_FILENAME
     if p.exists():
+        raw = p.read_bytes()
         try:
-            return json.loads(p.read_text(encoding='utf-8'))
-        except json.JSONDecodeError:
+            cache = json_loads(raw)
+        except json.JSONDecodeError:  # orjson's decode error subclasses this
             return {}
+        _cache_digests[str(p)] = _bytes_digest(raw)
+        return cache
     return {}
 
 def save_cache(base: Path, cache: Dict[str, str]) -> None:
-    (base / CACHE_FILENAME).write_text(json.dumps(cache, indent=2), encoding='utf-8')
+    p = base / CACHE_FILENAME
+    data = json_dumps(cache)
+    digest = _bytes_digest(data)
+    if _cache_digests.get(str(p)) == digest and p.exists():
+        return
+    # write-then-rename so an interrupted run never leaves a truncated cache
+    tmp = p.with_name(CACHE_FILENAME + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, p)
+    _cache_digests[str(p)] = digest
 
 def _clean_ws(s: str) -> str:
-    return re.sub(r"[ \t]+", " ", s.strip())
+    return WS_RE.sub(" ", s.strip())
 
 def extract_heading(section_name: str) -> Dict[str, Optional[str]]:
     m = HEAD_RE.match(section_name.strip())
@@ -64,8 +104,17 @@ def extract_heading(section_name: str) -> Dict[str, Optional[str]]:
     }
 
 def extract_fr_history(content: str) -> Dict[str, Any]:
+    return _fr_history(FR_BLOCK_RE.search(content))
+
+def _to_iso(parts: tuple) -> Optional[str]:
+    """(month abbrev, day, year) from DATE_FULL_RE -> ISO date; None if not a real date."""
+    try:
+        return date(int(parts[2]), _MONTHS[parts[0]], int(parts[1])).isoformat()
+    except ValueError:
+        return None
+
+def _fr_history(m: Optional["re.Match[str]"]) -> Dict[str, Any]:
     out = {"fr_citations": [], "amend_history": []}
-    m = FR_BLOCK_RE.search(content)
     if not m:
         return out
     block = m.group('block')
@@ -73,37 +122,40 @@ def extract_fr_history(content: str) -> Dict[str, Any]:
     full_dates = DATE_FULL_RE.findall(block)
     out["fr_citations"] = cites
     for i, cite in enumerate(cites):
-        date = full_dates[i] if i < len(full_dates) else None
-        iso = None
-        if date:
-            try:
-                iso = datetime.strptime(date.replace('.', ''), '%b %d, %Y').date().isoformat()
-            except ValueError:
-                iso = None
+        iso = _to_iso(full_dates[i]) if i < len(full_dates) else None
         out["amend_history"].append({"fr_citation": cite, "date": iso})
     return out
 
 def extract_cfr_citations(text: str) -> List[str]:
+    if "CFR" not in text:  # most sections cite nothing; skip the regex scan
+        return []
     cites = []
     for m in CFR_CIT_RE.finditer(text):
         cites.append(f"{m.group(1)} CFR {m.group(2)}")
     return sorted(set(cites))
 
 def split_paragraphs(content: str) -> List[Dict[str, Optional[str]]]:
-    content_wo_fr = FR_BLOCK_RE.sub('', content).rstrip()
+    return _split_paragraphs(content, FR_BLOCK_RE.search(content))
+
+def _split_paragraphs(content: str, fr_block: Optional["re.Match[str]"]) -> List[Dict[str, Optional[str]]]:
+    # FR_BLOCK_RE is anchored at the end, so it matches at most once and only
+    # a trailing newline can follow it; the rstrip drops that, so the body is
+    # everything before the match (what FR_BLOCK_RE.sub('', content) left)
+    content_wo_fr = (content[:fr_block.start()] if fr_block else content).rstrip()
     raw_paras = PARA_SPLIT_RE.split(content_wo_fr)
     paras: List[Dict[str, Optional[str]]] = []
     for p in raw_paras:
         p = p.strip('\n')
-        if not p.strip():
+        if not p or p.isspace():
             continue
-        first_line = p.splitlines()[0]
+        # a label cannot span a line break, so matching the whole paragraph
+        # is the same as matching its first line without splitting it
         label = None
-        m = re.match(r"^\(([a-z0-9ivxlcdmIVXLCDM]+)\)", first_line)
+        m = PARA_LABEL_RE.match(p)
         txt = p
         if m:
             label = f"({m.group(1)})"
-            txt = p[len(m.group(0)):].lstrip()
+            txt = p[m.end():].lstrip()
         paras.append({"label": label, "text": _clean_ws(txt)})
     return paras
 
@@ -112,24 +164,29 @@ def build_enumerations(paras: List[Dict[str, Optional[str]]]) -> Dict[str, List[
     current_top = None
     for p in paras:
         label = p.get("label")
-        if label and re.match(r"^\([a-z]\)$", label):
+        if label and TOP_LABEL_RE.match(label):
             current_top = label
             continue
-        if label and re.match(r"^\(\d+\)$", label) and current_top:
+        if label and NUM_LABEL_RE.match(label) and current_top:
             enums.setdefault(current_top, []).append(f"{label} {p['text']}")
     return enums
 
+def _anchor_id(title_number: Optional[str], section_number: Optional[str]) -> str:
+    return f"title{title_number}-{section_number.replace('.', '-') if section_number else 'unknown'}"
+
 def normalize_section(section: Dict[str, Any], title_number: Optional[str]) -> Dict[str, Any]:
     legacy_name = section.get("section_name") or ""
     heading_parts = extract_heading(legacy_name)
     content = section.get("content") or ""
     content_norm = content.replace('\r', '')
-    paras = split_paragraphs(content_norm)
+    # locate the trailing FR source block once for both paragraphs and history
+    fr_block = FR_BLOCK_RE.search(content_norm)
+    paras = _split_paragraphs(content_norm, fr_block)
     enumerations = build_enumerations(paras)
-    fr_hist = extract_fr_history(content_norm)
+    fr_hist = _fr_history(fr_block)
     cfr_citations = extract_cfr_citations(content_norm)
     section_number = heading_parts.get("section_number")
-    anchor_id = f"title{title_number}-{section_number.replace('.', '-') if section_number else 'unknown'}"
+    anchor_id = _anchor_id(title_number, section_number)
     normalized = {
         **heading_parts,
         **fr_hist,
@@ -142,18 +199,40 @@ def normalize_section(section: Dict[str, Any], title_number: Optional[str]) -> D
     }
     return normalized
 
-def normalize_title_file(path: Path, output_dir: Optional[Path] = None, cache: Optional[Dict[str, str]] = None) -> int:
-    data = json.loads(path.read_text(encoding='utf-8'))
+# Below this many sections, process start-up and pickling outweigh the gain.
+PARALLEL_MIN_SECTIONS = 500
+# Section artifacts are small files; file I/O releases the GIL, so a few
+# threads overlap the open/write/close syscalls.
+SECTION_WRITE_THREADS = 8
+
+def _normalize_job(job: tuple) -> tuple:
+    """(section, title_number, dump) -> (normalized, serialized JSON bytes or None)."""
+    section, title_number, dump = job
+    norm = normalize_section(section, title_number)
+    return norm, (json_dumps(norm) if dump else None)
+
+def normalize_title_file(path: Path, output_dir: Optional[Path] = None, cache: Optional[Dict[str, str]] = None,
+                         workers: Optional[int] = None) -> int:
+    """Normalize one title JSON in place and write per-section artifacts; returns sections written.
+
+    With ``workers`` > 1 and enough sections, normalization and JSON encoding
+    (pure CPU, GIL bound) run in a process pool. Section files are written
+    by a small thread pool from this process.
+    """
+    data = json_loads(path.read_bytes())
     title_number = data.get('title_number') or path.stem.replace('title', '')
     out_base = (output_dir or path.parent)
     sections_dir = out_base / 'sections' / f'title{title_number}'
     sections_dir.mkdir(parents=True, exist_ok=True)
     count = 0
     modified = False
+    sections: List[Dict[str, Any]] = []
+    hashes: List[str] = []
+    jobs: List[tuple] = []
     for part in data.get('parts', []):
         # Infer part_number if missing by scanning part_name like 'PART 10—...'
         if not part.get('part_number') and part.get('part_name'):
-            m_p = re.search(r"PART\s+([0-9A-Za-z]+)", part['part_name'])
+            m_p = PART_NUM_RE.search(part['part_name'])
             if m_p:
                 part['part_number'] = m_p.group(1)
                 modified = True
@@ -162,25 +241,50 @@ def normalize_title_file(path: Path, output_dir: Optional[Path] = None, cache: O
             legacy_name = section.get('section_name') or ''
             # Backfill section_number if null using heading pattern
             if not section.get('section_number') and legacy_name:
-                m_s = re.match(r"§\s*([0-9][0-9A-Za-z.\-]*)", legacy_name)
+                m_s = SECT_NUM_RE.match(legacy_name)
                 if m_s:
                     section['section_number'] = m_s.group(1)
                     modified = True
-            norm = normalize_section(section, title_number)
-            anchor = norm.get('anchor_id')
-            payload_hash = _sha256(content + '|' + legacy_name)
-            if cache is not None and anchor in cache and cache[anchor] == payload_hash:
-                section.update(norm)
-                continue
+            payload_hash = _payload_digest(content, legacy_name)
+            # the anchor comes from the heading alone, so cache hits are known
+            # before normalizing and skip the JSON encode
+            anchor = _anchor_id(title_number, extract_heading(legacy_name).get('section_number'))
+            hit = cache is not None and cache.get(anchor) == payload_hash
+            sections.append(section)
+            hashes.append(payload_hash)
+            jobs.append((section, title_number, not hit))
+    pool = None
+    if workers and workers > 1 and len(jobs) >= PARALLEL_MIN_SECTIONS:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    # Sections sharing a section_number share a file; keep only the last
+    # payload per path (as the serial loop did) so no two writes race on it.
+    payloads: Dict[Path, bytes] = {}
+    hashed: Dict[Path, List[tuple]] = {}  # path -> [(anchor, payload_hash)], cached once on disk
+    try:
+        results = pool.map(_normalize_job, jobs, chunksize=32) if pool else map(_normalize_job, jobs)
+        for section, payload_hash, (norm, serialized) in zip(sections, hashes, results):
             section.update(norm)
+            if serialized is None:
+                continue
             file_name = f"{(norm.get('section_number') or f'idx{count}').replace('.', '_')}.json"
-            (sections_dir / file_name).write_text(json.dumps(norm, indent=2, ensure_ascii=False), encoding='utf-8')
-            if cache is not None and anchor:
-                cache[anchor] = payload_hash
+            target = sections_dir / file_name
+            payloads[target] = serialized
+            hashed.setdefault(target, []).append((norm.get('anchor_id'), payload_hash))
             count += 1
             modified = True
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    with ThreadPoolExecutor(max_workers=SECTION_WRITE_THREADS) as writer:
+        writes = [(writer.submit(target.write_bytes, serialized), target) for target, serialized in payloads.items()]
+        for fut, target in writes:
+            fut.result()  # re-raise a failed write before its hashes are cached
+            if cache is not None:
+                for anchor, payload_hash in hashed[target]:
+                    if anchor:
+                        cache[anchor] = payload_hash
     if modified:
-        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+        path.write_bytes(json_dumps(data))
     return count
 
 def render_section_html(section: Dict[str, Any]) -> str:
@@ -13,24 +13,47 @@ New steps can be added by registering in STEP_REGISTRY.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Any, Optional
+import bisect
+from typing import Callable, Dict, List, Any, NamedTuple, Optional
 import gzip
-import json
 from pathlib import Path
 from datetime import datetime
 import logging
 import sqlite3
 import os
+import shutil
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import xml.sax
+from xml.sax.saxutils import XMLGenerator
 
 from .scraper import ECFRScraper
-from .utils import calculate_checksum, load_checksum_db, save_checksum_db
+from .utils import calculate_checksum, checksum_key, json_dumps, json_loads, load_checksum_db, new_hasher, save_checksum_db
 from . import normalize as norm
+try:  # ISA-L deflate: gzip-compatible output, several times faster than zlib
+    from isal import igzip as _gzip  # type: ignore
+    GZIP_LEVEL = 3  # ISA-L's highest level; ratio is close to zlib's 9
+except ImportError:  # pragma: no cover
+    _gzip = gzip  # type: ignore
+    GZIP_LEVEL = 9
+GZIP_CHUNK = 1 << 20
+# Bulk-insert statements, each bound through executemany so SQLite prepares
+# it once per load (repeat batches hit sqlite3's per-connection statement cache).
+FTS_INSERT_SQL = "INSERT INTO sections (title, part, section, heading, content, word_count) VALUES (?,?,?,?,?,?)"
+EMBED_INSERT_SQL = "INSERT OR REPLACE INTO embeddings(section_rowid, vector) VALUES (?, ?)"
+EMBEDPARA_INSERT_SQL = "INSERT OR REPLACE INTO paragraph_embeddings(section_rowid, para_index, vector) VALUES (?,?,?)"
+# sidecar in output_dir holding the manifest step's per-file checksums
+MANIFEST_CHECKSUM_CACHE = '.checksum_cache.json'
 try:  # optional analyzer import
     from .analyzer import ingest as analyzer_ingest
+    from .analyzer import metrics as analyzer_primitive_metrics
     from .analyzer import metrics_ext as analyzer_metrics
+    from .analyzer import schema as analyzer_schema
 except Exception:  # pragma: no cover
     analyzer_ingest = None  # type: ignore
+    analyzer_primitive_metrics = None  # type: ignore
     analyzer_metrics = None  # type: ignore
+    analyzer_schema = None  # type: ignore
 
 # Decorator-based registration -------------------------------------------------
 STEP_REGISTRY: Dict[str, "StepFunc"] = {}
@@ -52,13 +75,23 @@ def pipeline_step(name: Optional[str] = None):
 logger = logging.getLogger(__name__)
 
 
+class EnrichedSection(NamedTuple):
+    """One section row from the enrich step, in ftsindex column order."""
+    title: Optional[str]
+    part: Optional[str]
+    section: Optional[str]
+    heading: Optional[str]
+    content: Optional[str]
+    word_count: Optional[int]
+
+
 @dataclass
 class PipelineContext:
     scraper: ECFRScraper
     titles: List[int] = field(default_factory=list)
     xml_files: List[str] = field(default_factory=list)
     parsed: List[dict] = field(default_factory=list)
-    enriched_sections: List[dict] = field(default_factory=list)
+    enriched_sections: List[EnrichedSection] = field(default_factory=list)
     db_path: Optional[str] = None
     paragraph_embeddings: bool = False
     analyzer_db: Optional[str] = None
@@ -68,16 +101,38 @@ StepFunc = Callable[[PipelineContext], None]
 _EMBED_MODEL = None  # type: ignore
 
 
+def _load_embed_model(step: str, model_name: str):
+    """Load (once) the SentenceTransformer shared by the embedding steps.
+
+    SentenceTransformer already picks CUDA/MPS when present; on CUDA the
+    weights are cast to fp16 for faster tensor-core inference. Stored vectors
+    stay float32 either way.
+    """
+    global _EMBED_MODEL
+    if _EMBED_MODEL is None:
+        from sentence_transformers import SentenceTransformer
+        logger.info("%s step: loading model %s", step, model_name)
+        _EMBED_MODEL = SentenceTransformer(model_name)
+        if _EMBED_MODEL.device.type == 'cuda':
+            _EMBED_MODEL.half()
+    return _EMBED_MODEL
+
+
+def _embed_on_gpu(model) -> bool:
+    return model.device.type != 'cpu'
+
+
 @pipeline_step()
 def download(ctx: PipelineContext) -> None:
     if not ctx.titles:
         logger.error("No titles specified for download step.")
         return
-    xml_files: List[str] = []
-    for t in ctx.titles:
-        path = ctx.scraper.download_title_xml(t)
-        if path:
-            xml_files.append(path)
+    # one shared keep-alive pool for all workers (as in download_all_titles);
+    # map keeps xml_files in title order
+    workers = max(1, min(ctx.scraper.max_workers, len(ctx.titles)))
+    ctx.scraper.ensure_session(workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        xml_files = [p for p in pool.map(ctx.scraper.download_title_xml, ctx.titles) if p]
     ctx.xml_files.extend(xml_files)
     logger.info("Download step complete: %d files", len(xml_files))
 
@@ -91,6 +146,7 @@ def parse(ctx: PipelineContext) -> None:
         data = ctx.scraper.parse_xml(path)
         if data:
             ctx.parsed.append({"path": path, "data": data})
+    ctx.scraper.save_lexical_cache()
     logger.info("Parse step complete: %d parsed documents", len(ctx.parsed))
 
 
@@ -110,76 +166,254 @@ def export(ctx: PipelineContext) -> None:
 
 # Additional steps -------------------------------------------------------------
 
+class _MinifyWriter(XMLGenerator):
+    """SAX handler re-emitting a document with every text run stripped.
+
+    Each run of characters between two tags is one element's text or tail,
+    so stripping it at the next tag matches the DOM pass in _minify_one.
+    Comments and processing instructions are dropped, as ElementTree does.
+    """
+
+    def __init__(self, out) -> None:
+        super().__init__(out, encoding='utf-8', short_empty_elements=True)
+        self._text: List[str] = []
+
+    def _flush_text(self) -> None:
+        if self._text:
+            t = ''.join(self._text).strip()
+            self._text.clear()
+            if t:
+                super().characters(t)
+
+    def startElement(self, name, attrs):
+        self._flush_text()
+        super().startElement(name, attrs)
+
+    def endElement(self, name):
+        self._flush_text()
+        super().endElement(name)
+
+    def characters(self, content):
+        self._text.append(content)
+
+    def ignorableWhitespace(self, whitespace):
+        pass
+
+    def processingInstruction(self, target, data):
+        pass
+
+def _write_minified(xml_path: str, out: Any) -> None:
+    """Serialize the minified form of ``xml_path`` to the binary stream ``out``.
+
+    With lxml the tree is parsed and trimmed in memory; without it the file
+    is streamed through a SAX handler so memory stays flat for large titles.
+    """
+    try:
+        from lxml import etree as LET  # type: ignore
+    except ImportError:  # pragma: no cover
+        LET = None
+    if LET is None:
+        xml.sax.parse(xml_path, _MinifyWriter(out))
+        return
+    parser = LET.XMLParser(remove_blank_text=True, remove_comments=True, remove_pis=True, huge_tree=True)
+    tree = LET.parse(xml_path, parser)
+    root = tree.getroot()
+    # Strip leading/trailing whitespace in text (remove_blank_text only
+    # drops whitespace-only nodes)
+    for el in root.iter():
+        if el.text:
+            t = el.text.strip()
+            el.text = t if t else None
+        if el.tail:
+            tail = el.tail.strip()
+            el.tail = tail if tail else None
+    tree.write(out, encoding='utf-8', xml_declaration=True, method='xml')
+
+def _minify_one(xml_path: str) -> bool:
+    """Write ``xml_path``'s *.min.xml sibling; False when it fails."""
+    min_path = xml_path.replace('.xml', '.min.xml')
+    try:
+        with open(min_path, 'wb') as out:
+            _write_minified(xml_path, out)
+        return True
+    except Exception as e:  # pragma: no cover
+        logger.error("Minify failed for %s: %s", xml_path, e)
+        return False
+
+def _io_workers(n: int) -> int:
+    return max(1, min(n, os.cpu_count() or 1))
+
 @pipeline_step()
 def minify(ctx: PipelineContext) -> None:
     """Minify downloaded XML (produces *.min.xml) using whitespace/comment stripping.
-    Simple inline implementation to avoid external deps beyond stdlib.
+    Uses lxml when installed (blank text, comments and PIs dropped by the
+    parser, C serializer); otherwise a streaming stdlib SAX pass. The per-element
+    trim loop holds the GIL, so files are handled in a process pool.
     """
-    import xml.etree.ElementTree as ET
-    count = 0
-    for xml_path in list(ctx.xml_files):
-        if not xml_path.endswith('.xml'):
-            continue
-        min_path = xml_path.replace('.xml', '.min.xml')
-        try:
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
-            # Remove blank text nodes (ElementTree already collapses formatting)
-            # Strip leading/trailing whitespace in text
-            for el in root.iter():
-                if el.text:
-                    t = el.text.strip()
-                    el.text = t if t else None
-                if el.tail:
-                    tail = el.tail.strip()
-                    el.tail = tail if tail else None
-            ET.ElementTree(root).write(min_path, encoding='utf-8', xml_declaration=True, method='xml')
-            count += 1
-        except Exception as e:  # pragma: no cover
-            logger.error("Minify failed for %s: %s", xml_path, e)
+    xml_paths = [p for p in ctx.xml_files if p.endswith('.xml')]
+    if len(xml_paths) > 1:
+        with ProcessPoolExecutor(max_workers=_io_workers(len(xml_paths))) as pool:
+            count = sum(pool.map(_minify_one, xml_paths))
+    else:
+        count = sum(map(_minify_one, xml_paths))
     logger.info("Minify step complete: %d files", count)
 
+class _HashingWriter:
+    """Write-only file wrapper that hashes and counts bytes on their way to disk."""
+
+    def __init__(self, raw: Any, hasher: Any) -> None:
+        self.raw = raw
+        self.hasher = hasher
+        self.size = 0
+
+    def write(self, b: bytes) -> int:
+        self.hasher.update(b)
+        self.size += len(b)
+        return self.raw.write(b)
+
+    def flush(self) -> None:
+        self.raw.flush()
+
+class _TeeWriter:
+    """Write-only file wrapper copying every write to several sinks."""
+
+    def __init__(self, *sinks: Any) -> None:
+        self.sinks = sinks
+
+    def write(self, b: bytes) -> int:
+        for sink in self.sinks:
+            sink.write(b)
+        return len(b)
+
+def _gzip_one(xml_path: str, level: int = GZIP_LEVEL) -> Optional[Dict[str, Any]]:
+    """Gzip the minified (or raw) XML for ``xml_path``; returns its manifest entry."""
+    min_path = xml_path.replace('.xml', '.min.xml')
+    src = Path(min_path if Path(min_path).exists() else xml_path)
+    if not src.exists():
+        return None
+    gz_path = src.with_suffix(src.suffix + '.gz')
+    try:
+        # stream 1 MiB at a time rather than holding the whole XML in memory
+        with open(src, 'rb') as fin, open(gz_path, 'wb') as raw:
+            out = _HashingWriter(raw, new_hasher('sha256'))
+            with _gzip.open(out, 'wb', compresslevel=level) as fh:
+                shutil.copyfileobj(fin, fh, length=GZIP_CHUNK)
+        return {
+            'file': gz_path.name,
+            'size': out.size,
+            'checksum': out.hasher.hexdigest(),
+        }
+    except Exception as e:  # pragma: no cover
+        logger.error("Gzip failed for %s: %s", src, e)
+        return None
+
+def _gzip_level() -> int:
+    """ECFR_GZIP_LEVEL clamped to 1..the backend's default; the default when unset or not an integer."""
+    level_env = os.getenv('ECFR_GZIP_LEVEL')
+    try:
+        return max(1, min(int(level_env), GZIP_LEVEL)) if level_env else GZIP_LEVEL
+    except ValueError:
+        return GZIP_LEVEL
+
+def _write_gzip_manifest(ctx: PipelineContext, manifest: List[Dict[str, Any]]) -> None:
+    if ctx.scraper.output_dir:
+        manifest_path = Path(ctx.scraper.output_dir) / 'manifest.json'
+        manifest_doc = {
+            'generated_at': datetime.utcnow().isoformat() + 'Z',
+            'files': sorted(manifest, key=itemgetter('file'))
+        }
+        manifest_path.write_bytes(json_dumps(manifest_doc))
+        logger.info("Wrote manifest with %d entries", len(manifest))
+
 @pipeline_step()
 def gzipxml(ctx: PipelineContext) -> None:
-    """Gzip minified XML files (*.min.xml -> *.xml.gz) and build manifest."""
-    manifest = []
+    """Gzip minified XML files (*.min.xml -> *.xml.gz) and build manifest.
+    Uses isal.igzip when installed, else the stdlib gzip; both release the GIL
+    while deflating, so files are compressed in a thread pool. ECFR_GZIP_LEVEL
+    lowers the compression level (clamped to 1..the backend's default) for speed.
+    """
+    level = _gzip_level()
+    with ThreadPoolExecutor(max_workers=_io_workers(len(ctx.xml_files))) as pool:
+        manifest = [m for m in pool.map(lambda p: _gzip_one(p, level), ctx.xml_files) if m]
+    _write_gzip_manifest(ctx, manifest)
+
+def _minify_gzip_one(xml_path: str, level: int = GZIP_LEVEL) -> Optional[Dict[str, Any]]:
+    """Write *.min.xml and *.min.xml.gz from one serialization; returns the gz manifest entry."""
+    min_path = xml_path.replace('.xml', '.min.xml')
+    gz_path = Path(min_path + '.gz')
+    try:
+        with open(min_path, 'wb') as fmin, open(gz_path, 'wb') as raw:
+            out = _HashingWriter(raw, new_hasher('sha256'))
+            with _gzip.open(out, 'wb', compresslevel=level) as fh:
+                _write_minified(xml_path, _TeeWriter(fmin, fh))
+        return {
+            'file': gz_path.name,
+            'size': out.size,
+            'checksum': out.hasher.hexdigest(),
+        }
+    except Exception as e:  # pragma: no cover
+        logger.error("Minify/gzip failed for %s: %s", xml_path, e)
+        return None
+
+@pipeline_step()
+def minify_gzipxml(ctx: PipelineContext) -> None:
+    """minify + gzipxml in one pass: each minified document is written to
+    *.min.xml and deflated into *.min.xml.gz as it is serialized, so the
+    minified file is never read back from disk. Writes the same manifest.json
+    as gzipxml; ECFR_GZIP_LEVEL applies as there.
+    """
+    xml_paths = [p for p in ctx.xml_files if p.endswith('.xml')]
+    level = _gzip_level()
+    if len(xml_paths) > 1:
+        with ProcessPoolExecutor(max_workers=_io_workers(len(xml_paths))) as pool:
+            manifest = [m for m in pool.map(_minify_gzip_one, xml_paths, [level] * len(xml_paths)) if m]
+    else:
+        manifest = [m for m in (_minify_gzip_one(p, level) for p in xml_paths) if m]
+    logger.info("minify_gzipxml step complete: %d files", len(manifest))
+    _write_gzip_manifest(ctx, manifest)
+
+@pipeline_step()
+def zstdxml(ctx: PipelineContext) -> None:
+    """Zstandard-compress minified XML (*.min.xml -> *.min.xml.zst) alongside gzipxml.
+
+    Requires ``zstandard`` (install .[fast]). ECFR_ZSTD_LEVEL sets the level
+    (default 3, about gzip -9's ratio at a fraction of the time; 19 for
+    archival). Each file is compressed with zstd's own worker threads.
+    """
+    try:
+        import zstandard as zstd  # type: ignore
+    except ImportError as e:  # pragma: no cover - optional dep
+        logger.warning("zstdxml step: zstandard not available (%s)", e)
+        return
+    level_env = os.getenv('ECFR_ZSTD_LEVEL')
+    try:
+        level = int(level_env) if level_env else 3
+    except ValueError:
+        level = 3
+    cctx = zstd.ZstdCompressor(level=level, threads=-1)
+    count = 0
     for xml_path in ctx.xml_files:
         min_path = xml_path.replace('.xml', '.min.xml')
         src = Path(min_path if Path(min_path).exists() else xml_path)
         if not src.exists():
             continue
-        gz_path = src.with_suffix(src.suffix + '.gz')
         try:
-            data = src.read_bytes()
-            with gzip.open(gz_path, 'wb', compresslevel=9) as fh:
-                fh.write(data)
-            manifest.append({
-                'file': gz_path.name,
-                'size': gz_path.stat().st_size,
-                'checksum': calculate_checksum(file_path=str(gz_path)),
-            })
+            with open(src, 'rb') as fin, open(src.with_suffix(src.suffix + '.zst'), 'wb') as fout:
+                cctx.copy_stream(fin, fout, read_size=GZIP_CHUNK)
+            count += 1
         except Exception as e:  # pragma: no cover
-            logger.error("Gzip failed for %s: %s", src, e)
-    # Write manifest
-    if ctx.scraper.output_dir:
-        manifest_path = Path(ctx.scraper.output_dir) / 'manifest.json'
-        manifest_doc = {
-            'generated_at': datetime.utcnow().isoformat() + 'Z',
-            'files': sorted(manifest, key=lambda m: m['file'])
-        }
-        with open(manifest_path, 'w', encoding='utf-8') as f:
-            json.dump(manifest_doc, f, indent=2)
-        logger.info("Wrote manifest with %d entries", len(manifest))
+            logger.error("Zstd failed for %s: %s", src, e)
+    logger.info("zstdxml step complete: %d files", count)
 
 @pipeline_step()
 def manifest(ctx: PipelineContext) -> None:
-    """Generate a unified artifact manifest (artifacts.json) including raw/minified/gzip + json.
+    """Generate a unified artifact manifest (artifacts.json) including raw/minified/gzip/zstd + json.
     Differs from gzip manifest.json which only lists gz files.
     """
     if not ctx.xml_files:
         logger.warning("manifest step: no xml_files present")
-    artifacts = []
     out_dir = Path(ctx.scraper.output_dir)
+    entries = []  # (file name, path, kind)
     for title_xml in ctx.xml_files:
         base = Path(title_xml).name
         stem = base.replace('.xml','')
@@ -188,34 +422,54 @@ def manifest(ctx: PipelineContext) -> None:
             out_dir / f"{stem}.min.xml",
             out_dir / f"{stem}.min.xml.gz",
             out_dir / f"{stem}.xml.gz",
+            out_dir / f"{stem}.min.xml.zst",
+            out_dir / f"{stem}.xml.zst",
             out_dir / f"{stem}.json",
             out_dir / f"{stem}.xml.metadata.json",
         ]
         for c in candidates:
             if c.exists():
-                artifacts.append({
-                    'file': c.name,
-                    'size': c.stat().st_size,
-                    'checksum': calculate_checksum(file_path=str(c)),
-                    'kind': 'artifact'
-                })
+                entries.append((c.name, c, 'artifact'))
     # Section artifacts
     sections_root = out_dir / 'sections'
     if sections_root.exists():
         for sec in sections_root.rglob('*.json'):
-            artifacts.append({
-                'file': str(sec.relative_to(out_dir)),
-                'size': sec.stat().st_size,
-                'checksum': calculate_checksum(file_path=str(sec)),
-                'kind': 'section'
-            })
+            entries.append((str(sec.relative_to(out_dir)), sec, 'section'))
+
+    # file name -> [size, mtime_ns, checksum] from the previous run; files
+    # whose size and mtime are unchanged are not re-hashed
+    cache_path = out_dir / MANIFEST_CHECKSUM_CACHE
+    try:
+        cache = json_loads(cache_path.read_bytes()) if cache_path.exists() else {}
+    except ValueError:
+        cache = {}
+
+    def describe(entry):
+        name, path, kind = entry
+        st = path.stat()
+        hit = cache.get(name)
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            checksum = hit[2]
+        else:
+            checksum = calculate_checksum(file_path=str(path), algorithm='sha256')
+        return {
+            'file': name,
+            'size': st.st_size,
+            'checksum': checksum,
+            'kind': kind
+        }, [st.st_size, st.st_mtime_ns, checksum]
+
+    # hashlib releases the GIL while hashing, so files are hashed concurrently
+    with ThreadPoolExecutor(max_workers=_io_workers(len(entries))) as pool:
+        described = list(pool.map(describe, entries))
+    artifacts = [a for a, _ in described]
+    cache_path.write_bytes(json_dumps({a['file']: sig for a, sig in described}, indent=False))
     doc = {
         'schema_version': '1.0',
         'generated_at': datetime.utcnow().isoformat()+'Z',
-        'artifacts': sorted(artifacts, key=lambda a: a['file'])
+        'artifacts': sorted(artifacts, key=itemgetter('file'))
     }
-    with open(out_dir / 'artifacts.json','w',encoding='utf-8') as f:
-        json.dump(doc,f,indent=2)
+    (out_dir / 'artifacts.json').write_bytes(json_dumps(doc))
     logger.info("Artifact manifest written: %d entries", len(artifacts))
 
 @pipeline_step()
@@ -224,40 +478,76 @@ def diff(ctx: PipelineContext) -> None:
     Compares current checksum_db (already updated by downloads) to saved on disk.
     """
     previous = load_checksum_db()
+    db = ctx.scraper.checksum_db
+    keys = [checksum_key(Path(path).name) for path in ctx.xml_files]
+    # files not fetched this run (e.g. passed in from disk) have no current
+    # checksum yet; hash them (hashlib releases the GIL) rather than calling
+    # every one of them changed
+    missing = [(k, p) for k, p in zip(keys, ctx.xml_files) if k not in db and os.path.exists(p)]
+    if missing:
+        with ThreadPoolExecutor(max_workers=_io_workers(len(missing))) as pool:
+            for (key, _), digest in zip(missing, pool.map(lambda m: calculate_checksum(file_path=m[1]), missing)):
+                db[key] = digest
     changed = []
-    for path in ctx.xml_files:
-        fname = Path(path).name
-        current_hash = ctx.scraper.checksum_db.get(fname)
-        prev_hash = previous.get(fname)
-        if current_hash != prev_hash:
+    for path, key in zip(ctx.xml_files, keys):
+        if db.get(key) != previous.get(key):
             changed.append(path)
     ctx.xml_files = changed
     logger.info("Diff step: %d changed files retained", len(changed))
 
+def _enrich_rows(pdata: dict) -> List[EnrichedSection]:
+    """Flatten one parsed title into EnrichedSection rows."""
+    title_num = pdata.get('title_number')
+    rows: List[EnrichedSection] = []
+    for part in pdata.get('parts', []):
+        part_no = part.get('part_number')
+        rows.extend(EnrichedSection(
+            title_num,
+            part_no,
+            section.get('section_number'),
+            section.get('section_name'),
+            section.get('content'),
+            section.get('word_count'),
+        ) for section in part.get('sections', []))
+    return rows
+
+@pipeline_step()
+def parse_export_enrich(ctx: PipelineContext) -> None:
+    """parse + export + enrich in one pass over ctx.xml_files.
+
+    Each title is parsed, written to JSON and flattened into
+    ctx.enriched_sections before the next is parsed, so parsed trees are not
+    kept in ctx.parsed (peak memory is one title). Use the separate steps
+    when a later step needs ctx.parsed.
+    """
+    if not ctx.xml_files:
+        logger.warning("No XML files available to parse. Skipping parse_export_enrich step.")
+        return
+    rows: List[EnrichedSection] = []
+    exported = 0
+    for path in ctx.xml_files:
+        data = ctx.scraper.parse_xml(path)
+        if not data:
+            continue
+        if ctx.scraper.export_to_json(data, path.replace(".xml", ".json")):
+            exported += 1
+        rows.extend(_enrich_rows(data))
+    ctx.scraper.save_lexical_cache()
+    ctx.enriched_sections = rows
+    logger.info("parse_export_enrich step complete: %d JSON files, %d section rows", exported, len(rows))
+
 @pipeline_step()
 def enrich(ctx: PipelineContext) -> None:
     """Flatten parsed documents into section-level rows for search / index.
-    Populates ctx.enriched_sections with dicts: title, part, section, heading, content, word_count.
+    Populates ctx.enriched_sections with EnrichedSection tuples: title, part, section, heading, content, word_count.
     Requires parse step beforehand.
     """
     if not ctx.parsed:
         logger.warning("enrich step: parsed data empty; run parse before enrich")
         return
-    rows = []
+    rows: List[EnrichedSection] = []
     for doc in ctx.parsed:
-        pdata = doc['data']
-        title_num = pdata.get('title_number')
-        for part in pdata.get('parts', []):
-            part_no = part.get('part_number')
-            for section in part.get('sections', []):
-                rows.append({
-                    'title': title_num,
-                    'part': part_no,
-                    'section': section.get('section_number'),
-                    'heading': section.get('section_name'),
-                    'content': section.get('content'),
-                    'word_count': section.get('word_count'),
-                })
+        rows.extend(_enrich_rows(doc['data']))
     ctx.enriched_sections = rows
     logger.info("Enrich step: %d section rows", len(rows))
 
@@ -272,10 +562,15 @@ def normalize(ctx: PipelineContext) -> None:
     if not title_files:
         logger.warning("normalize step: no title JSON files found")
         return
+    workers_env = os.getenv('ECFR_NORMALIZE_WORKERS')
+    try:
+        workers = int(workers_env) if workers_env else os.cpu_count()
+    except ValueError:
+        workers = os.cpu_count()
     total_sections = 0
     for tf in title_files:
         try:
-            total_sections += norm.normalize_title_file(tf, output_dir=out_dir, cache=cache)
+            total_sections += norm.normalize_title_file(tf, output_dir=out_dir, cache=cache, workers=workers)
         except Exception as e:  # pragma: no cover
             logger.error("Normalization failed for %s: %s", tf.name, e)
     norm.save_cache(out_dir, cache)
@@ -284,7 +579,8 @@ def normalize(ctx: PipelineContext) -> None:
 @pipeline_step()
 def ftsindex(ctx: PipelineContext) -> None:
     """Build (or update) a SQLite FTS5 index from enriched sections.
-    Produces ecfr_index.sqlite in output_dir; table: sections(title, part, section, heading, content, word_count).
+    Produces ecfr_index.sqlite in output_dir; table: sections(title, part, section, heading, content, word_count),
+    plus a headings lookup table for /suggest.
     Requires enrich.
     """
     if not ctx.enriched_sections:
@@ -296,14 +592,21 @@ def ftsindex(ctx: PipelineContext) -> None:
     try:
         c = conn.cursor()
         c.execute("PRAGMA journal_mode=WAL;")
-        c.execute("CREATE VIRTUAL TABLE IF NOT EXISTS sections USING fts5(title, part, section, heading, content, word_count UNINDEXED)")
-        c.execute("DELETE FROM sections")
-        c.executemany(
-            "INSERT INTO sections (title, part, section, heading, content, word_count) VALUES (?,?,?,?,?,?)",
-            [(
-                r['title'], r['part'], r['section'], r.get('heading'), r.get('content'), r.get('word_count')
-            ) for r in ctx.enriched_sections]
-        )
+        # the index is rebuilt from scratch each run; trade fsync-per-commit
+        # durability for load speed
+        c.execute("PRAGMA synchronous=NORMAL")
+        c.execute("PRAGMA temp_store=MEMORY")
+        c.execute("PRAGMA cache_size=-200000")
+        # drop + recreate rather than DELETE: a full delete leaves FTS5
+        # tombstones that the reload then has to merge through
+        c.execute("DROP TABLE IF EXISTS sections")
+        c.execute("CREATE VIRTUAL TABLE sections USING fts5(title, part, section, heading, content, word_count UNINDEXED)")
+        # EnrichedSection is a tuple in column order, so rows bind as-is
+        c.executemany(FTS_INSERT_SQL, ctx.enriched_sections)
+        # merge the b-tree segments written during the bulk load into one
+        c.execute("INSERT INTO sections(sections) VALUES('optimize')")
+        from .api import build_heading_index
+        build_heading_index(conn)
         conn.commit()
         logger.info("ftsindex step: indexed %d rows", len(ctx.enriched_sections))
     finally:
@@ -318,14 +621,15 @@ def embed(ctx: PipelineContext) -> None:  # pragma: no cover - optional heavy de
       * Environment overrides:
           ECFR_EMBED_MODEL  -> model name (default all-MiniLM-L6-v2)
           ECFR_EMBED_LIMIT  -> int limit of sections (for quick smoke runs)
-          ECFR_EMBED_BATCH  -> batch size (default 32)
-      * Chunked DB inserts + commit every 500 for lower memory pressure.
+          ECFR_EMBED_BATCH  -> batch size (default 32; 128 on GPU)
+      * Vectors stored as float32 blobs, one executemany per encoded batch,
+        committed once at the end.
       * Graceful KeyboardInterrupt (partial progress kept).
     """
     import os
     try:
-        from sentence_transformers import SentenceTransformer
-        import struct
+        from sentence_transformers import SentenceTransformer  # noqa: F401
+        import numpy as np  # sentence-transformers depends on numpy
     except Exception as e:  # pragma: no cover
         logger.warning("embed step: sentence-transformers not available (%s)", e)
         return
@@ -336,12 +640,9 @@ def embed(ctx: PipelineContext) -> None:  # pragma: no cover - optional heavy de
         logger.warning("embed step: requires ftsindex to create DB path")
         return
 
-    global _EMBED_MODEL
     model_name = os.getenv('ECFR_EMBED_MODEL', 'all-MiniLM-L6-v2')
-    if _EMBED_MODEL is None:
-        logger.info("embed step: loading model %s", model_name)
-        _EMBED_MODEL = SentenceTransformer(model_name)
-    model = _EMBED_MODEL
+    model = _load_embed_model("embed", model_name)
+    default_batch = 128 if _embed_on_gpu(model) else 32
 
     limit_env = os.getenv('ECFR_EMBED_LIMIT')
     try:
@@ -350,11 +651,11 @@ def embed(ctx: PipelineContext) -> None:  # pragma: no cover - optional heavy de
         limit = None
     batch_env = os.getenv('ECFR_EMBED_BATCH')
     try:
-        batch_size = int(batch_env) if batch_env else 32
+        batch_size = int(batch_env) if batch_env else default_batch
     except ValueError:
-        batch_size = 32
+        batch_size = default_batch
 
-    texts = [r.get('content') or '' for r in ctx.enriched_sections]
+    texts = [r.content or '' for r in ctx.enriched_sections]
     if limit:
         texts = texts[:limit]
         logger.info("embed step: limiting to first %d sections via ECFR_EMBED_LIMIT", limit)
@@ -363,6 +664,8 @@ def embed(ctx: PipelineContext) -> None:  # pragma: no cover - optional heavy de
     inserted = 0
     try:
         c = conn.cursor()
+        # derived data; trade fsync-per-commit durability for write speed
+        c.execute("PRAGMA synchronous=NORMAL")
         c.execute("CREATE TABLE IF NOT EXISTS embeddings(section_rowid INTEGER PRIMARY KEY, vector BLOB)")
         c.execute("DELETE FROM embeddings")
 
@@ -377,16 +680,19 @@ def embed(ctx: PipelineContext) -> None:  # pragma: no cover - optional heavy de
             except KeyboardInterrupt:  # pragma: no cover
                 logger.warning("embed step interrupted at section %d; partial embeddings saved", start_idx)
                 break
-            import struct
-            for offset, vec in enumerate(vectors):
-                rowid = start_idx + offset + 1
-                blob = struct.pack(f'{len(vec)}f', *vec)
-                c.execute("INSERT OR REPLACE INTO embeddings(section_rowid, vector) VALUES (?, ?)", (rowid, blob))
-                inserted += 1
-            if inserted % 500 == 0:
-                conn.commit()
+            arr = np.ascontiguousarray(vectors, dtype=np.float32)
+            c.executemany(EMBED_INSERT_SQL,
+                          ((start_idx + i + 1, arr[i].tobytes()) for i in range(len(arr))))
+            inserted += len(arr)
         conn.commit()
         logger.info("embed step: stored %d embeddings (model=%s)", inserted, model_name)
+        from .api import build_embedding_index, embedding_index_path
+        index_path = embedding_index_path(ctx.db_path)
+        indexed = build_embedding_index(conn, index_path)
+        if indexed:
+            logger.info("embed step: built HNSW index over %d vectors at %s", indexed, index_path)
+        elif index_path.exists():
+            index_path.unlink()  # stale index from an earlier run; search falls back to exact scoring
     finally:
         conn.close()
 
@@ -399,8 +705,8 @@ def embedparas(ctx: PipelineContext) -> None:  # pragma: no cover - optional hea
     """
     import os
     try:
-        from sentence_transformers import SentenceTransformer
-        import struct
+        from sentence_transformers import SentenceTransformer  # noqa: F401
+        import numpy as np  # sentence-transformers depends on numpy
     except Exception as e:
         logger.warning("embedparas step: sentence-transformers not available (%s)", e)
         return
@@ -408,12 +714,8 @@ def embedparas(ctx: PipelineContext) -> None:  # pragma: no cover - optional hea
         logger.error("embedparas step: database not found; run ftsindex first")
         return
 
-    global _EMBED_MODEL
     model_name = os.getenv('ECFR_EMBED_MODEL', 'all-MiniLM-L6-v2')
-    if _EMBED_MODEL is None:
-        logger.info("embedparas step: loading model %s", model_name)
-        _EMBED_MODEL = SentenceTransformer(model_name)
-    model = _EMBED_MODEL
+    model = _load_embed_model("embedparas", model_name)
 
     para_limit_env = os.getenv('ECFR_EMBEDPARA_LIMIT')
     try:
@@ -435,12 +737,22 @@ def embedparas(ctx: PipelineContext) -> None:  # pragma: no cover - optional hea
         rows = c.fetchall()
         texts = []
         meta = []
+        # title -> sorted section file names, listed once instead of a glob per row
+        listings: Dict[Any, List[str]] = {}
         for rowid, title, part, section in rows:
-            candidates = list((section_dir_root / f"title{title}").glob(f"{(section or '').replace('.', '_')}*.json"))
-            if not candidates:
+            names = listings.get(title)
+            if names is None:
+                title_dir = section_dir_root / f"title{title}"
+                names = sorted(e.name for e in os.scandir(title_dir) if e.name.endswith('.json')) if title_dir.is_dir() else []
+                listings[title] = names
+            # first name with the section's prefix (what the old "<prefix>*.json" glob
+            # matched); '.' sorts before digits, so an exact "<prefix>.json" wins
+            prefix = (section or '').replace('.', '_')
+            i = bisect.bisect_left(names, prefix)
+            if i == len(names) or not names[i].startswith(prefix):
                 continue
             try:
-                sec_data = json.loads(candidates[0].read_text(encoding='utf-8'))
+                sec_data = json_loads((section_dir_root / f"title{title}" / names[i]).read_bytes())
             except Exception:
                 continue
             paragraphs = sec_data.get('paragraphs', [])
@@ -458,15 +770,14 @@ def embedparas(ctx: PipelineContext) -> None:  # pragma: no cover - optional hea
             logger.warning("embedparas step: no paragraphs to embed")
             return
         try:
-            vectors = model.encode(texts, show_progress_bar=False, batch_size=64, normalize_embeddings=True)
+            vectors = model.encode(texts, show_progress_bar=False, batch_size=128 if _embed_on_gpu(model) else 64, normalize_embeddings=True)
         except KeyboardInterrupt:  # pragma: no cover
             logger.warning("embedparas step interrupted; partial paragraph embeddings saved")
             return
-        import struct
-        for (rowid, idx), vec in zip(meta, vectors):
-            blob = struct.pack(f'{len(vec)}f', *vec)
-            c.execute("INSERT OR REPLACE INTO paragraph_embeddings(section_rowid, para_index, vector) VALUES (?,?,?)", (rowid, idx, blob))
-            inserted += 1
+        arr = np.ascontiguousarray(vectors, dtype=np.float32)
+        c.executemany(EMBEDPARA_INSERT_SQL,
+                      ((rowid, idx, arr[i].tobytes()) for i, (rowid, idx) in enumerate(meta)))
+        inserted = len(meta)
         conn.commit()
         logger.info("embedparas step: stored %d paragraph embeddings (model=%s)", inserted, model_name)
     finally:
@@ -474,11 +785,11 @@ def embedparas(ctx: PipelineContext) -> None:  # pragma: no cover - optional hea
 
 @pipeline_step()
 def apiserve(ctx: PipelineContext) -> None:  # pragma: no cover - runtime server
-    """Launch a simple FastAPI server exposing /search endpoint over FTS index.
-    Requires prior ftsindex (and optional embed for future semantic search).
+    """Launch the FastAPI app from :func:`ecfr_scraper.api.create_app` over the FTS index.
+    Requires prior ftsindex (and optional embed for /embed-search).
     """
     try:
-        from fastapi import FastAPI, HTTPException
+        import fastapi  # noqa: F401
         import uvicorn
     except Exception as e:
         logger.error("apiserve step: fastapi/uvicorn missing (%s)", e)
@@ -486,118 +797,9 @@ def apiserve(ctx: PipelineContext) -> None:  # pragma: no cover - runtime server
     if not ctx.db_path or not os.path.exists(ctx.db_path):
         logger.error("apiserve step: database not found; run ftsindex first")
         return
-    app = FastAPI(title="eCFR Search API")
-
-    def _connect():
-        return sqlite3.connect(ctx.db_path)  # type: ignore[arg-type]
-
-    @app.get('/health')
-    def health():  # type: ignore
-        return {'status': 'ok'}
-
-    @app.get('/search')
-    def search(q: str, limit: int = 10):  # type: ignore
-        conn = _connect()
-        try:
-            cur = conn.cursor()
-            cur.execute("SELECT rowid, title, part, section, heading, snippet(sections, 4, '[', ']', '...', 10) FROM sections WHERE sections MATCH ? LIMIT ?", (q, limit))
-            rows = cur.fetchall()
-            return [
-                {
-                    'rowid': r[0], 'title': r[1], 'part': r[2], 'section': r[3], 'heading': r[4], 'snippet': r[5]
-                } for r in rows
-            ]
-        finally:
-            conn.close()
-
-    @app.get('/titles')
-    def list_titles():  # type: ignore
-        conn = _connect()
-        try:
-            cur = conn.cursor()
-            cur.execute("SELECT DISTINCT title FROM sections ORDER BY 1")
-            return [r[0] for r in cur.fetchall()]
-        finally:
-            conn.close()
-
-    @app.get('/section/{rowid}')
-    def get_section(rowid: int):  # type: ignore
-        conn = _connect()
-        try:
-            cur = conn.cursor()
-            cur.execute("SELECT rowid, title, part, section, heading, content, word_count FROM sections WHERE rowid=?", (rowid,))
-            row = cur.fetchone()
-            if not row:
-                raise HTTPException(404, detail="Not found")
-            return {
-                'rowid': row[0], 'title': row[1], 'part': row[2], 'section': row[3], 'heading': row[4], 'content': row[5], 'word_count': row[6]
-            }
-        finally:
-            conn.close()
-
-    @app.get('/suggest')
-    def suggest(prefix: str, limit: int = 10):  # type: ignore
-        conn = _connect()
-        try:
-            cur = conn.cursor()
-            like = f"{prefix}%"
-            cur.execute("SELECT DISTINCT heading FROM sections WHERE heading LIKE ? ORDER BY heading LIMIT ?", (like, limit))
-            return [r[0] for r in cur.fetchall() if r[0]]
-        finally:
-            conn.close()
-
-    @app.get('/embed-search')
-    def embed_search(q: str, limit: int = 5):  # type: ignore
-        # Optional semantic similarity if embeddings table present
-        try:
-            from sentence_transformers import SentenceTransformer  # type: ignore
-            import struct, math
-        except Exception:
-            raise HTTPException(400, detail="Embeddings not enabled (install .[embed])")
-        conn = _connect()
-        try:
-            cur = conn.cursor()
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='embeddings'")
-            if not cur.fetchone():
-                raise HTTPException(400, detail="Embeddings table missing; run embed step")
-            # Load vectors
-            cur.execute("SELECT section_rowid, vector FROM embeddings")
-            rows = cur.fetchall()
-            if not rows:
-                raise HTTPException(400, detail="No embeddings present")
-            # Determine vector length from first row
-            first = rows[0][1]
-            length = int(len(first)/4)
-            unpack_fmt = f'{length}f'
-            import struct
-            stored = [(rid, struct.unpack(unpack_fmt, blob)) for rid, blob in rows]
-            model = SentenceTransformer('all-MiniLM-L6-v2')
-            qv = model.encode([q], normalize_embeddings=True)[0]
-            # Cosine similarity (vectors are normalized)
-            scores = []
-            for rid, vec in stored:
-                sim = sum(a*b for a,b in zip(qv, vec))
-                scores.append((sim, rid))
-            scores.sort(reverse=True)
-            out = []
-            for sim, rid in scores[:limit]:
-                cur.execute("SELECT rowid, title, part, section, heading FROM sections WHERE rowid=?", (rid,))
-                srow = cur.fetchone()
-                if srow:
-                    out.append({'score': sim, 'rowid': srow[0], 'title': srow[1], 'part': srow[2], 'section': srow[3], 'heading': srow[4]})
-            return out
-        finally:
-            conn.close()
-
-    # Mount analyzer router if analyzer DB present
-    try:  # pragma: no cover - optional
-        from .analyzer.api import router as analyzer_router
-        a_db = Path(ctx.scraper.output_dir) / 'analyzer.sqlite'
-        if a_db.exists():
-            os.environ.setdefault('ECFR_ANALYZER_DB', str(a_db))
-            app.include_router(analyzer_router)
-    except Exception:
-        pass
+    from .api import create_app
+    a_db = Path(ctx.scraper.output_dir) / 'analyzer.sqlite'
+    app = create_app(ctx.db_path, analyzer_db=str(a_db) if a_db.exists() else None)
 
     logger.info("Starting API server at http://127.0.0.1:8000 ... (Ctrl+C to stop)")
     uvicorn.run(app, host='127.0.0.1', port=8000, log_level='info')
@@ -626,7 +828,7 @@ def analyze_ingest(ctx: PipelineContext) -> None:
 
 @pipeline_step()
 def analyze_metrics(ctx: PipelineContext) -> None:
-    """Compute extended metrics for ingested sections and parts."""
+    """Compute primitive and extended metrics for ingested sections and parts."""
     if analyzer_metrics is None:
         logger.error("analyze_metrics: analyzer modules not available")
         return
@@ -639,7 +841,18 @@ def analyze_metrics(ctx: PipelineContext) -> None:
         return
     conn = sqlite3.connect(ctx.analyzer_db)
     try:
-        analyzer_metrics.compute_section_metrics(conn)
+        analyzer_schema.ensure_schema(conn)  # DBs from older ingests may lack newer tables
+        # metrics are derived data; trade fsync-per-commit durability for write speed
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-200000")
+        workers_env = os.getenv('ECFR_ANALYZER_WORKERS')
+        try:
+            workers = int(workers_env) if workers_env else os.cpu_count()
+        except ValueError:
+            workers = os.cpu_count()
+        analyzer_primitive_metrics.compute_metrics(conn)
+        analyzer_metrics.compute_section_metrics(conn, workers=workers)
         analyzer_metrics.compute_part_metrics(conn)
         logger.info("analyze_metrics: extended metrics computed")
     finally:
@@ -1,9 +1,3 @@
-import os
-import re
-import json
-import logging
-from collections import Counter
-from concurrent.futures import ThreadPoolExecutor, as_completed
 """Core scraper logic: download ECFR titles, parse XML, export JSON & metadata.
 
 This module provides ECFRScraper with:
@@ -16,10 +10,9 @@ This module provides ECFRScraper with:
 
 import os
 import re
-import json
 import logging
 from collections import Counter
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from typing import Optional, List
 
 import requests
@@ -28,11 +21,137 @@ from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
 from tqdm import tqdm
 
+try:  # optional C-backed parser; stdlib ElementTree is the fallback
+    from lxml import etree as _lxml_etree  # type: ignore
+except ImportError:  # pragma: no cover
+    _lxml_etree = None
+
+try:  # optional; vectorized word counting for very large ASCII sections
+    import numpy as _np  # type: ignore
+except ImportError:  # pragma: no cover
+    _np = None
+
+try:  # optional; RE2's linear-time DFA tokenizes whole titles faster than re
+    import re2 as _re2  # type: ignore
+except ImportError:  # pragma: no cover
+    _re2 = None
+
 from .metadata import MetadataExtractor
-from .utils import calculate_checksum, load_checksum_db, save_checksum_db
+from .utils import (
+    calculate_checksum,
+    checksum_key,
+    file_signature,
+    json_dumps,
+    json_loads,
+    load_checksum_db,
+    new_hasher,
+    save_checksum_db,
+    stat_key,
+    validator_keys,
+)
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+_WORD_RE = re.compile(r"\b\w+\b")
+# One match per non-blank run between [.!?]+ delimiters, i.e. per sentence.
+_SENTENCE_RE = re.compile(r"[^.!?\s][^.!?]*")
+_PART_NUM_RE = re.compile(r"PART\s+([0-9A-Za-z]+)")
+_SECTION_NUM_RE = re.compile(r"§\s*([0-9][0-9A-Za-z.\-]*)")
+# RE2's \w and \b are ASCII-only, so it is used only for pure-ASCII text,
+# where both engines produce identical matches.
+_WORD_RE_ASCII = _re2.compile(r"\b\w+\b") if _re2 is not None else _WORD_RE
+# parse_xml tokenizes title text in slices of roughly this many characters
+# instead of joining the whole document first.
+LEXICAL_SLICE_CHARS = 1 << 20
+# Greedy prefix: matches up to the last sentence delimiter followed by
+# whitespace. No word, sentence or final-sigma lowercasing spans that point.
+_LAST_CUT_RE = re.compile(r"(?s:.*)[.!?](?=\s)")
+# Below this many characters the regex count is as fast as a numpy round trip.
+VECTOR_WORD_COUNT_MIN_CHARS = 64 * 1024
+if _np is not None:
+    # ASCII \w == [0-9A-Za-z_]; other bytes never start or continue a word.
+    _IS_WORD_BYTE = _np.zeros(256, dtype=bool)
+    for _lo, _hi in (("0", "9"), ("A", "Z"), ("a", "z"), ("_", "_")):
+        _IS_WORD_BYTE[ord(_lo):ord(_hi) + 1] = True
+
+
+def _count_words(text: str) -> int:
+    """Number of ``\\b\\w+\\b`` matches in ``text``.
+
+    Large pure-ASCII texts are counted in one vectorized pass over the bytes
+    (word starts = non-word -> word transitions) when numpy is installed;
+    anything else uses the regex so Unicode word semantics are preserved.
+    """
+    if _np is None or len(text) < VECTOR_WORD_COUNT_MIN_CHARS or not text.isascii():
+        return sum(1 for _ in _WORD_RE.finditer(text))
+    is_word = _IS_WORD_BYTE[_np.frombuffer(text.encode("ascii"), dtype=_np.uint8)]
+    return int(is_word[0]) + int(_np.count_nonzero(is_word[1:] & ~is_word[:-1]))
+
+
+class _LexicalAccumulator:
+    """Title-wide word/sentence statistics over streamed text fragments.
+
+    Fragments are buffered and tokenized whenever the buffer reaches
+    ``slice_chars``, cut at the last safe point, so the result equals
+    ``_perform_lexical_analysis`` on the joined text without ever building it.
+    """
+
+    def __init__(self, slice_chars: int = LEXICAL_SLICE_CHARS) -> None:
+        self.counts: Counter = Counter()
+        self.sentence_count = 0
+        self._slice_chars = slice_chars
+        self._buf: List[str] = []
+        self._size = 0
+        self._next_flush = slice_chars
+
+    def feed(self, fragment: str) -> None:
+        self._buf.append(fragment)
+        self._size += len(fragment)
+        if self._size >= self._next_flush:
+            text = "".join(self._buf)
+            m = _LAST_CUT_RE.match(text)
+            if m is None:  # no safe cut yet; keep buffering
+                self._buf = [text]
+                self._next_flush = self._size + self._slice_chars
+                return
+            self._consume(text[:m.end()])
+            rest = text[m.end():]
+            self._buf = [rest] if rest else []
+            self._size = len(rest)
+            self._next_flush = self._slice_chars
+
+    def _consume(self, text: str) -> None:
+        lowered = text.lower()
+        word_re = _WORD_RE_ASCII if lowered.isascii() else _WORD_RE
+        self.counts.update(word_re.findall(lowered))
+        self.sentence_count += sum(1 for _ in _SENTENCE_RE.finditer(text))
+
+    def result(self) -> dict:
+        if self._buf:
+            self._consume("".join(self._buf))
+            self._buf, self._size = [], 0
+        counts, sentence_count = self.counts, self.sentence_count
+        word_count = sum(counts.values())
+        return {
+            "total_words": word_count,
+            "unique_words": len(counts),
+            "avg_word_length": sum(len(w) * n for w, n in counts.items()) / word_count if word_count else 0,
+            "top_words": counts.most_common(20),
+            "sentence_count": sentence_count,
+            "avg_sentence_length": word_count / sentence_count if sentence_count else 0,
+        }
+
+
+# All titles come from one host; throughput plateaus around 20-30 in-flight requests.
+DEFAULT_DOWNLOAD_WORKERS = 30
+# Persist download bookkeeping every N completed titles so a crash mid-run
+# does not force re-hashing everything already fetched.
+CHECKSUM_FLUSH_EVERY = 10
+# Title-wide lexical stats keyed by file name and XML checksum (in output_dir),
+# so re-parsing an unchanged title skips tokenization.
+LEXICAL_CACHE_FILE = "lexical_cache.json"
+
 
 class ECFRScraper:
     """Download, parse, and export ECFR titles with retry + checksum support."""
@@ -41,18 +160,25 @@ class ECFRScraper:
         self,
         base_url: str = "https://www.govinfo.gov/bulkdata/ECFR",
         output_dir: str = "./data",
+        max_workers: int = DEFAULT_DOWNLOAD_WORKERS,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.output_dir = output_dir
+        self.max_workers = max_workers
         self.session: Optional[requests.Session] = None
         self.checksum_db = load_checksum_db()
         self.metadata_extractor = MetadataExtractor()
+        # path -> (mtime_ns, size) of the file whose sidecar metadata was last written
+        self._metadata_sigs: dict = {}
+        # file name -> {"checksum": ..., "stats": ...}; loaded on first parse
+        self._lexical_cache: Optional[dict] = None
+        self._lexical_dirty = False
         os.makedirs(self.output_dir, exist_ok=True)
 
     # ------------------------------------------------------------------
     # Networking / Download
     # ------------------------------------------------------------------
-    def _configure_session(self) -> None:
+    def _configure_session(self, pool_size: Optional[int] = None) -> None:
         if self.session is not None:
             return
         session = requests.Session()
@@ -62,11 +188,84 @@ class ECFRScraper:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET"],
         )
-        adapter = HTTPAdapter(max_retries=retry)
+        # Size the per-host pool to the worker count; the default of 10 makes
+        # extra workers discard and re-handshake connections.
+        pool_size = max(10, pool_size or self.max_workers)
+        adapter = HTTPAdapter(
+            max_retries=retry,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+        )
         session.mount("https://", adapter)
         session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"})
         self.session = session
 
+    def ensure_session(self, pool_size: Optional[int] = None) -> None:
+        """Create the shared HTTP session (once) before fanning out downloads.
+
+        ``pool_size`` is the number of threads that will share it; the
+        connection pool is sized to at least that.
+        """
+        self._configure_session(pool_size)
+
+    def _stream_to_file(self, url: str, path: str, name: Optional[str] = None, conditional: bool = False) -> Optional[str]:
+        """Stream ``url`` to ``path`` and return the checksum of the bytes written.
+
+        The digest is updated chunk-by-chunk as the body arrives so the file
+        never has to be re-read from disk to record its checksum. When
+        ``name`` is given the response's ETag / Last-Modified are recorded
+        in the checksum DB; with ``conditional`` they are sent back, and a
+        304 Not Modified returns None without touching ``path``.
+        """
+        self._configure_session()
+        headers = {}
+        if name and conditional:
+            etag_k, lm_k = validator_keys(name)
+            if self.checksum_db.get(etag_k):
+                headers["If-None-Match"] = self.checksum_db[etag_k]
+            if self.checksum_db.get(lm_k):
+                headers["If-Modified-Since"] = self.checksum_db[lm_k]
+        h = new_hasher()
+        with self.session.get(url, timeout=60, stream=True, headers=headers) as resp:  # type: ignore[union-attr]
+            if headers and resp.status_code == 304:
+                return None
+            resp.raise_for_status()
+            with open(path, "wb") as f:
+                for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    h.update(chunk)
+            if name:
+                etag_k, lm_k = validator_keys(name)
+                # "" rather than a missing key so the journal records a dropped validator
+                self.checksum_db[etag_k] = resp.headers.get("ETag") or ""
+                self.checksum_db[lm_k] = resp.headers.get("Last-Modified") or ""
+        return h.hexdigest()
+
+    def _local_copy_intact(self, path: str, name: str) -> bool:
+        """True when ``path`` still holds the bytes last recorded for ``name``.
+
+        A file whose size and mtime match the signature stored with its
+        checksum is trusted without being read; otherwise it is re-hashed.
+        """
+        recorded = self.checksum_db.get(checksum_key(name))
+        if not recorded:
+            return False
+        sig = file_signature(path)
+        if self.checksum_db.get(stat_key(name)) == sig:
+            return True
+        if calculate_checksum(file_path=path) != recorded:
+            return False
+        self.checksum_db[stat_key(name)] = sig
+        return True
+
+    def _record_download(self, path: str, name: str, digest: str) -> None:
+        self.checksum_db[checksum_key(name)] = digest
+        self.checksum_db[stat_key(name)] = file_signature(path)
+
+    def _has_validators(self, name: str) -> bool:
+        return any(self.checksum_db.get(k) for k in validator_keys(name))
+
     def get_available_titles(self) -> List[int]:
         return list(range(1, 51))
 
@@ -78,38 +277,44 @@ class ECFRScraper:
         path = os.path.join(output_dir, filename)
         url = f"{self.base_url}/title-{title_number}/ECFR-title{title_number}.xml"
 
+        # An intact local copy is revalidated with a conditional GET when the
+        # server gave us validators last time; otherwise it is trusted as-is.
+        conditional = False
         if os.path.exists(path):
-            existing = calculate_checksum(file_path=path)
-            if existing == self.checksum_db.get(filename):
-                logger.info("Title %s unchanged. Skipping download.", title_number)
-                return path
+            if self._local_copy_intact(path, filename):
+                if not self._has_validators(filename):
+                    logger.info("Title %s unchanged. Skipping download.", title_number)
+                    return path
+                conditional = True
 
         try:
-            self._configure_session()
             logger.info("Downloading title %s", title_number)
-            resp = self.session.get(url, timeout=60)  # type: ignore[arg-type]
-            resp.raise_for_status()
-            with open(path, "wb") as f:
-                f.write(resp.content)
-            self.checksum_db[filename] = calculate_checksum(file_path=path)
-            metadata = self.metadata_extractor.extract(path)
-            with open(f"{path}.metadata.json", "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2)
+            digest = self._stream_to_file(url, path, filename, conditional=conditional)
+            if digest is None:
+                logger.info("Title %s not modified on server. Skipping download.", title_number)
+                return path
+            self._record_download(path, filename, digest)
+            self._write_metadata(path)
             return path
         except requests.RequestException as e:  # pragma: no cover - network
             logger.warning("Failed to download title %s: %s", title_number, e)
             return None
 
-    def download_all_titles(self, output_dir: Optional[str] = None, max_workers: int = 5) -> List[str]:
+    def download_all_titles(self, output_dir: Optional[str] = None, max_workers: Optional[int] = None) -> List[str]:
         if output_dir is None:
             output_dir = self.output_dir
+        if max_workers is None:
+            max_workers = self.max_workers
         titles = self.get_available_titles()
+        # Build the session up front so every worker shares one keep-alive pool
+        # instead of racing to create their own in _configure_session.
+        self._configure_session(max_workers)
         results: List[str] = []
         failures: List[int] = []
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_map = {executor.submit(self.download_title_xml, t, output_dir): t for t in titles}
             with tqdm(total=len(future_map), desc="Downloading Titles") as bar:
-                for fut in as_completed(future_map):
+                for done, fut in enumerate(as_completed(future_map), 1):
                     t = future_map[fut]
                     try:
                         path = fut.result()
@@ -121,6 +326,9 @@ class ECFRScraper:
                         logger.error("Unexpected error downloading title %s: %s", t, e)
                         failures.append(t)
                     bar.update(1)
+                    if done % CHECKSUM_FLUSH_EVERY == 0:
+                        # snapshot: workers may still be adding entries; the journal only appends changes
+                        save_checksum_db(dict(self.checksum_db))
         save_checksum_db(self.checksum_db)
         if failures:
             logger.warning("Failed titles: %s", failures)
@@ -130,106 +338,221 @@ class ECFRScraper:
     def get_resource_file(self, resource_name: str) -> Optional[str]:
         resource_url = f"{self.base_url}/{resource_name}"
         path = os.path.join(self.output_dir, resource_name)
+        conditional = False
         if os.path.exists(path):
-            if calculate_checksum(file_path=path) == self.checksum_db.get(resource_name):
-                logger.info("Resource %s unchanged. Skipping.", resource_name)
-                return path
+            if self._local_copy_intact(path, resource_name):
+                if not self._has_validators(resource_name):
+                    logger.info("Resource %s unchanged. Skipping.", resource_name)
+                    return path
+                conditional = True
         try:
-            self._configure_session()
-            resp = self.session.get(resource_url, timeout=60)  # type: ignore[arg-type]
-            resp.raise_for_status()
-            with open(path, "wb") as f:
-                f.write(resp.content)
-            self.checksum_db[resource_name] = calculate_checksum(file_path=path)
-            metadata = self.metadata_extractor.extract(path)
-            with open(f"{path}.metadata.json", "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2)
+            digest = self._stream_to_file(resource_url, path, resource_name, conditional=conditional)
+            if digest is None:
+                logger.info("Resource %s not modified on server. Skipping.", resource_name)
+                return path
+            self._record_download(path, resource_name, digest)
+            self._write_metadata(path)
             return path
         except requests.RequestException as e:  # pragma: no cover
             logger.error("Failed resource download %s: %s", resource_name, e)
             return None
 
+    def _write_metadata(self, path: str) -> str:
+        """Write ``<path>.metadata.json``, skipping extraction if this instance
+        already wrote it for the file as it is now (e.g. download then process)
+        or, across runs, if the sidecar is newer than the file."""
+        meta_path = f"{path}.metadata.json"
+        st = os.stat(path)
+        sig = (st.st_mtime_ns, st.st_size)
+        if self._metadata_sigs.get(path) == sig and os.path.exists(meta_path):
+            return meta_path
+        try:
+            if os.stat(meta_path).st_mtime_ns >= st.st_mtime_ns:
+                self._metadata_sigs[path] = sig
+                return meta_path
+        except FileNotFoundError:
+            pass
+        metadata = self.metadata_extractor.extract(path)
+        with open(meta_path, "wb") as f:
+            f.write(json_dumps(metadata))
+        self._metadata_sigs[path] = sig
+        return meta_path
+
     # ------------------------------------------------------------------
     # Parsing / Export
     # ------------------------------------------------------------------
-    def parse_xml(self, xml_path: str):
+    def parse_xml(self, xml_path: str) -> Optional[dict]:
+        """Parse a title XML into parts/sections plus title-wide lexical stats.
+
+        The document is streamed with iterparse (lxml when installed, else the
+        stdlib parser). Elements are cleared once processed unless they sit
+        inside an open section, whose subtree is still needed for its text.
+        """
         try:
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
+            if _lxml_etree is not None:
+                events = _lxml_etree.iterparse(
+                    xml_path, events=("start", "end", "comment", "pi"), huge_tree=True
+                )
+            else:
+                events = ET.iterparse(xml_path, events=("start", "end"))
             title_info = {
-                "title_number": self._safe_get_text(root, ".//TITL"),
-                "title_name": self._safe_get_text(root, ".//HEAD"),
+                "title_number": None,
+                "title_name": None,
                 "parts": [],
                 "stats": {"total_sections": 0, "word_count": 0, "paragraph_count": 0},
             }
-            # Parts are DIV5 TYPE="PART"; earlier code incorrectly iterated DIV6 (subparts)
-            for part in root.findall(".//DIV5[@TYPE='PART']"):
-                raw_part_num = part.get("N")  # attribute holds the numeric part identifier
-                part_head_text = self._safe_get_text(part, "./HEAD") or ""
-                # Fallback: extract part number from heading like "PART 10—..."
-                if not raw_part_num and part_head_text:
-                    m_part = re.search(r"PART\s+([0-9A-Za-z]+)", part_head_text)
-                    raw_part_num = m_part.group(1) if m_part else None
-                pinfo = {
-                    "part_number": raw_part_num,
-                    "part_name": part_head_text.strip() if part_head_text else None,
-                    "sections": [],
-                }
-                # Sections under a part may be nested within SUBPART (DIV6) containers. We collect DIV8 TYPE="SECTION" beneath this part only.
-                for section in part.findall(".//DIV8[@TYPE='SECTION']"):
-                    section_text = ET.tostring(section, encoding="unicode", method="text").strip()
-                    raw_sec_num = section.get("N")  # attribute like "§ 10.1"
-                    if raw_sec_num:
-                        # Normalize to bare number without leading symbol § and surrounding spaces
-                        m_num = re.search(r"§\s*([0-9][0-9A-Za-z.\-]*)", raw_sec_num)
-                        norm_sec_num = m_num.group(1) if m_num else raw_sec_num.strip()
-                    else:
-                        # Fallback parse from HEAD if attribute missing
-                        head_txt = self._safe_get_text(section, "./HEAD") or ""
-                        m_head = re.match(r"§\s*([0-9][0-9A-Za-z.\-]*)", head_txt)
-                        norm_sec_num = m_head.group(1) if m_head else None
-                    sinfo = {
-                        "section_number": norm_sec_num,
-                        "section_name": self._safe_get_text(section, "./HEAD"),
-                        "content": section_text,
-                        "word_count": len(re.findall(r"\b\w+\b", section_text)),
-                        "paragraph_count": len(section.findall(".//P")),
-                    }
-                    pinfo["sections"].append(sinfo)
-                    title_info["stats"]["total_sections"] += 1
-                    title_info["stats"]["word_count"] += sinfo["word_count"]
-                    title_info["stats"]["paragraph_count"] += sinfo["paragraph_count"]
-                title_info["parts"].append(pinfo)
-            all_text = "".join(root.itertext())
-            title_info["lexical_analysis"] = self._perform_lexical_analysis(all_text)
+            seen_titl = seen_head = False
+            stack = []  # open elements, innermost last
+            part = None  # (element, pinfo, first direct HEAD text) for the open PART
+            open_sections = []  # (element, sinfo) for open DIV8 sections in the part
+            name = os.path.basename(xml_path)
+            checksum = self._current_checksum(xml_path, name)
+            cached = self._lexical_entry(name, checksum)
+            # fed document text in itertext() order unless the stats are cached
+            lexical = _LexicalAccumulator() if cached is None else None
+            word_counts = {}  # section text -> word count; boilerplate sections repeat
+            # An element's text (after start) or tail (after end) is only final
+            # once the parser emits the next event; collect it one step later.
+            pending = None
+            for event, elem in events:
+                if pending is not None:
+                    el, attr = pending
+                    txt = getattr(el, attr)
+                    if txt and lexical is not None:
+                        lexical.feed(txt)
+                    if attr == "tail" and not open_sections:
+                        el.clear()
+                    pending = None
+                if event in ("comment", "pi"):
+                    pending = (elem, "tail")
+                elif event == "start":
+                    stack.append(elem)
+                    pending = (elem, "text")
+                    # Parts are DIV5 TYPE="PART"; earlier code incorrectly iterated DIV6 (subparts)
+                    if elem.tag == "DIV5" and elem.get("TYPE") == "PART" and part is None:
+                        pinfo = {"part_number": None, "part_name": None, "sections": []}
+                        title_info["parts"].append(pinfo)
+                        part = [elem, pinfo, None]
+                    # Sections under a part may be nested within SUBPART (DIV6) containers.
+                    elif elem.tag == "DIV8" and elem.get("TYPE") == "SECTION" and part is not None:
+                        sinfo = {}
+                        part[1]["sections"].append(sinfo)  # reserve document-order slot
+                        open_sections.append((elem, sinfo))
+                else:
+                    stack.pop()
+                    pending = (elem, "tail") if stack else None
+                    tag = elem.tag
+                    if tag == "TITL" and not seen_titl:
+                        title_info["title_number"], seen_titl = elem.text, True
+                    elif tag == "HEAD":
+                        if not seen_head:
+                            title_info["title_name"], seen_head = elem.text, True
+                        if part is not None and part[2] is None and stack and stack[-1] is part[0]:
+                            part[2] = elem.text or ""
+                    if open_sections and elem is open_sections[-1][0]:
+                        _, sinfo = open_sections.pop()
+                        sinfo.update(self._section_info(elem, word_counts))
+                        title_info["stats"]["total_sections"] += 1
+                        title_info["stats"]["word_count"] += sinfo["word_count"]
+                        title_info["stats"]["paragraph_count"] += sinfo["paragraph_count"]
+                    elif part is not None and elem is part[0]:
+                        _, pinfo, part_head_text = part
+                        part_head_text = part_head_text or ""
+                        raw_part_num = elem.get("N")  # attribute holds the numeric part identifier
+                        # Fallback: extract part number from heading like "PART 10—..."
+                        if not raw_part_num and part_head_text:
+                            m_part = _PART_NUM_RE.search(part_head_text)
+                            raw_part_num = m_part.group(1) if m_part else None
+                        pinfo["part_number"] = raw_part_num
+                        pinfo["part_name"] = part_head_text.strip() if part_head_text else None
+                        part = None
+            if lexical is not None:
+                cached = lexical.result()
+                self._lexical_cache[name] = {"checksum": checksum, "stats": cached}
+                self._lexical_dirty = True
+            title_info["lexical_analysis"] = cached
             return title_info
         except Exception as e:  # pragma: no cover
             logger.error("Error parsing %s: %s", xml_path, e)
             return None
 
+    def _current_checksum(self, path: str, name: str) -> str:
+        recorded = self.checksum_db.get(checksum_key(name))
+        if recorded and self.checksum_db.get(stat_key(name)) == file_signature(path):
+            return recorded
+        return calculate_checksum(file_path=path)
+
+    def _lexical_cache_map(self) -> dict:
+        if self._lexical_cache is None:
+            self._lexical_cache = {}
+            cache_path = os.path.join(self.output_dir, LEXICAL_CACHE_FILE)
+            try:
+                with open(cache_path, "rb") as f:
+                    self._lexical_cache = json_loads(f.read())
+            except FileNotFoundError:
+                pass
+            except ValueError:
+                logger.warning("Invalid lexical cache %s. Ignoring.", cache_path)
+        return self._lexical_cache
+
+    def _lexical_entry(self, name: str, checksum: str) -> Optional[dict]:
+        """Cached lexical stats for ``name`` if they were computed from ``checksum``."""
+        entry = self._lexical_cache_map().get(name)
+        if entry and entry.get("checksum") == checksum:
+            return entry["stats"]
+        return None
+
+    def save_lexical_cache(self) -> None:
+        """Persist lexical stats computed since the last save (no-op if none)."""
+        if not self._lexical_dirty:
+            return
+        cache_path = os.path.join(self.output_dir, LEXICAL_CACHE_FILE)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json_dumps(self._lexical_cache, indent=False))
+        os.replace(tmp_path, cache_path)
+        self._lexical_dirty = False
+
+    def _section_info(self, section, word_counts: Optional[dict] = None) -> dict:
+        section_text = "".join(section.itertext()).strip()
+        if word_counts is None:
+            word_count = _count_words(section_text)
+        else:
+            word_count = word_counts.get(section_text)
+            if word_count is None:
+                word_count = word_counts[section_text] = _count_words(section_text)
+        raw_sec_num = section.get("N")  # attribute like "§ 10.1"
+        if raw_sec_num:
+            # Normalize to bare number without leading symbol § and surrounding spaces
+            m_num = _SECTION_NUM_RE.search(raw_sec_num)
+            norm_sec_num = m_num.group(1) if m_num else raw_sec_num.strip()
+        else:
+            # Fallback parse from HEAD if attribute missing
+            head_txt = self._safe_get_text(section, "./HEAD") or ""
+            m_head = _SECTION_NUM_RE.match(head_txt)
+            norm_sec_num = m_head.group(1) if m_head else None
+        return {
+            "section_number": norm_sec_num,
+            "section_name": self._safe_get_text(section, "./HEAD"),
+            "content": section_text,
+            "word_count": word_count,
+            "paragraph_count": len(section.findall(".//P")),
+        }
+
     def _safe_get_text(self, element, xpath):
         found = element.find(xpath)
         return found.text if found is not None else None
 
-    def _perform_lexical_analysis(self, text: str):
-        words = re.findall(r"\b\w+\b", text.lower())
-        word_count = len(words)
-        sentences = re.split(r"[.!?]+", text)
-        sentence_count = len([s for s in sentences if s.strip()])
-        return {
-            "total_words": word_count,
-            "unique_words": len(set(words)),
-            "avg_word_length": sum(len(w) for w in words) / word_count if word_count else 0,
-            "top_words": Counter(words).most_common(20),
-            "sentence_count": sentence_count,
-            "avg_sentence_length": word_count / sentence_count if sentence_count else 0,
-        }
+    def _perform_lexical_analysis(self, text: str) -> dict:
+        acc = _LexicalAccumulator()
+        acc.feed(text)
+        return acc.result()
 
     def export_to_json(self, data, output_path: str) -> bool:
         try:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(output_path, "wb") as f:
+                f.write(json_dumps(data))
             logger.info("Exported %s", output_path)
             return True
         except Exception as e:  # pragma: no cover
@@ -239,21 +562,59 @@ class ECFRScraper:
     # ------------------------------------------------------------------
     # High-level processing
     # ------------------------------------------------------------------
-    def process_downloaded_files(self, files: List[str]):
+    def _process_one(self, path: str) -> dict:
+        try:
+            data = self.parse_xml(path)
+            if not data:
+                return {"file": path, "success": False, "error": "parse failed"}
+            json_path = path.replace(".xml", ".json")
+            self.export_to_json(data, json_path)
+            meta_path = self._write_metadata(path)
+            return {"file": path, "json": json_path, "metadata": meta_path, "success": True}
+        except Exception as e:  # pragma: no cover
+            logger.error("Processing error %s: %s", path, e)
+            return {"file": path, "success": False, "error": str(e)}
+
+    def process_downloaded_files(self, files: List[str], workers: Optional[int] = None):
+        """Parse, export and write metadata for each file; results keep ``files`` order.
+
+        Parsing is CPU bound, so with several files they are handled in a
+        process pool (``workers`` defaults to the CPU count; ``1`` disables it).
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(files))
+        if workers <= 1:
+            results = [self._process_one(path) for path in tqdm(files, desc="Processing Files")]
+            self.save_lexical_cache()
+            return results
         results = []
-        for path in tqdm(files, desc="Processing Files"):
-            try:
-                data = self.parse_xml(path)
-                if data:
-                    json_path = path.replace(".xml", ".json")
-                    self.export_to_json(data, json_path)
-                    metadata = self.metadata_extractor.extract(path)
-                    with open(f"{path}.metadata.json", "w", encoding="utf-8") as f:
-                        json.dump(metadata, f, indent=2)
-                    results.append({"file": path, "json": json_path, "metadata": f"{path}.metadata.json", "success": True})
-                else:
-                    results.append({"file": path, "success": False, "error": "parse failed"})
-            except Exception as e:  # pragma: no cover
-                logger.error("Processing error %s: %s", path, e)
-                results.append({"file": path, "success": False, "error": str(e)})
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_process_worker, initargs=(self,)) as pool:
+            for result, sig, lexical in tqdm(pool.map(_process_in_worker, files), total=len(files), desc="Processing Files"):
+                if sig is not None:
+                    self._metadata_sigs[result["file"]] = sig
+                if lexical is not None:
+                    self._lexical_cache_map()[os.path.basename(result["file"])] = lexical
+                    self._lexical_dirty = True
+                results.append(result)
+        self.save_lexical_cache()
         return results
+
+
+# Per-process scraper for process_downloaded_files, set once by the pool initializer.
+_worker_scraper: Optional[ECFRScraper] = None
+
+
+def _init_process_worker(scraper: ECFRScraper) -> None:
+    global _worker_scraper
+    _worker_scraper = scraper
+
+
+def _process_in_worker(path: str):
+    """Run ``_process_one`` in a pool process; also return the metadata
+    signature and any fresh lexical cache entry so the parent can keep them."""
+    scraper = _worker_scraper
+    scraper._lexical_dirty = False
+    result = scraper._process_one(path)
+    lexical = scraper._lexical_cache.get(os.path.basename(path)) if scraper._lexical_dirty else None
+    return result, scraper._metadata_sigs.get(path), lexical
@@ -2,11 +2,29 @@ import json
 import hashlib
 import logging
 from logging.handlers import RotatingFileHandler
+import mmap
 import os
-from typing import Optional, Dict, Union
+from typing import Any, Optional, Dict, Tuple, Union
+
+try:  # optional; several times faster than stdlib json for large documents
+    import orjson as _orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    _orjson = None
 
 CHECKSUM_DB_PATH = "checksums.json"
 LOG_FILE_PATH = "ecfr_scraper.log"
+# Checksum DB entries are change detectors, not integrity attestations, so the
+# default is BLAKE2b. Keys carry an algorithm prefix so entries written by an
+# older SHA-256 build are ignored rather than mis-compared.
+DEFAULT_CHECKSUM_ALGORITHM = "blake2b"
+CHECKSUM_KEY_PREFIX = "b2b:"
+# HTTP validators from the last fetch, stored alongside checksums so
+# downloads can be conditional (If-None-Match / If-Modified-Since).
+ETAG_KEY_PREFIX = "etag:"
+LAST_MODIFIED_KEY_PREFIX = "lm:"
+# (mtime_ns, size) of each file when its checksum was recorded, so an
+# untouched local copy can be trusted without re-hashing it.
+STAT_KEY_PREFIX = "stat:"
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -35,16 +53,65 @@ def setup_logging(verbose: bool = False) -> None:
     logger.addHandler(fh)
 
 
-def calculate_checksum(file_path: Optional[str] = None, data: Optional[Union[bytes, str]] = None, algorithm: str = "sha256") -> str:
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str, using orjson when it is installed."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = True) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes (2-space indent by default).
+
+    Non-ASCII text is written as-is. Falls back to stdlib json when orjson is
+    missing or cannot encode a value (e.g. integers wider than 64 bits).
+    """
+    if _orjson is not None:
+        option = _orjson.OPT_NON_STR_KEYS | (_orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return _orjson.dumps(obj, option=option)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def new_hasher(algorithm: str = DEFAULT_CHECKSUM_ALGORITHM):
+    """Return a fresh hashlib object for ``algorithm`` (BLAKE2b uses a 32-byte digest)."""
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=32)
+    return hashlib.new(algorithm)
+
+
+def checksum_key(name: str) -> str:
+    """Namespace a file name for lookup in the checksum DB."""
+    return f"{CHECKSUM_KEY_PREFIX}{name}"
+
+
+def validator_keys(name: str) -> Tuple[str, str]:
+    """Checksum DB keys holding the (ETag, Last-Modified) recorded for ``name``."""
+    return f"{ETAG_KEY_PREFIX}{name}", f"{LAST_MODIFIED_KEY_PREFIX}{name}"
+
+
+def stat_key(name: str) -> str:
+    """Checksum DB key holding the file signature recorded for ``name``."""
+    return f"{STAT_KEY_PREFIX}{name}"
+
+
+def file_signature(path: str) -> str:
+    """``"<mtime_ns>:<size>"`` for ``path``; cheap stand-in for re-hashing."""
+    st = os.stat(path)
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def calculate_checksum(file_path: Optional[str] = None, data: Optional[Union[bytes, str]] = None, algorithm: str = DEFAULT_CHECKSUM_ALGORITHM) -> str:
     """Calculate checksum for a file or data."""
-    hash_func = getattr(hashlib, algorithm)()
+    hash_func = new_hasher(algorithm)
     if file_path and os.path.exists(file_path):
         with open(file_path, "rb") as f:
-            while True:
-                chunk = f.read(8192)
-                if not chunk:
-                    break
-                hash_func.update(chunk)
+            # mmap hands the whole file to the hash in one call; it cannot map empty files
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hash_func.update(mm)
     elif data is not None:
         if isinstance(data, str):
             data = data.encode("utf-8")
@@ -54,20 +121,99 @@ def calculate_checksum(file_path: Optional[str] = None, data: Optional[Union[byt
     return hash_func.hexdigest()
 
 
-def load_checksum_db(path: str = CHECKSUM_DB_PATH) -> Dict[str, str]:
-    """Load checksum database from file."""
+CHECKSUM_LOG_SUFFIX = ".log"
+CHECKSUM_LOG_COMPACT_LINES = 200
+
+# path -> (stat signature, merged db, journal line count); avoids re-parsing
+# unchanged files and re-reading the journal to decide on compaction
+_checksum_cache: Dict[str, Tuple[tuple, Dict[str, str], int]] = {}
+
+
+def _stat_signature(path: str) -> tuple:
+    sig = []
+    for p in (path, path + CHECKSUM_LOG_SUFFIX):
+        try:
+            st = os.stat(p)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            sig.append(None)
+    return tuple(sig)
+
+
+def _load_log_merged(path: str) -> Tuple[Dict[str, str], int]:
+    """Read the base JSON snapshot and fold the append-only journal over it.
+
+    Also returns the journal's line count (torn lines included).
+    """
+    db: Dict[str, str] = {}
     if os.path.exists(path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
+            with open(path, "rb") as f:
                 content = f.read().strip()
-                return json.loads(content) if content else {}
+                db = json_loads(content) if content else {}
         except json.JSONDecodeError:
             logging.getLogger(__name__).warning("Invalid JSON in checksum file. Resetting.")
-            return {}
-    return {}
+            db = {}
+    log_path = path + CHECKSUM_LOG_SUFFIX
+    log_lines = 0
+    if os.path.exists(log_path):
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                log_lines += 1
+                try:
+                    db.update(json.loads(line))
+                except json.JSONDecodeError:
+                    # a torn final line from an interrupted run; earlier entries still apply
+                    continue
+    return db, log_lines
+
+
+def _cached_checksum_entry(path: str) -> Tuple[tuple, Dict[str, str], int]:
+    sig = _stat_signature(path)
+    hit = _checksum_cache.get(path)
+    if hit is None or hit[0] != sig:
+        hit = (sig, *_load_log_merged(path))
+        _checksum_cache[path] = hit
+    return hit
+
+
+def _cached_checksum_db(path: str) -> Dict[str, str]:
+    return _cached_checksum_entry(path)[1]
+
+
+def load_checksum_db(path: str = CHECKSUM_DB_PATH) -> Dict[str, str]:
+    """Load checksum database from file.
+
+    Parsed results are memoized until the snapshot or journal changes on
+    disk. A copy is returned so callers can mutate it freely.
+    """
+    return dict(_cached_checksum_db(path))
 
 
 def save_checksum_db(checksum_db: Dict[str, str], path: str = CHECKSUM_DB_PATH) -> None:
-    """Save checksum database to file."""
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(checksum_db, f, indent=2)
+    """Save checksum database to file.
+
+    Only entries that differ from what is already persisted are appended to
+    the journal (one JSON object per line); the journal is folded back into
+    the snapshot once it grows past CHECKSUM_LOG_COMPACT_LINES.
+    """
+    _, persisted, log_lines = _cached_checksum_entry(path)
+    changed = {k: v for k, v in checksum_db.items() if persisted.get(k) != v}
+    if not changed:
+        return
+    log_path = path + CHECKSUM_LOG_SUFFIX
+    with open(log_path, "a", encoding="utf-8") as f:
+        for k, v in changed.items():
+            f.write(json.dumps({k: v}) + "\n")
+    merged = {**persisted, **changed}
+    # the cached count plus what was just appended; no re-read of the journal
+    log_lines += len(changed)
+    if log_lines > CHECKSUM_LOG_COMPACT_LINES:
+        # write-then-rename so an interrupted compaction leaves the old snapshot
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json_dumps(merged))
+        os.replace(tmp_path, path)
+        os.remove(log_path)
+        log_lines = 0
+    _checksum_cache[path] = (_stat_signature(path), merged, log_lines)
@@ -10,10 +10,12 @@ from __future__ import annotations
 
 from pathlib import Path
 import argparse
+import os
+from typing import Optional
 from ecfr_scraper import normalize as norm
 
 
-def run(force: bool = False, data_dir: str = 'data') -> int:
+def run(force: bool = False, data_dir: str = 'data', workers: Optional[int] = None) -> int:
     base = Path(data_dir)
     if force:
         cache_file = base / norm.CACHE_FILENAME
@@ -22,7 +24,7 @@ def run(force: bool = False, data_dir: str = 'data') -> int:
     cache = norm.load_cache(base)
     count = 0
     for tf in sorted(base.glob('title*.json')):
-        count += norm.normalize_title_file(tf, output_dir=base, cache=cache)
+        count += norm.normalize_title_file(tf, output_dir=base, cache=cache, workers=workers)
     norm.save_cache(base, cache)
     return count
 
@@ -31,8 +33,9 @@ def main():
     ap = argparse.ArgumentParser(description="Batch normalize title JSON files")
     ap.add_argument('--data-dir', default='data', help='Directory containing title*.json exports')
     ap.add_argument('--force', action='store_true', help='Recompute all (ignore existing cache)')
+    ap.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes for large titles (1 = serial)')
     args = ap.parse_args()
-    sections = run(force=args.force, data_dir=args.data_dir)
+    sections = run(force=args.force, data_dir=args.data_dir, workers=args.workers)
     print(f"Normalized {sections} sections (cached unchanged skipped).", flush=True)
 
 
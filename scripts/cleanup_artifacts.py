@@ -11,11 +11,14 @@ Flags:
 
 Removes (if present):
   ecfr_index.sqlite, analyzer.sqlite, sections/ directory, artifacts/manifest JSON,
-  *.min.xml, *.xml.gz, paragraph/section embedding tables (by dropping DB files),
-  optionally checksums.json when --reset supplied.
+  lexical_cache.json, .checksum_cache.json (manifest step's checksum sidecar),
+  *.min.xml, *.xml.gz, *.xml.zst, paragraph/section embedding tables (by dropping DB files),
+  optionally checksums.json (and its checksums.json.log journal) when --reset supplied.
 """
 from __future__ import annotations
 import argparse
+import fnmatch
+import os
 from pathlib import Path
 import sys
 
@@ -24,30 +27,58 @@ TARGETS = [
     'analyzer.sqlite',
     'artifacts.json',
     'manifest.json',
+    'lexical_cache.json',
+    '.checksum_cache.json',
 ]
 
 GLOB_TARGETS = [
     '*.min.xml',
     '*.xml.gz',
+    '*.xml.zst',
 ]
 
 SECTION_DIR = 'sections'
 CHECKSUM_FILE = 'checksums.json'
 
-def remove_path(p: Path) -> None:
-    if not p.exists():
-        return
-    if p.is_dir():
-        for child in p.rglob('*'):
-            if child.is_file():
+def _remove_tree(top: str) -> None:
+    # bottom-up so each directory is empty by the time it is removed; where
+    # supported, files are unlinked relative to an open directory fd so each
+    # call skips re-resolving the full path
+    use_dir_fd = os.unlink in os.supports_dir_fd and hasattr(os, 'O_DIRECTORY')
+    for dirpath, dirnames, filenames in os.walk(top, topdown=False):
+        fd = None
+        if use_dir_fd:
+            try:
+                fd = os.open(dirpath, os.O_RDONLY | os.O_DIRECTORY)
+            except OSError:
+                fd = None
+        try:
+            # symlinked directories are listed in dirnames but not walked
+            links = [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]
+            for name in filenames + links:
                 try:
-                    child.unlink()
+                    if fd is not None:
+                        os.unlink(name, dir_fd=fd)
+                    else:
+                        os.unlink(os.path.join(dirpath, name))
                 except Exception:
                     pass
+        finally:
+            if fd is not None:
+                os.close(fd)
         try:
-            p.rmdir()
+            os.rmdir(dirpath)
         except Exception:
             pass
+
+def remove_path(p: Path, is_dir: bool | None = None) -> None:
+    """Remove a file or directory tree; ``is_dir`` skips the stat when known."""
+    if is_dir is None:
+        if not p.exists():
+            return
+        is_dir = p.is_dir()
+    if is_dir:
+        _remove_tree(str(p))
     else:
         try:
             p.unlink()
@@ -66,39 +97,40 @@ def main() -> int:
         print(f"Output directory {root} does not exist", file=sys.stderr)
         return 1
 
-    to_remove = []
-    for name in TARGETS:
-        to_remove.append(root / name)
+    # one directory read answers every existence / type check below
+    with os.scandir(root) as it:
+        entries = {e.name: e for e in it}
+    names = list(TARGETS)
     for pattern in GLOB_TARGETS:
-        to_remove.extend(root.glob(pattern))
-    to_remove.append(root / SECTION_DIR)
+        names.extend(sorted(fnmatch.filter(entries, pattern)))
+    names.append(SECTION_DIR)
     if args.reset:
-        to_remove.append(root / CHECKSUM_FILE)
+        names.append(CHECKSUM_FILE)
+        names.append(CHECKSUM_FILE + '.log')
 
-    # filter unique
-    uniq = []
+    # filter unique, keep only entries that exist
+    existing = []
     seen = set()
-    for p in to_remove:
-        if str(p) not in seen:
-            uniq.append(p)
-            seen.add(str(p))
+    for name in names:
+        if name in entries and name not in seen:
+            existing.append(entries[name])
+            seen.add(name)
 
-    existing = [p for p in uniq if p.exists()]
     if not existing:
         print('Nothing to remove.')
         return 0
 
     print('Will remove:')
-    for p in existing:
-        print('  -', p)
+    for e in existing:
+        print('  -', root / e.name)
     if not args.yes:
         resp = input('Proceed? [y/N] ').strip().lower()
         if resp not in {'y','yes'}:
             print('Aborted.')
             return 1
 
-    for p in existing:
-        remove_path(p)
+    for e in existing:
+        remove_path(root / e.name, e.is_dir(follow_symlinks=False))
     print(f"Removed {len(existing)} paths. Done.")
     return 0
 
@@ -11,57 +11,55 @@ Usage (PowerShell):
 from __future__ import annotations
 
 import argparse
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Iterable
 
 from lxml import etree  # type: ignore
 
-TEXT_ELEMENTS = {
+TEXT_ELEMENTS = frozenset({
     "HEAD","P","PG","CITA","AUTH","SOURCE","HED","PSPACE",
     "FP-1","HD2","HD3","EXTRACT","SUBJECT","EDNOTE","IDNO","AMDDATE"
-}
-EMPTY_METADATA = {"AUTHOR","PUBLISHER","PUBPLACE","DATE","TITLE","KEYWORDS"}
+})
+EMPTY_METADATA = frozenset({"AUTHOR","PUBLISHER","PUBPLACE","DATE","TITLE","KEYWORDS"})
 
-WS_MULTI = re.compile(r'[ \t]+')
-MULTI_SPACES = re.compile(r' {2,}')
+# Runs of space, tab, CR and LF collapse to one space; other whitespace
+# (e.g. NBSP) inside the text is left alone.
+WS_RUN = re.compile(r'[ \t\r\n]+')
 
 
 def normalize_text(t: str, aggressive: bool) -> str | None:
     if t is None:
         return None
-    t = t.replace('\r',' ').replace('\n',' ').replace('\t',' ')
-    t = WS_MULTI.sub(' ', t)
-    if aggressive:
-        t = MULTI_SPACES.sub(' ', t)
-    t = t.strip()
-    return t or None
+    # runs of spaces are always collapsed, so ``aggressive`` adds nothing here;
+    # it is kept for callers and the CLI flag
+    return WS_RUN.sub(' ', t).strip() or None
 
 
 def process_element(el: etree._Element, aggressive: bool) -> None:
-    # Recurse first
-    for child in list(el):
-        if isinstance(child, (etree._Comment, etree._ProcessingInstruction)):
-            el.remove(child)
-        else:
-            process_element(child, aggressive)
-    # Strip whitespace-only text/tail
-    if el.text and el.text.strip() == '':
-        el.text = None
-    if el.tail and el.tail.strip() == '':
-        el.tail = None
-    # Normalize text
-    if el.tag in TEXT_ELEMENTS and el.text:
-        el.text = normalize_text(el.text, aggressive)
-    # Tail: reduce indentation to single space if meaningful
-    if el.tail:
-        el.tail = ' ' if el.tail.strip() else None
+    # Comments / PIs are dropped together with their tail text, as the
+    # per-child remove() this replaces did
+    etree.strip_elements(el, etree.Comment, etree.ProcessingInstruction, with_tail=True)
+    text_elements, normalize = TEXT_ELEMENTS, normalize_text  # locals for the hot loop
+    for node in el.iter():
+        # Strip whitespace-only text, normalize text of text elements
+        if node.text:
+            if node.text.strip() == '':
+                node.text = None
+            elif node.tag in text_elements:
+                node.text = normalize(node.text, aggressive)
+        # Tail: reduce indentation to single space if meaningful
+        if node.tail:
+            node.tail = ' ' if node.tail.strip() else None
 
 
 def drop_empty_metadata(root: etree._Element) -> int:
     removed = 0
+    empty_metadata = EMPTY_METADATA
     for el in list(root.iter()):
-        if el.tag in EMPTY_METADATA:
+        if el.tag in empty_metadata:
             if (el.text is None or el.text.strip() == '') and len(el) == 0:
                 parent = el.getparent()
                 if parent is not None:
@@ -70,19 +68,81 @@ def drop_empty_metadata(root: etree._Element) -> int:
     return removed
 
 
+# Structural containers are streamed (tags written as they are parsed);
+# every other element under them is minified as one subtree and then freed,
+# so memory stays around one section rather than the whole title.
+STREAM_CONTAINERS = {"DIV1","DIV2","DIV3","DIV4","DIV5","DIV6","DIV7"}
+
+
 def minify_file(path: Path, out: Path, aggressive: bool, drop_empty: bool) -> tuple[int,int,int]:
-    parser = etree.XMLParser(remove_blank_text=True)
-    tree = etree.parse(str(path), parser)
-    root = tree.getroot()
-    process_element(root, aggressive)
-    removed = drop_empty_metadata(root) if drop_empty else 0
-    data = etree.tostring(
-        root,
-        encoding='UTF-8',
-        xml_declaration=True,
-        pretty_print=False,
-    )
-    out.write_bytes(data)
+    removed = 0
+    events = etree.iterparse(str(path), events=('start', 'end', 'comment', 'pi'), remove_blank_text=True)
+    with open(out, 'wb') as f:
+        f.write(b"<?xml version='1.0' encoding='UTF-8'?>\n")
+        with etree.xmlfile(f, encoding='UTF-8') as xf:
+            # [container, xmlfile element context or None]; a start tag is only
+            # written once content follows, so empty containers stay <X/>
+            open_tags = []
+            subtree = None   # non-container element still being parsed
+            text_of = None   # container whose text is final at the next event
+            done = None      # (kind, node) whose tail is final at the next event
+
+            def write(item):
+                for entry in open_tags:
+                    if entry[1] is None:
+                        el = entry[0]
+                        entry[1] = xf.element(el.tag, attrib=dict(el.attrib), nsmap=el.nsmap if entry is open_tags[0] else None)
+                        entry[1].__enter__()
+                xf.write(item)
+
+            for event, el in events:
+                if subtree is not None:
+                    if event == 'end' and el is subtree:
+                        done, subtree = ('subtree', el), None
+                    continue
+                if text_of is not None:
+                    t = text_of.text
+                    if t and t.strip() == '':
+                        t = None
+                    if text_of.tag in TEXT_ELEMENTS and t:
+                        t = normalize_text(t, aggressive)
+                    if t:
+                        write(t)
+                    text_of = None
+                if done is not None:
+                    kind, node = done
+                    parent = node.getparent()
+                    if kind == 'subtree':
+                        process_element(node, aggressive)
+                        if drop_empty:
+                            removed += drop_empty_metadata(node)
+                        if node.getparent() is not None:
+                            write(node)  # element plus its tail
+                    elif kind == 'container' and node.tail and node.tail.strip():
+                        write(' ')
+                    # comments / PIs are dropped together with their tail
+                    if node.getparent() is not None:
+                        parent.remove(node)
+                    done = None
+                if event == 'start':
+                    if not open_tags or el.tag in STREAM_CONTAINERS:
+                        open_tags.append([el, None])
+                        text_of = el
+                    else:
+                        subtree = el
+                elif not open_tags:
+                    continue  # prolog comment / PI; not part of the root's serialization
+                elif event == 'end':
+                    _, ctx = open_tags.pop()
+                    if ctx is None:
+                        write(etree.Element(el.tag, attrib=dict(el.attrib), nsmap=None if open_tags else el.nsmap))
+                    else:
+                        ctx.__exit__(None, None, None)
+                    if not open_tags:
+                        break
+                    done = ('container', el)
+                else:
+                    done = ('drop', el)
     return path.stat().st_size, out.stat().st_size, removed
 
 
@@ -109,9 +169,16 @@ def main():
     if in_path.is_dir():
         out_dir = Path(args.output) if args.output else in_path
         out_dir.mkdir(parents=True, exist_ok=True)
-        for xml_file in iter_input(in_path):
-            out_file = out_dir / (xml_file.stem + '.min.xml')
-            before, after, removed = minify_file(xml_file, out_file, args.aggressive, args.drop_empty)
+        xml_files = list(iter_input(in_path))
+        out_files = [out_dir / (f.stem + '.min.xml') for f in xml_files]
+        flags = ([args.aggressive] * len(xml_files), [args.drop_empty] * len(xml_files))
+        if len(xml_files) > 1:
+            # files are independent and the per-element work holds the GIL
+            with ProcessPoolExecutor(max_workers=min(len(xml_files), os.cpu_count() or 1)) as ex:
+                stats = list(ex.map(minify_file, xml_files, out_files, *flags))
+        else:
+            stats = list(map(minify_file, xml_files, out_files, *flags))
+        for xml_file, (before, after, removed) in zip(xml_files, stats):
             total_before += before; total_after += after; total_removed += removed
             pct = (1 - after / before) * 100 if before else 0
             print(f"{xml_file.name}: {before/1024:.1f}KB -> {after/1024:.1f}KB ({pct:.1f}% saved) removed={removed}")
@@ -5,10 +5,14 @@ Usage (PowerShell):
 """
 from __future__ import annotations
 
+import os
 import sys
 import re
 import json
 import hashlib
+import mmap
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 
@@ -23,12 +27,26 @@ TRUNC_WORD = re.compile(r"\b[a-zA-Z]\s+[a-z]")
 SECTION_HEAD = re.compile(r"^§\s*\d+(\.\d+)?")
 
 TEXT_SAMPLE_LIMIT = 5
+EMPTY_METADATA_TAGS = {"AUTHOR", "PUBLISHER", "PUBPLACE", "DATE", "TITLE"}
 
 
-def sha256_bytes(data: bytes) -> str:
-    h = hashlib.sha256()
-    h.update(data)
-    return h.hexdigest()
+def file_hashes(path: Path) -> dict:
+    """SHA-256 (the report's long-standing ``sha256`` key) and BLAKE2b digests of ``path``.
+
+    BLAKE2b is the change fingerprint the scraper's checksum DB uses; both
+    are fed from one read of the file.
+    """
+    hashers = {"sha256": hashlib.sha256(), "blake2b": hashlib.blake2b(digest_size=32)}
+    with path.open("rb") as f:
+        # mapped pages are read on demand and handed to each hash in one
+        # call (as utils.calculate_checksum does); empty files cannot be mapped
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                for h in hashers.values():
+                    h.update(mm)
+    return {name: h.hexdigest() for name, h in hashers.items()}
 
 
 def normalize_text(t: str) -> str:
@@ -38,17 +56,17 @@ def normalize_text(t: str) -> str:
 
 
 def validate_file(path: Path) -> dict:
-    raw = path.read_bytes()
+    # hash and parse straight from disk rather than holding the raw bytes too
     report: dict = {
         "file": path.name,
-        "size": len(raw),
-        "sha256": sha256_bytes(raw),
+        "size": path.stat().st_size,
+        **file_hashes(path),
         "errors": [],
         "warnings": [],
         "stats": {},
     }
     try:
-        root = etree.fromstring(raw)
+        root = etree.parse(str(path)).getroot()
     except etree.XMLSyntaxError as e:
         report["errors"].append(f"XMLSyntaxError: {e}")
         return report
@@ -66,54 +84,58 @@ def validate_file(path: Path) -> dict:
                         f"IDNO {idno.text.strip()} != filename number {digits_in_filename[0]}"
                     )
 
+    # One walk over the tree feeds every check below
+    node_counts: Counter = Counter()
+    sections = 0
+    bad_heads: List[str] = []
+    suspicious: List[str] = []
+    empty_tags = set()
+    non_ascii = set()
+    for el in root.iter():
+        tag = el.tag
+        if isinstance(tag, str):  # comments / PIs only contribute their tail text
+            nid = el.get("NODE")
+            if nid is not None:
+                node_counts[nid] += 1
+            if tag == "DIV8":
+                sections += 1
+                # Section head format
+                head = el.find("./HEAD")
+                if head is not None and head.text:
+                    txt = normalize_text(head.text)
+                    if txt.startswith("§") and not SECTION_HEAD.match(txt):
+                        bad_heads.append(txt)
+            elif tag == "P" and len(suspicious) < TEXT_SAMPLE_LIMIT:
+                # Suspicious truncated words
+                txt = normalize_text("".join(el.itertext()))
+                if TRUNC_WORD.search(txt):
+                    suspicious.append(txt[:80])
+            elif tag in EMPTY_METADATA_TAGS and (not el.text or not el.text.strip()):
+                empty_tags.add(tag)
+            if el.text and not el.text.isascii():
+                non_ascii.update(c for c in el.text if ord(c) > 127)
+        # same text root.itertext() yields
+        if el is not root and el.tail and not el.tail.isascii():
+            non_ascii.update(c for c in el.tail if ord(c) > 127)
+
     # Node id uniqueness
-    nodes = root.xpath('//*[@NODE]')
-    node_ids = [n.get("NODE") for n in nodes]
-    dupes = sorted({nid for nid in node_ids if node_ids.count(nid) > 1})
+    dupes = sorted(nid for nid, c in node_counts.items() if c > 1)
     if dupes:
         report["warnings"].append(f"Duplicate NODE values: {dupes[:10]}")
-
-    # Section head format
-    bad_heads: List[str] = []
-    for s in root.findall(".//DIV8"):
-        head = s.find("./HEAD")
-        if head is not None and head.text:
-            txt = normalize_text(head.text)
-            if txt.startswith("§") and not SECTION_HEAD.match(txt):
-                bad_heads.append(txt)
     if bad_heads:
         report["warnings"].append(
             f"{len(bad_heads)} irregular section heads (sample {bad_heads[:TEXT_SAMPLE_LIMIT]})"
         )
-
-    # Suspicious truncated words
-    suspicious: List[str] = []
-    for p in root.findall(".//P"):
-        txt = normalize_text("".join(p.itertext()))
-        if TRUNC_WORD.search(txt):
-            suspicious.append(txt[:80])
-            if len(suspicious) >= TEXT_SAMPLE_LIMIT:
-                break
     if suspicious:
         report["warnings"].append(f"Possible truncations (sample {suspicious})")
-
     # Non-ascii sample
-    all_text = "".join(root.itertext())
-    non_ascii = sorted({c for c in all_text if ord(c) > 127})
-    report["stats"]["non_ascii_sample"] = non_ascii[:20]
-
-    # Empty metadata tags
-    empty_tags = []
-    for tag in ["AUTHOR", "PUBLISHER", "PUBPLACE", "DATE", "TITLE"]:
-        for el in root.findall(f".//{tag}"):
-            if not el.text or not el.text.strip():
-                empty_tags.append(tag)
+    report["stats"]["non_ascii_sample"] = sorted(non_ascii)[:20]
     if empty_tags:
-        report["warnings"].append(f"Empty metadata tags: {sorted(set(empty_tags))}")
+        report["warnings"].append(f"Empty metadata tags: {sorted(empty_tags)}")
 
     # Basic counts
-    report["stats"]["sections"] = len(root.findall('.//DIV8'))
-    report["stats"]["div_nodes"] = len(nodes)
+    report["stats"]["sections"] = sections
+    report["stats"]["div_nodes"] = sum(node_counts.values())
 
     return report
 
@@ -121,7 +143,9 @@ def validate_file(path: Path) -> dict:
 def main():
     pattern = sys.argv[1] if len(sys.argv) > 1 else "data/title*.xml"
     paths = [p for p in Path('.').glob(pattern) if p.is_file()]
-    reports = [validate_file(p) for p in paths]
+    # lxml parsing and hashlib release the GIL, so threads overlap files
+    with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1) or 1) as ex:
+        reports = list(ex.map(validate_file, paths))
     print(json.dumps(reports, indent=2, ensure_ascii=False))
 
 
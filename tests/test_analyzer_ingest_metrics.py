@@ -58,3 +58,42 @@ def test_analyzer_ingest_and_metrics():
             assert all(isinstance(v, (int, float)) for v in row)
         finally:
             con.close()
+
+
+
+def test_metrics_drop_rows_of_replaced_sections(tmp_path):
+    from ecfr_scraper.analyzer.ingest import ingest_sections
+    from ecfr_scraper.analyzer.metrics import compute_metrics
+
+    build_normalized_section(tmp_path, '1', '1', '1.1', 'Sample text with 12 CFR 1000.1 reference.')
+    build_normalized_section(tmp_path, '1', '1', '1.2', 'Another section referencing U.S.C. statute.')
+    db = tmp_path / 'analyzer.sqlite'
+    for _ in range(3):  # each upserting re-ingest gives the sections new rowids
+        ingest_sections(tmp_path / 'sections', db)
+        con = sqlite3.connect(db)
+        try:
+            compute_metrics(con)
+        finally:
+            con.close()
+    con = sqlite3.connect(db)
+    try:
+        assert con.execute('SELECT count(*) FROM metrics').fetchone()[0] == 2
+        orphans = con.execute('SELECT count(*) FROM metrics WHERE section_rowid NOT IN (SELECT rowid FROM sections)')
+        assert orphans.fetchone()[0] == 0
+    finally:
+        con.close()
+
+
+def test_schema_renames_legacy_references_table():
+    from ecfr_scraper.analyzer import schema
+
+    con = sqlite3.connect(':memory:')
+    con.execute('CREATE TABLE "references"(id INTEGER PRIMARY KEY AUTOINCREMENT, from_section_uid TEXT, ref_type TEXT, raw TEXT, norm_target TEXT)')
+    con.execute('INSERT INTO "references"(from_section_uid, ref_type, raw, norm_target) VALUES (?,?,?,?)', ('1:1:1.1', 'CFR', '12 CFR 1000.1', '1000.1'))
+    schema.ensure_schema(con)
+    tables = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert 'references' not in tables and 'xrefs' in tables
+    assert con.execute("SELECT raw FROM xrefs").fetchall() == [('12 CFR 1000.1',)]
+    if schema.has_refs_fts(con):
+        assert con.execute("SELECT count(*) FROM refs_fts WHERE refs_fts MATCH '\"1000\"'").fetchone()[0] == 1
+    con.close()
@@ -26,39 +26,136 @@ def build_small_index(tmp: Path) -> str:
     return str(db_path)
 
 
-def test_health_and_titles():
-    with tempfile.TemporaryDirectory() as td:
-        db = build_small_index(Path(td))
-        app = create_app(db)
-        client = TestClient(app)
-        r = client.get('/health')
-        assert r.status_code == 200 and r.json()['status'] == 'ok'
-        r = client.get('/titles')
-        assert r.status_code == 200
-        assert set(r.json()) == {"1","2"}
+@pytest.fixture(scope='module')
+def client(tmp_path_factory):
+    """One index + app for the read-only endpoint tests."""
+    db = build_small_index(tmp_path_factory.mktemp('api'))
+    with TestClient(create_app(db)) as c:
+        yield c
+
+
+def test_health_and_titles(client):
+    r = client.get('/health')
+    assert r.status_code == 200 and r.json()['status'] == 'ok'
+    r = client.get('/titles')
+    assert r.status_code == 200
+    assert set(r.json()) == {"1","2"}
+
+
+def test_search_and_section(client):
+    r = client.get('/search', params={'q':'section'})
+    assert r.status_code == 200
+    results = r.json()
+    assert results and any('Intro' in (res['heading'] or '') for res in results)
+    rowid = results[0]['rowid']
+    sec = client.get(f'/section/{rowid}')
+    assert sec.status_code == 200
+    body = sec.json()
+    assert body['rowid'] == rowid
+
+
+def test_suggest(client):
+    r = client.get('/suggest', params={'prefix':'Def'})
+    assert r.status_code == 200
+    assert any(h.startswith('Def') for h in r.json())
 
 
-def test_search_and_section():
+def test_suggest_uses_heading_index():
+    from ecfr_scraper.api import build_heading_index
+
     with tempfile.TemporaryDirectory() as td:
         db = build_small_index(Path(td))
-        app = create_app(db)
-        client = TestClient(app)
-        r = client.get('/search', params={'q':'section'})
-        assert r.status_code == 200
-        results = r.json()
-        assert results and any('Intro' in (res['heading'] or '') for res in results)
-        rowid = results[0]['rowid']
-        sec = client.get(f'/section/{rowid}')
-        assert sec.status_code == 200
-        body = sec.json()
-        assert body['rowid'] == rowid
-
-
-def test_suggest():
+        con = sqlite3.connect(db)
+        con.execute("INSERT INTO sections(title, heading) VALUES ('3', '100% Definitions')")
+        build_heading_index(con)
+        con.commit()
+        con.close()
+        with TestClient(create_app(db)) as client:
+            assert client.get('/suggest', params={'prefix': 'def'}).json() == ['Definitions']
+            assert client.get('/suggest', params={'prefix': '100%'}).json() == ['100% Definitions']
+            assert client.get('/suggest', params={'prefix': '%'}).json() == []
+
+
+def test_connection_pool_reuses_read_only_connections(tmp_path: Path):
+    from ecfr_scraper.api import ConnectionPool
+
+    pool = ConnectionPool(build_small_index(tmp_path), size=1)
+    with pool.connection() as first:
+        with pool.connection() as second:
+            assert first is not second
+            with pytest.raises(sqlite3.OperationalError):
+                second.execute("DELETE FROM sections")
+    with pool.connection() as again:
+        assert again is second  # one idle connection kept, the overflow closed
+        assert again.execute("SELECT COUNT(*) FROM sections").fetchone()[0] == 3
+    pool.close()
+
+
+def test_embedding_matrix_top_k():
+    np = pytest.importorskip("numpy")
+    import struct
+    from ecfr_scraper.api import load_embeddings, top_embeddings
+
+    vecs = {1: (1.0, 0.0, 0.0), 2: (0.0, 1.0, 0.0), 3: (0.6, 0.8, 0.0)}
+    con = sqlite3.connect(":memory:")
+    con.execute("CREATE TABLE embeddings(section_rowid INTEGER PRIMARY KEY, vector BLOB)")
+    assert load_embeddings(con) is None
+    con.executemany("INSERT INTO embeddings VALUES (?, ?)", [(k, struct.pack('3f', *v)) for k, v in vecs.items()])
+    ids, mat = load_embeddings(con)
+    assert mat.shape == (3, 3) and mat.dtype == np.float32
+    qv = (0.0, 1.0, 0.0)
+    expected = sorted(((sum(a*b for a, b in zip(qv, v)), k) for k, v in vecs.items()), reverse=True)
+    got = top_embeddings(ids, mat, qv, 2)
+    assert [rid for _, rid in got] == [rid for _, rid in expected[:2]]
+    assert got[0][0] == pytest.approx(expected[0][0])
+    assert len(top_embeddings(ids, mat, qv, 10)) == 3
+
+
+def test_embedding_hits_keep_score_order():
+    from ecfr_scraper.api import embedding_hits
+
     with tempfile.TemporaryDirectory() as td:
-        db = build_small_index(Path(td))
-        app = create_app(db)
-        client = TestClient(app)
-        r = client.get('/suggest', params={'prefix':'Def'})
-        assert r.status_code == 200
-        assert any(h.startswith('Def') for h in r.json())
+        con = sqlite3.connect(build_small_index(Path(td)))
+        hits = embedding_hits(con.cursor(), [(0.9, 3), (0.5, 99), (0.2, 1)])
+        assert [(h['rowid'], h['heading']) for h in hits] == [(3, 'Definitions'), (1, 'Intro')]
+        assert embedding_hits(con.cursor(), []) == []
+        con.close()
+
+
+def test_embedding_search_falls_back_without_index(tmp_path: Path):
+    pytest.importorskip("numpy")
+    import struct
+    from ecfr_scraper.api import embedding_scores, load_embedding_search
+
+    db = tmp_path / 'ecfr_index.sqlite'
+    con = sqlite3.connect(db)
+    con.execute("CREATE TABLE embeddings(section_rowid INTEGER PRIMARY KEY, vector BLOB)")
+    assert load_embedding_search(con, str(db)) is None
+    con.executemany("INSERT INTO embeddings VALUES (?, ?)", [(1, struct.pack('2f', 1.0, 0.0)), (2, struct.pack('2f', 0.0, 1.0))])
+    state = load_embedding_search(con, str(db))
+    assert state[0] == "exact" and [rid for _, rid in embedding_scores(state, (0.0, 1.0), 1)] == [2]
+    con.close()
+
+
+def test_analyzer_db_is_per_app(tmp_path: Path, monkeypatch):
+    pytest.importorskip("ecfr_scraper.analyzer.api")
+    from ecfr_scraper.analyzer import schema
+    from ecfr_scraper.analyzer.api import DB_ENV
+
+    monkeypatch.delenv(DB_ENV, raising=False)
+    db = build_small_index(tmp_path)
+    apps = []
+    for uid in ('a', 'b'):
+        adb = tmp_path / f'analyzer_{uid}.sqlite'
+        con = sqlite3.connect(adb)
+        schema.ensure_schema(con)
+        con.execute("INSERT INTO sections(uid, title, heading) VALUES (?, 1, ?)", (uid, f'Heading {uid}'))
+        con.commit()
+        con.close()
+        apps.append((uid, create_app(db, analyzer_db=str(adb))))
+    assert DB_ENV not in os.environ
+    for uid, app in apps:
+        with TestClient(app) as client:
+            assert client.get(f'/analyzer/section/{uid}').json()['heading'] == f'Heading {uid}'
+            other = 'b' if uid == 'a' else 'a'
+            assert client.get(f'/analyzer/section/{other}').status_code == 404
@@ -0,0 +1,43 @@
+from ecfr_scraper import utils
+
+
+def test_checksum_db_journal_roundtrip(tmp_path):
+    path = str(tmp_path / 'checksums.json')
+    db = utils.load_checksum_db(path)
+    db['b2b:title1.xml'] = 'aaa'
+    utils.save_checksum_db(db, path)
+    # Loaded copies are independent of the caller's dict (diff step relies on this)
+    previous = utils.load_checksum_db(path)
+    db['b2b:title2.xml'] = 'bbb'
+    assert previous == {'b2b:title1.xml': 'aaa'}
+    utils.save_checksum_db(db, path)
+    log_lines = (tmp_path / 'checksums.json.log').read_text(encoding='utf-8').splitlines()
+    assert len(log_lines) == 2  # only the changed entry was appended each time
+    utils._checksum_cache.clear()
+    assert utils.load_checksum_db(path) == db
+
+
+def test_checksum_db_compacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, 'CHECKSUM_LOG_COMPACT_LINES', 1)
+    path = str(tmp_path / 'checksums.json')
+    utils.save_checksum_db({'a': '1'}, path)
+    utils.save_checksum_db({'a': '1', 'b': '2'}, path)
+    assert not (tmp_path / 'checksums.json.log').exists()
+    utils._checksum_cache.clear()
+    assert utils.load_checksum_db(path) == {'a': '1', 'b': '2'}
+
+
+def test_checksum_db_journal_count_survives_cold_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, 'CHECKSUM_LOG_COMPACT_LINES', 3)
+    path = str(tmp_path / 'checksums.json')
+    utils.save_checksum_db({'a': '1'}, path)
+    utils.save_checksum_db({'a': '1', 'b': '2'}, path)
+    assert utils._checksum_cache[path][2] == 2
+    utils._checksum_cache.clear()  # line count restarts from the journal on disk
+    utils.save_checksum_db({'a': '1', 'b': '2', 'c': '3'}, path)
+    assert (tmp_path / 'checksums.json.log').exists()
+    utils.save_checksum_db({'a': '1', 'b': '2', 'c': '3', 'd': '4'}, path)
+    assert not (tmp_path / 'checksums.json.log').exists()
+    assert utils._checksum_cache[path][2] == 0
+    utils._checksum_cache.clear()
+    assert utils.load_checksum_db(path) == {'a': '1', 'b': '2', 'c': '3', 'd': '4'}
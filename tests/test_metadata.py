@@ -0,0 +1,11 @@
+from ecfr_scraper.metadata import MetadataExtractor
+
+
+def test_xml_metadata_drops_comments_and_pis(tmp_path):
+    xml_path = tmp_path / "title1.xml"
+    xml_path.write_text(
+        "<ECFR>\n  <HEAD>Gener<!-- note -->al  </HEAD>\n  <?pi x?><P> one two </P>\n</ECFR>", encoding="utf-8"
+    )
+    meta = MetadataExtractor().extract_xml_metadata(str(xml_path))
+    assert meta["element_count"] == 3 and meta["child_elements"] == ["HEAD", "P"]
+    assert dict(meta["word_stats"]["top_words"]) == {"general": 1, "one": 1, "two": 1}
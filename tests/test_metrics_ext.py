@@ -0,0 +1,21 @@
+from ecfr_scraper.analyzer import metrics_ext
+
+
+def test_term_counts_match_individual_patterns():
+    text = ("The agency shall not and may not approve; applicants must, where practicable, "
+            "notify a small business or small entity. SHALL apply. Prohibited: banned ban risk-based hazard.")
+    expected = [len(p.findall(text)) for p in metrics_ext.COUNT_PATS]
+    assert metrics_ext.term_counts(text) == expected
+    assert expected[metrics_ext.OBLIGATION] == 5 and expected[metrics_ext.PROHIBITIVE] == 4
+
+
+def test_flesch_kincaid_matches_per_word_syllables():
+    import re
+
+    text = "Rhythm and crypts: the agency's tsk-tsk review. Éclair? Yes!  Fly by."
+    words = re.findall(r"[A-Za-z]+", text)
+    sentences = [s for s in re.split(r"[.!?]+", text) if s.strip()]
+    syllables = sum(max(1, len(re.findall(r"[aeiouy]+", w.lower()))) for w in words)
+    expected = 0.39 * (len(words) / len(sentences)) + 11.8 * (syllables / len(words)) - 15.59
+    assert metrics_ext.flesch_kincaid_grade(text) == expected
+    assert metrics_ext.scan_section_text(text)[:2] == (len(sentences), expected)
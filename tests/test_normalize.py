@@ -30,3 +30,19 @@ def test_normalize_section_anchor():
     out = norm.normalize_section(section, title_number="21")
     assert out["anchor_id"] == "title21-21-10"
     assert out["paragraphs"]
+
+def test_normalize_title_file_duplicate_section_number_keeps_last(tmp_path):
+    import json
+    doc = {"title_number": "21", "parts": [{"part_number": "21", "sections": [
+        {"section_number": "21.10", "section_name": "§ 21.10   First.", "content": "§ 21.10   First.\n(a) Alpha."},
+        {"section_number": "21.10", "section_name": "§ 21.10   Second.", "content": "§ 21.10   Second.\n(a) Beta."},
+    ]}]}
+    path = tmp_path / 'title21.json'
+    path.write_text(json.dumps(doc), encoding='utf-8')
+    cache = {}
+    assert norm.normalize_title_file(path, cache=cache) == 2
+    files = list((tmp_path / 'sections' / 'title21').iterdir())
+    assert [f.name for f in files] == ['21_10.json']
+    written = json.loads(files[0].read_text(encoding='utf-8'))
+    assert 'Beta' in written['content'] and 'Alpha' not in written['content']
+    assert cache
@@ -0,0 +1,65 @@
+from ecfr_scraper.scraper import ECFRScraper
+
+DOC = '''<?xml version="1.0"?>
+<ECFR><TITL>9</TITL><HEAD>Animals</HEAD>
+<DIV5 TYPE="PART"><HEAD>PART 7—Stuff</HEAD>
+ <DIV6 TYPE="SUBPART"><HEAD>Sub</HEAD>
+  <DIV8 TYPE="SECTION"><HEAD>§ 7.1 First.</HEAD><P>(a) One. Two!<!--c-->three</P><P>four</P></DIV8>
+  <DIV8 TYPE="SECTION" N="§ 7.2"><HEAD>§ 7.2 Second</HEAD><P>five? six</P></DIV8>
+ </DIV6>
+</DIV5>
+</ECFR>'''
+
+
+def test_parse_xml_parts_sections_and_stats(tmp_path):
+    xml_path = tmp_path / 'title9.xml'
+    xml_path.write_text(DOC, encoding='utf-8')
+    data = ECFRScraper(output_dir=str(tmp_path)).parse_xml(str(xml_path))
+    assert data['title_number'] == '9' and data['title_name'] == 'Animals'
+    [part] = data['parts']
+    assert part['part_number'] == '7' and part['part_name'] == 'PART 7—Stuff'
+    assert [s['section_number'] for s in part['sections']] == ['7.1', '7.2']
+    first = part['sections'][0]
+    assert first['section_name'] == '§ 7.1 First.'
+    assert first['paragraph_count'] == 2
+    assert first['content'].endswith('Two!threefour')
+    assert data['stats']['total_sections'] == 2
+    assert data['stats']['paragraph_count'] == 3
+    assert data['lexical_analysis']['total_words'] >= data['stats']['word_count']
+
+
+def test_lexical_stats_cached_by_checksum(tmp_path, monkeypatch):
+    import ecfr_scraper.scraper as scraper_mod
+
+    xml_path = tmp_path / 'title9.xml'
+    xml_path.write_text(DOC, encoding='utf-8')
+    scraper = ECFRScraper(output_dir=str(tmp_path))
+    first = scraper.parse_xml(str(xml_path))['lexical_analysis']
+    scraper.save_lexical_cache()
+    assert (tmp_path / scraper_mod.LEXICAL_CACHE_FILE).exists()
+
+    made = []
+
+    class SpyAccumulator(scraper_mod._LexicalAccumulator):
+        def __init__(self):
+            made.append(self)
+            super().__init__()
+
+    monkeypatch.setattr(scraper_mod, '_LexicalAccumulator', SpyAccumulator)
+    again = ECFRScraper(output_dir=str(tmp_path)).parse_xml(str(xml_path))['lexical_analysis']
+    assert not made  # served from the cache, nothing tokenized
+    assert again['total_words'] == first['total_words']
+    assert again['sentence_count'] == first['sentence_count']
+
+    xml_path.write_text(DOC.replace('six', 'six seven'), encoding='utf-8')
+    edited = ECFRScraper(output_dir=str(tmp_path)).parse_xml(str(xml_path))['lexical_analysis']
+    assert len(made) == 1  # checksum changed, so the title was re-tokenized
+    assert edited['total_words'] == first['total_words'] + 1
+
+
+def test_count_words_matches_regex():
+    import re
+    from ecfr_scraper.scraper import VECTOR_WORD_COUNT_MIN_CHARS, _count_words
+
+    for text in ("", "Café au lait, § 1.2(a)", "a_b c-d " * (VECTOR_WORD_COUNT_MIN_CHARS // 4)):
+        assert _count_words(text) == len(re.findall(r"\b\w+\b", text))
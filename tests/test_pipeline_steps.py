@@ -0,0 +1,62 @@
+import pytest
+
+from ecfr_scraper import pipeline
+
+
+def test_gzip_level_clamped_to_backend_range(monkeypatch):
+    for raw, expected in (("6", min(6, pipeline.GZIP_LEVEL)), ("0", 1), ("-3", 1), ("99", pipeline.GZIP_LEVEL), ("fast", pipeline.GZIP_LEVEL)):
+        monkeypatch.setenv("ECFR_GZIP_LEVEL", raw)
+        assert pipeline._gzip_level() == expected
+    monkeypatch.delenv("ECFR_GZIP_LEVEL")
+    assert pipeline._gzip_level() == pipeline.GZIP_LEVEL
+
+
+def test_minify_drops_comments(tmp_path):
+    from types import SimpleNamespace
+
+    xml_path = tmp_path / "title1.xml"
+    xml_path.write_text(
+        "<ECFR>\n  <HEAD>Gener<!-- note -->al  </HEAD>\n  <?pi x?><P> one two </P>\n</ECFR>", encoding="utf-8"
+    )
+    pipeline.minify(SimpleNamespace(xml_files=[str(xml_path)]))
+    body = (tmp_path / "title1.min.xml").read_text(encoding="utf-8")
+    assert body.split("?>", 1)[1].strip() == "<ECFR><HEAD>General</HEAD><P>one two</P></ECFR>"
+
+
+def test_minify_gzipxml_matches_separate_steps(tmp_path):
+    import gzip
+    from types import SimpleNamespace
+
+    xml_path = tmp_path / "title1.xml"
+    xml_path.write_text("<ECFR>\n  <HEAD> General </HEAD>\n  <!-- c --><P> one two </P>\n</ECFR>", encoding="utf-8")
+    ctx = SimpleNamespace(xml_files=[str(xml_path)], scraper=SimpleNamespace(output_dir=str(tmp_path)))
+    pipeline.minify(ctx)
+    pipeline.gzipxml(ctx)
+    expected = (tmp_path / "title1.min.xml").read_bytes()
+    assert gzip.decompress((tmp_path / "title1.min.xml.gz").read_bytes()) == expected
+
+    for p in tmp_path.glob("title1.min.xml*"):
+        p.unlink()
+    pipeline.minify_gzipxml(ctx)
+    assert (tmp_path / "title1.min.xml").read_bytes() == expected
+    assert gzip.decompress((tmp_path / "title1.min.xml.gz").read_bytes()) == expected
+    assert "title1.min.xml.gz" in (tmp_path / "manifest.json").read_text()
+
+
+def test_zstdxml_prefers_minified_source(tmp_path):
+    zstd = pytest.importorskip("zstandard")
+    from types import SimpleNamespace
+
+    raw_only = tmp_path / "title1.xml"
+    raw_only.write_bytes(b"<ECFR><P>raw</P></ECFR>")
+    with_min = tmp_path / "title2.xml"
+    with_min.write_bytes(b"<ECFR>\n  <P>full</P>\n</ECFR>")
+    minified = tmp_path / "title2.min.xml"
+    minified.write_bytes(b"<ECFR><P>full</P></ECFR>")
+    pipeline.zstdxml(SimpleNamespace(xml_files=[str(raw_only), str(with_min)]))
+
+    assert sorted(p.name for p in tmp_path.glob("*.zst")) == ["title1.xml.zst", "title2.min.xml.zst"]
+    dctx = zstd.ZstdDecompressor()
+    for src in (raw_only, minified):
+        with open(str(src) + ".zst", "rb") as fh:
+            assert dctx.stream_reader(fh).read() == src.read_bytes()
@@ -0,0 +1,123 @@
+import hashlib
+from pathlib import Path
+
+from ecfr_scraper.scraper import ECFRScraper
+from ecfr_scraper.utils import calculate_checksum
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, status_code: int = 200, headers=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        return None
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        return FakeResponse(self.body)
+
+
+def test_download_hashes_in_flight(tmp_path: Path):
+    body = b"<ECFR><TITL>1</TITL></ECFR>"
+    scraper = ECFRScraper(output_dir=str(tmp_path))
+    scraper.session = FakeSession(body)  # type: ignore[assignment]
+    path = scraper.download_title_xml(1)
+    assert path and Path(path).read_bytes() == body
+    assert scraper.checksum_db["b2b:title1.xml"] == hashlib.blake2b(body, digest_size=32).hexdigest()
+    assert scraper.checksum_db["b2b:title1.xml"] == calculate_checksum(file_path=path)
+    assert scraper.session.calls[0][1].get("stream") is True
+    assert Path(f"{path}.metadata.json").exists()
+
+
+def test_process_reuses_download_metadata(tmp_path: Path):
+    body = b"<ECFR><TITL>1</TITL><DIV5 N='1'><HEAD>PART 1</HEAD></DIV5></ECFR>"
+    scraper = ECFRScraper(output_dir=str(tmp_path))
+    scraper.session = FakeSession(body)  # type: ignore[assignment]
+    calls = []
+    extract = scraper.metadata_extractor.extract
+    scraper.metadata_extractor.extract = lambda p: calls.append(p) or extract(p)  # type: ignore[method-assign]
+    path = scraper.download_title_xml(1)
+    results = scraper.process_downloaded_files([path])
+    assert results[0]["success"] and Path(results[0]["metadata"]).exists()
+    assert calls == [path]
+
+
+def test_process_skips_fresh_sidecar_across_runs(tmp_path: Path):
+    import os
+
+    xml_path = tmp_path / "title1.xml"
+    xml_path.write_bytes(b"<ECFR><TITL>1</TITL></ECFR>")
+    ECFRScraper(output_dir=str(tmp_path)).process_downloaded_files([str(xml_path)])
+    scraper = ECFRScraper(output_dir=str(tmp_path))
+    calls = []
+    scraper.metadata_extractor.extract = lambda p: calls.append(p) or {}  # type: ignore[method-assign]
+    scraper.process_downloaded_files([str(xml_path)])
+    assert calls == []
+    meta_mtime = os.stat(f"{xml_path}.metadata.json").st_mtime_ns
+    os.utime(xml_path, ns=(meta_mtime + 1_000_000_000, meta_mtime + 1_000_000_000))
+    scraper.process_downloaded_files([str(xml_path)])
+    assert calls == [str(xml_path)]
+
+
+def test_download_all_flushes_checksums_incrementally(tmp_path: Path, monkeypatch):
+    import ecfr_scraper.scraper as scraper_mod
+
+    saved = []
+    monkeypatch.setattr(scraper_mod, "save_checksum_db", lambda db, *a: saved.append(len(db)))
+    scraper = ECFRScraper(output_dir=str(tmp_path))
+    scraper.checksum_db = {}
+    scraper.session = FakeSession(b"<ECFR/>")  # type: ignore[assignment]
+    monkeypatch.setattr(scraper, "_configure_session", lambda *args: None)
+    monkeypatch.setattr(scraper, "get_available_titles", lambda: list(range(1, 26)))
+    paths = scraper.download_all_titles(max_workers=4)
+    assert len(paths) == 25
+    assert len(saved) == 25 // scraper_mod.CHECKSUM_FLUSH_EVERY + 1
+    assert saved[-1] == len(scraper.checksum_db)
+    assert sum(k.startswith("b2b:") for k in scraper.checksum_db) == 25
+
+
+def test_conditional_get_skips_unmodified(tmp_path: Path):
+    body = b"<ECFR><TITL>1</TITL></ECFR>"
+    scraper = ECFRScraper(output_dir=str(tmp_path))
+    scraper.checksum_db = {}
+    session = FakeSession(body)
+    session.get = lambda url, **kw: session.calls.append((url, kw)) or FakeResponse(body, headers={"ETag": '"v1"'})  # type: ignore[method-assign]
+    scraper.session = session  # type: ignore[assignment]
+    path = scraper.download_title_xml(1)
+    assert scraper.checksum_db["etag:title1.xml"] == '"v1"'
+
+    session.get = lambda url, **kw: session.calls.append((url, kw)) or FakeResponse(b"", status_code=304)  # type: ignore[method-assign]
+    assert scraper.download_title_xml(1) == path
+    assert session.calls[-1][1]["headers"] == {"If-None-Match": '"v1"'}
+    assert Path(path).read_bytes() == body
+
+
+def test_unchanged_local_copy_is_not_rehashed(tmp_path: Path, monkeypatch):
+    import ecfr_scraper.scraper as scraper_mod
+
+    scraper = ECFRScraper(output_dir=str(tmp_path))
+    scraper.checksum_db = {}
+    scraper.session = FakeSession(b"<ECFR><TITL>1</TITL></ECFR>")  # type: ignore[assignment]
+    path = scraper.download_title_xml(1)
+    hashed = []
+    monkeypatch.setattr(scraper_mod, "calculate_checksum", lambda **kw: hashed.append(kw) or "")
+    assert scraper.download_title_xml(1) == path
+    assert hashed == [] and len(scraper.session.calls) == 1
@@ -1,7 +1,7 @@
-import json, subprocess, sys
+import importlib.util, json
 from pathlib import Path
 
-def test_validate_json_script(tmp_path):
+def test_validate_json_script(tmp_path, capsys):
     doc = {
         "title_number": "1",
         "title_name": "Title One",
@@ -15,8 +15,11 @@ def test_validate_json_script(tmp_path):
     out_file = tmp_path / 'title1.json'
     out_file.write_text(json.dumps(doc), encoding='utf-8')
     script = Path('scripts') / 'validate_json.py'
-    proc = subprocess.run([sys.executable, str(script), str(out_file)], capture_output=True, text=True)
-    assert proc.returncode == 0, proc.stderr
-    report = json.loads(proc.stdout)
+    # run main() in-process rather than paying for a fresh interpreter
+    spec = importlib.util.spec_from_file_location('validate_json', script)
+    vj = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(vj)
+    assert vj.main([str(script), str(out_file)]) == 0
+    report = json.loads(capsys.readouterr().out)
     assert isinstance(report, list)
     assert report[0]['errors'] == []